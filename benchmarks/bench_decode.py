@@ -0,0 +1,49 @@
+"""
+Benchmark de la decodificación de páginas JSON (json, orjson/msgspec y compacta).
+"""
+import json
+from functools import lru_cache
+from typing import List
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from conftest import raw_inventory  # noqa: E402
+
+from src import fast_json  # noqa: E402
+from src.highlevel_api import MAX_PAGE_SIZE  # noqa: E402
+
+DECODERS = {
+    "json": json.loads,
+    "fast": fast_json.decode_json,
+    "compact": fast_json.decode_product_page,
+}
+
+
+@lru_cache(maxsize=None)
+def encoded_pages(size: int) -> List[bytes]:
+    """Cuerpos de las páginas del inventario, como los envía el endpoint"""
+    items = raw_inventory(size)
+    return [
+        json.dumps(
+            {
+                "inventory": items[start : start + MAX_PAGE_SIZE],
+                "total": [{"total": size}],
+            }
+        ).encode()
+        for start in range(0, size, MAX_PAGE_SIZE)
+    ]
+
+
+@pytest.mark.parametrize("decoder", DECODERS)
+def test_decode_pages(run_benchmark, size, decoder):
+    if decoder == "fast" and fast_json.JSON_BACKEND == "json":
+        pytest.skip("orjson/msgspec no están instalados")
+    if decoder == "compact" and not fast_json.COMPACT_AVAILABLE:
+        pytest.skip("msgspec no está instalado")
+
+    pages = encoded_pages(size)
+    decode = DECODERS[decoder]
+    decoded = run_benchmark(lambda: [decode(page) for page in pages], size)
+    assert sum(len(page["inventory"]) for page in decoded) == size
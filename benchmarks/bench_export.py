@@ -0,0 +1,50 @@
+"""
+Benchmark de ``create_report`` + ``add_summary`` con cada backend de Excel.
+"""
+import importlib.util
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.report_backends import create_generator  # noqa: E402
+
+# (backend, constant_memory): XlsxWriter se mide en ambos modos para comparar
+# el pico de RSS, que se separa con 100 000 filas (uno de los tamaños por defecto)
+VARIANTS = (
+    ("xlsxwriter", False),
+    ("xlsxwriter", True),
+    ("openpyxl", None),
+)
+
+
+@pytest.mark.parametrize(
+    "backend, constant_memory",
+    VARIANTS,
+    ids=[
+        f"{backend}-constant_memory" if constant_memory else backend
+        for backend, constant_memory in VARIANTS
+    ],
+)
+def test_create_report(
+    run_benchmark, formatted_items, size, backend, constant_memory, tmp_path
+):
+    if importlib.util.find_spec(backend) is None:
+        pytest.skip(f"{backend} no está instalado")
+
+    paths = iter(tmp_path / f"reporte_{n}.xlsx" for n in range(1_000_000))
+
+    def setup():
+        # Generador y archivo nuevos en cada ronda, fuera del tiempo medido
+        generator = create_generator(
+            backend, row_count=size, constant_memory=constant_memory
+        )
+        return (generator, str(next(paths))), {}
+
+    def export(generator, path):
+        generator.create_report(formatted_items, path)
+        generator.add_summary(formatted_items)
+        return path
+
+    run_benchmark(export, size, setup=setup)
+    assert any(tmp_path.iterdir())
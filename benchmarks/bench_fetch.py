@@ -0,0 +1,20 @@
+"""
+Benchmark de la descarga paginada (``iter_inventory``) contra un servidor local.
+
+Mide el costo del cliente (peticiones, decodificación, paginación), no la
+latencia de HighLevel: el servidor simulado responde al instante.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_iter_inventory(run_benchmark, api_client, mock_api_url, size, concurrency):
+    api_client.base_url = mock_api_url(size)
+
+    def fetch_all():
+        pages = api_client.iter_inventory(concurrency=concurrency)
+        return sum(len(page) for page in pages)
+
+    assert run_benchmark(fetch_all, size) == size
@@ -0,0 +1,11 @@
+"""
+Benchmark de ``format_inventory_data`` (datos crudos de la API → filas del reporte).
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_format_inventory_data(run_benchmark, api_client, raw_items, size):
+    formatted = run_benchmark(lambda: api_client.format_inventory_data(raw_items), size)
+    assert len(formatted) == size
@@ -0,0 +1,80 @@
+"""
+Compara el tiempo y tamaño del reporte XlsxWriter según el modo de notas de imagen.
+
+Uso:
+    uv run python benchmarks/bench_image_notes.py --rows 2000 5000 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.excel_generator_xlsx import (  # noqa: E402
+    IMAGE_NOTES_CELL,
+    IMAGE_NOTES_HEADER,
+    ExcelGenerator,
+)
+
+# Los comentarios por celda crecen más que linealmente; por encima de este
+# número de filas solo se mide la nota única salvo que se pida explícitamente
+MAX_CELL_ROWS = 10000
+
+
+def build_rows(count: int) -> list:
+    """Inventario formateado sintético, todas las filas con imagen"""
+    return [
+        {
+            "Nombre": f"Producto {i}",
+            "Nombre de producto": f"Variante {i % 7}",
+            "Cantidad disponible": i % 50,
+            "Imagen": f"https://images.example.com/{i}.jpg",
+        }
+        for i in range(count)
+    ]
+
+
+def run(rows: list, image_notes: str) -> dict:
+    """Genera un reporte y devuelve segundos y tamaño en bytes"""
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        generator = ExcelGenerator(image_notes=image_notes)
+        generator.create_report(rows, path)
+        generator.add_summary(rows)
+        elapsed = time.perf_counter() - start
+        return {"seconds": elapsed, "bytes": os.path.getsize(path)}
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 50000])
+    parser.add_argument(
+        "--force-cell",
+        action="store_true",
+        help=f"Medir comentarios por celda también por encima de {MAX_CELL_ROWS} filas",
+    )
+    args = parser.parse_args()
+
+    print(f"{'filas':>8} {'modo':>7} {'segundos':>9} {'MB':>7}")
+    for count in args.rows:
+        rows = build_rows(count)
+        modes = [IMAGE_NOTES_HEADER]
+        if count <= MAX_CELL_ROWS or args.force_cell:
+            modes.insert(0, IMAGE_NOTES_CELL)
+        for mode in modes:
+            result = run(rows, mode)
+            print(
+                f"{count:>8} {mode:>7} {result['seconds']:>9.2f} "
+                f"{result['bytes'] / 1e6:>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Fixtures compartidas de los benchmarks (pytest-benchmark).
+
+Uso:
+    uv run pytest benchmarks
+    uv run pytest benchmarks --bench-sizes 1000,10000 --benchmark-json out.json
+
+Cada benchmark guarda en ``extra_info`` el pico de memoria residente de la
+corrida (``peak_rss_mb``) y la memoria al empezar (``start_rss_mb``, solo
+Linux); aparecen en el JSON de ``--benchmark-json``. ``--bench-sizes`` solo
+se reconoce si se indica el directorio ``benchmarks`` en la línea de comandos.
+"""
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Scripts de este directorio que no son benchmarks de pytest
+collect_ignore = ["bench_image_notes.py", "importtime_budget.py"]
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Rondas por tamaño: los inventarios grandes se miden menos veces
+ROUNDS = {1_000: 5, 10_000: 3, 100_000: 1}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Tamaños de inventario separados por coma (1000,10000,100000)",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = [
+            int(size)
+            for size in metafunc.config.getoption("--bench-sizes").split(",")
+            if size.strip()
+        ]
+        metafunc.parametrize("size", sizes, ids=[f"{size}items" for size in sizes])
+
+
+def rounds_for(size: int) -> int:
+    """Número de rondas para un tamaño de inventario"""
+    for limit in sorted(ROUNDS):
+        if size <= limit:
+            return ROUNDS[limit]
+    return 1
+
+
+@lru_cache(maxsize=None)
+def raw_inventory(size: int) -> List[Dict]:
+    """Inventario crudo sintético (se genera una vez por tamaño)"""
+    from src.mock_server import mock_product
+
+    return [mock_product(index) for index in range(size)]
+
+
+@lru_cache(maxsize=None)
+def formatted_inventory(size: int) -> List[Dict]:
+    """Inventario ya formateado, como lo reciben los generadores"""
+    return [
+        {
+            "Nombre": item["name"],
+            "Nombre de producto": item["productName"],
+            "Cantidad disponible": item["availableQuantity"],
+            "Imagen": item["image"],
+        }
+        for item in raw_inventory(size)
+    ]
+
+
+@pytest.fixture
+def raw_items(size: int) -> List[Dict]:
+    """Inventario crudo del tamaño parametrizado"""
+    return raw_inventory(size)
+
+
+@pytest.fixture
+def formatted_items(size: int) -> List[Dict]:
+    """Inventario formateado del tamaño parametrizado"""
+    return formatted_inventory(size)
+
+
+def _reset_peak_rss() -> bool:
+    """Reinicia el pico de RSS del proceso (solo Linux)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    """Lee un campo de memoria de /proc/self/status en MB (solo Linux)"""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Pico de memoria residente en MB (VmHWM, psutil o getrusage)"""
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+
+    try:
+        import psutil
+
+        peak = getattr(psutil.Process().memory_info(), "peak_wset", None)
+        if peak:
+            return peak / 2**20
+    except ImportError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB y macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+@pytest.fixture
+def run_benchmark(benchmark):
+    """
+    Ejecuta ``benchmark.pedantic`` y registra el pico de RSS de la corrida
+
+    Devuelve una función ``run(function, size, setup=None)``; ``setup`` se
+    llama antes de cada ronda, fuera del tiempo medido.
+    """
+
+    def run(function, size: int, setup=None):
+        start = _proc_status_mb("VmRSS")
+        scoped = _reset_peak_rss()
+        result = benchmark.pedantic(
+            function, setup=setup, rounds=rounds_for(size), iterations=1
+        )
+        peak = _peak_rss_mb()
+        benchmark.extra_info["items"] = size
+        benchmark.extra_info["peak_rss_mb"] = round(peak, 1) if peak else None
+        # RSS al empezar (incluye los datos sintéticos ya generados)
+        benchmark.extra_info["start_rss_mb"] = round(start, 1) if start else None
+        # "process": el pico incluye lo ocurrido antes de este benchmark
+        benchmark.extra_info["peak_rss_scope"] = "run" if scoped else "process"
+        return result
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def mock_api_url():
+    """
+    Devuelve la URL de un servidor simulado para un tamaño de catálogo
+
+    Se inicia un servidor por tamaño (los productos se generan al vuelo) y
+    todos se detienen al terminar la sesión.
+    """
+    from src.mock_server import MockHighLevelServer
+
+    servers = {}
+
+    def url_for(size: int) -> str:
+        if size not in servers:
+            servers[size] = MockHighLevelServer(products=size).start()
+        return servers[size].url
+
+    yield url_for
+    for server in servers.values():
+        server.stop()
+
+
+@pytest.fixture
+def api_client():
+    """
+    Cliente de la API sin límite de ritmo y con caché de endpoints en memoria
+
+    Así se mide el costo del cliente y no la espera del token bucket, y el
+    benchmark no toca la caché guardada de la aplicación.
+    """
+    from src.endpoint_cache import EndpointCache
+    from src.highlevel_api import HighLevelAPI
+    from src.rate_limit import TokenBucket
+
+    client = HighLevelAPI(
+        endpoint_cache=EndpointCache(),
+        rate_limiter=TokenBucket(rate=1e9, capacity=1e9),
+        access_token="benchmark",
+        location_id="benchmark",
+    )
+    yield client
+    client.close()
@@ -0,0 +1,102 @@
+"""
+Verifica el presupuesto de tiempo de importación de la ventana principal.
+
+Ejecuta ``python -X importtime`` varias veces en procesos nuevos, toma la
+mediana del tiempo acumulado del módulo y falla (código 1) si supera el
+presupuesto o si se cargó alguno de los módulos pesados que deben
+importarse solo en su primer uso.
+
+Uso:
+    uv run python benchmarks/importtime_budget.py [--budget-ms 300] [--runs 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULE = "src.main_window_optimized"
+
+# Medido en desarrollo: ~370 ms antes de las importaciones diferidas y
+# ~225 ms después (PySide6 QtCore + QtWidgets son la mayor parte)
+DEFAULT_BUDGET_MS = 300
+
+# No deben cargarse al importar la ventana principal
+DEFERRED_MODULES = (
+    "requests",
+    "xlsxwriter",
+    "http.server",
+    "webbrowser",
+    "openpyxl",
+    "pyarrow",
+    "httpx",
+)
+
+
+def measure(module: str) -> tuple:
+    """
+    Importa ``module`` en un proceso nuevo con ``-X importtime``
+
+    Returns:
+        Tupla (milisegundos acumulados del módulo, conjunto de módulos cargados)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative_us = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name.strip()
+        loaded.add(name)
+        if name == module:
+            cumulative_us = int(cumulative.strip())
+
+    if cumulative_us is None:
+        raise RuntimeError(f"No se encontró {module} en la salida de -X importtime")
+    return cumulative_us / 1000, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # Una ejecución previa para calentar la caché de bytecode y del disco
+    measure(args.module)
+
+    timings = []
+    loaded = set()
+    for _ in range(args.runs):
+        elapsed_ms, loaded = measure(args.module)
+        timings.append(elapsed_ms)
+
+    median_ms = statistics.median(timings)
+    eager = [name for name in DEFERRED_MODULES if name in loaded]
+
+    print(
+        f"{args.module}: mediana {median_ms:.1f} ms "
+        f"(mín {min(timings):.1f}, máx {max(timings):.1f}, "
+        f"presupuesto {args.budget_ms:.0f} ms)"
+    )
+    if eager:
+        print(f"❌ Módulos que deberían cargarse en su primer uso: {', '.join(eager)}")
+    if median_ms > args.budget_ms:
+        print("❌ Se excedió el presupuesto de importación")
+
+    return 1 if eager or median_ms > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
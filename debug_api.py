@@ -8,6 +8,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Sesión compartida para reutilizar la conexión entre todas las pruebas
+session = requests.Session()
+
 def debug_api_connection():
     """Debug de la conexión con HighLevel API"""
     
@@ -54,7 +57,7 @@ def debug_api_connection():
     print(f"Params: {params}")
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = session.get(url, headers=headers, params=params, timeout=30)
         
         print(f"\n📊 Respuesta:")
         print(f"Status Code: {response.status_code}")
@@ -101,7 +104,7 @@ def test_alternative_endpoints():
     for endpoint in endpoints:
         try:
             print(f"\n📍 Probando: {endpoint}")
-            response = requests.get(endpoint, headers=headers, timeout=30)
+            response = session.get(endpoint, headers=headers, timeout=30)
             print(f"Status: {response.status_code}")
             if response.status_code == 200:
                 print("✅ Funciona!")
@@ -111,5 +114,8 @@ def test_alternative_endpoints():
             print(f"❌ Excepción: {e}")
 
 if __name__ == "__main__":
-    debug_api_connection()
-    test_alternative_endpoints()
\ No newline at end of file
+    try:
+        debug_api_connection()
+        test_alternative_endpoints()
+    finally:
+        session.close()
\ No newline at end of file
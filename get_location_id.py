@@ -37,38 +37,42 @@ def get_locations():
     
     print("🔍 Probando diferentes endpoints para obtener Location ID...")
     
-    for endpoint in endpoints:
-        try:
-            print(f"\n📍 Probando: {endpoint}")
+    # Reutilizar una sola conexión para todos los endpoints
+    with requests.Session() as session:
+        session.headers.update(headers)
+
+        for endpoint in endpoints:
+            try:
+                print(f"\n📍 Probando: {endpoint}")
             
-            response = requests.get(endpoint, headers=headers, timeout=30)
+                response = session.get(endpoint, timeout=30)
             
-            print(f"📊 Status Code: {response.status_code}")
+                print(f"📊 Status Code: {response.status_code}")
             
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✅ Éxito!")
+                if response.status_code == 200:
+                    data = response.json()
+                    print(f"✅ Éxito!")
                 
-                # Buscar cualquier referencia a location ID
-                location_id = find_location_id_in_response(data)
+                    # Buscar cualquier referencia a location ID
+                    location_id = find_location_id_in_response(data)
                 
-                if location_id:
-                    print(f"🎯 Location ID encontrado: {location_id}")
-                    update_env_with_location_id(location_id)
-                    return location_id
-                else:
-                    print(f"🔍 Estructura de respuesta: {list(data.keys()) if isinstance(data, dict) else type(data)}")
-                    print(f"📄 Muestra de respuesta: {str(data)[:500]}...")
+                    if location_id:
+                        print(f"🎯 Location ID encontrado: {location_id}")
+                        update_env_with_location_id(location_id)
+                        return location_id
+                    else:
+                        print(f"🔍 Estructura de respuesta: {list(data.keys()) if isinstance(data, dict) else type(data)}")
+                        print(f"📄 Muestra de respuesta: {str(data)[:500]}...")
                     
-            elif response.status_code == 401:
-                print(f"🔐 No autorizado - verifica tu token")
-            elif response.status_code == 404:
-                print(f"❌ Endpoint no existe")
-            else:
-                print(f"❌ Error {response.status_code}: {response.text[:200]}")
+                elif response.status_code == 401:
+                    print(f"🔐 No autorizado - verifica tu token")
+                elif response.status_code == 404:
+                    print(f"❌ Endpoint no existe")
+                else:
+                    print(f"❌ Error {response.status_code}: {response.text[:200]}")
                 
-        except Exception as e:
-            print(f"❌ Error: {e}")
+            except Exception as e:
+                print(f"❌ Error: {e}")
     
     print(f"\n🤔 No se pudo encontrar automáticamente el Location ID.")
     print(f"💡 Posibles soluciones:")
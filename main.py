@@ -20,20 +20,7 @@ def get_resource_path():
 # Obtener la ruta base
 base_path = get_resource_path()
 
-# Cargar variables de entorno antes de importar otros módulos
-from dotenv import load_dotenv
-
-# Intentar cargar .env desde diferentes ubicaciones
-env_paths = [
-    os.path.join(base_path, ".env"),
-    os.path.join(os.getcwd(), ".env"),
-    ".env"
-]
-
-for env_path in env_paths:
-    if os.path.exists(env_path):
-        load_dotenv(env_path)
-        break
+# Las variables de .env se cargan en main() (no al importar módulos)
 
 # Agregar el directorio src al path para importar módulos
 if not getattr(sys, 'frozen', False):
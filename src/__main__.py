@@ -0,0 +1,8 @@
+"""
+Permite ejecutar la línea de comandos con ``python -m src``.
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
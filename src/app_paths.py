@@ -0,0 +1,71 @@
+"""
+Rutas de datos locales de la aplicación.
+"""
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Variable de entorno para reubicar los datos locales (caché, snapshots)
+DATA_DIR_ENV = "INVENTARIO_GHL_DATA_DIR"
+
+
+def get_app_data_dir() -> Path:
+    """
+    Obtiene el directorio donde se guardan los datos locales de la aplicación
+
+    Usa ``INVENTARIO_GHL_DATA_DIR`` si está definida; de lo contrario
+    ``~/.inventario_ghl``. El directorio se crea si no existe.
+
+    Returns:
+        Ruta del directorio de datos
+    """
+    data_dir = Path(os.getenv(DATA_DIR_ENV) or Path.home() / ".inventario_ghl")
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+def get_resource_path() -> str:
+    """
+    Obtiene la ruta base para recursos, tanto en desarrollo como compilado
+
+    Returns:
+        Directorio del ejecutable (compilado) o raíz del proyecto (script)
+    """
+    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+        # PyInstaller
+        return sys._MEIPASS
+    elif getattr(sys, "frozen", False):
+        # Otros empaquetadores como Nuitka
+        return os.path.dirname(sys.executable)
+    else:
+        # Script Python normal
+        return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_env_paths() -> List[str]:
+    """Ubicaciones donde se busca el archivo .env, en orden de prioridad"""
+    return [
+        os.path.join(get_resource_path(), ".env"),
+        os.path.join(os.getcwd(), ".env"),
+        ".env",
+    ]
+
+
+def load_env_file() -> Optional[str]:
+    """
+    Carga las variables del primer archivo .env encontrado
+
+    Se llama al arrancar la aplicación (no al importar módulos) para que el
+    costo de buscar y leer el archivo no se pague en cada importación.
+
+    Returns:
+        Ruta del archivo cargado, o None si no se encontró ninguno
+    """
+    from dotenv import load_dotenv
+
+    for env_path in get_env_paths():
+        if os.path.exists(env_path):
+            load_dotenv(env_path)
+            return env_path
+    return None
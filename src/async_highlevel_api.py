@@ -0,0 +1,353 @@
+"""
+Cliente asíncrono para la API de HighLevel.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, List, Optional, Union
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # Dependencia opcional: uv sync --extra async
+    httpx = None
+
+try:
+    from .endpoint_cache import EndpointCache
+    from .highlevel_api import (
+        DEFAULT_POOL_SIZE,
+        MAX_PAGE_SIZE,
+        PROBE_TIMEOUT,
+        BaseHighLevelAPI,
+        _PaginationState,
+    )
+    from .metrics import Metrics
+    from .rate_limit import RetryPolicy, TokenBucket
+except ImportError:
+    from endpoint_cache import EndpointCache
+    from highlevel_api import (
+        DEFAULT_POOL_SIZE,
+        MAX_PAGE_SIZE,
+        PROBE_TIMEOUT,
+        BaseHighLevelAPI,
+        _PaginationState,
+    )
+    from metrics import Metrics
+    from rate_limit import RetryPolicy, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHighLevelAPI(BaseHighLevelAPI):
+    """
+    Cliente asíncrono para la API de HighLevel
+
+    Comparte con ``HighLevelAPI`` la selección de endpoint, la caché, la
+    política de reintentos y el formateo; solo cambia el transporte (httpx).
+    Varias instancias (por ejemplo, una por location) pueden compartir el
+    mismo ``httpx.AsyncClient`` para tener cientos de peticiones en vuelo
+    desde un solo hilo.
+    """
+
+    def __init__(
+        self,
+        endpoint_cache: Optional[EndpointCache] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        access_token: Optional[str] = None,
+        location_id: Optional[str] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "httpx no está instalado. Instálalo con: uv sync --extra async"
+            )
+
+        super().__init__(
+            endpoint_cache=endpoint_cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            access_token=access_token,
+            location_id=location_id,
+            base_url=base_url,
+            metrics=metrics,
+        )
+
+        # Los headers van por petición para poder compartir el cliente
+        self._headers = self._get_headers()
+        self._owns_client = client is None
+        self.client = client or create_async_client(pool_size)
+
+    async def aclose(self):
+        """Cierra el cliente HTTP si fue creado por esta instancia"""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def get_inventory(self, limit: int = 300, offset: int = 0) -> List[Dict]:
+        """
+        Obtiene el inventario de HighLevel
+
+        Args:
+            limit: Límite de resultados (máximo 300)
+            offset: Offset para paginación
+
+        Returns:
+            Lista de items del inventario
+
+        Raises:
+            requests.RequestException: Ningún endpoint respondió correctamente
+        """
+        data = await self._request_page(limit, offset)
+        return self._extract_items(data)
+
+    async def iter_inventory(
+        self,
+        page_size: int = MAX_PAGE_SIZE,
+        offset: int = 0,
+        max_items: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, Optional[int], int], None]] = None,
+        concurrency: int = 1,
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Recorre el inventario completo página por página
+
+        Aplica las mismas reglas que ``HighLevelAPI.iter_inventory``: con
+        ``concurrency > 1`` el resto de páginas se solicita en paralelo una
+        vez conocido el total y se entregan en orden de offset.
+
+        Args:
+            page_size: Tamaño de cada página (máximo 300)
+            offset: Offset inicial
+            max_items: Número máximo de items a obtener (None = todo el catálogo)
+            progress_callback: Función llamada tras cada página con
+                (items_obtenidos, total_reportado_o_None, numero_de_pagina)
+            concurrency: Número de peticiones simultáneas
+
+        Yields:
+            Lista de items de cada página
+        """
+        state = _PaginationState(page_size, offset, max_items, progress_callback)
+
+        while state.has_more():
+            limit = state.next_limit()
+            data = await self._request_page(limit, state.offset)
+            items = self._extract_items(data)
+
+            if not state.accept(items, self._extract_total(data)):
+                return
+
+            yield items
+
+            if state.is_last_page(items, limit):
+                return
+
+            if concurrency > 1 and state.total is not None:
+                async for items in self._iter_pages_parallel(
+                    state.offset, state.parallel_stop(), state.page_size, concurrency
+                ):
+                    state.record(items)
+                    yield items
+                return
+
+    async def _iter_pages_parallel(
+        self, start: int, stop: int, page_size: int, concurrency: int
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Solicita las páginas entre ``start`` y ``stop`` con tareas concurrentes
+
+        Args:
+            start: Offset de la primera página
+            stop: Offset final (exclusivo)
+            page_size: Tamaño de cada página
+            concurrency: Número de peticiones en vuelo
+
+        Yields:
+            Lista de items de cada página, en orden de offset
+        """
+        offsets = iter(range(start, stop, page_size))
+        pending = deque()
+
+        def submit_next() -> bool:
+            page_offset = next(offsets, None)
+            if page_offset is None:
+                return False
+            limit = min(page_size, stop - page_offset)
+            pending.append(asyncio.create_task(self.get_inventory(limit, page_offset)))
+            return True
+
+        try:
+            for _ in range(concurrency * 2):
+                if not submit_next():
+                    break
+
+            while pending:
+                items = await pending.popleft()
+                submit_next()
+                if items:
+                    yield items
+        finally:
+            for task in pending:
+                task.cancel()
+            # Esperar las tareas canceladas evita avisos de tareas destruidas
+            # pendientes o con excepciones nunca recuperadas
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _request_page(self, limit: int, offset: int) -> Union[Dict, List]:
+        """
+        Solicita una página de inventario probando los endpoints conocidos
+
+        Args:
+            limit: Límite de resultados (máximo 300)
+            offset: Offset para paginación
+
+        Returns:
+            Cuerpo de la respuesta decodificado
+
+        Raises:
+            requests.RequestException: Ningún endpoint respondió correctamente
+            httpx.TransportError: Sin conexión tras agotar los reintentos
+                (no se prueban los demás endpoints)
+        """
+        cached, candidates = self._endpoint_candidates()
+
+        with self.metrics.span("fetch", offset=offset, limit=limit):
+            for endpoint, param_style in candidates:
+                url = self._build_url(endpoint)
+                param_set = self._build_params(param_style, limit, offset)
+                try:
+                    logger.debug("GET %s %s", url, param_set)
+
+                    response = await self._send(url, param_set)
+
+                    success, data = self._handle_response(
+                        response, url, (endpoint, param_style), cached
+                    )
+                    if success:
+                        return data
+
+                except httpx.TransportError:
+                    # Los reintentos ya se agotaron en _send; un fallo de
+                    # transporte no dice nada sobre qué endpoint es el correcto
+                    raise
+                except (httpx.HTTPError, ValueError) as e:
+                    logger.info("Error en %s: %s", url, e)
+                    continue
+
+        raise requests.RequestException(
+            "No se pudo conectar a ningún endpoint de inventario. "
+            "Verifica tu token y location ID."
+        )
+
+    async def _send(self, url: str, params: Dict) -> "httpx.Response":
+        """
+        Envía una petición GET respetando el límite de ritmo y reintentando
+
+        Args:
+            url: URL completa del endpoint
+            params: Parámetros de consulta
+
+        Returns:
+            Última respuesta recibida
+
+        Raises:
+            httpx.TransportError: Error de conexión tras agotar reintentos
+        """
+        attempt = 0
+        while True:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            started = time.perf_counter()
+            try:
+                response = await self.client.get(
+                    url, params=params, headers=self._headers
+                )
+            except httpx.TransportError as e:
+                self._record_request(url, started, attempt, error=e)
+                if attempt >= self.retry_policy.max_retries:
+                    raise
+                delay = self.retry_policy.compute_delay(attempt)
+                logger.warning(
+                    "Reintentando en %.1fs tras error de conexión: %s", delay, e
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            self._record_request(url, started, attempt, response)
+            self.rate_limiter.update_from_headers(response.headers)
+
+            if not self.retry_policy.should_retry(response.status_code, attempt):
+                return response
+
+            delay = self.retry_policy.compute_delay(attempt, response.headers)
+            logger.warning(
+                "HTTP %d, reintentando en %.1fs", response.status_code, delay
+            )
+            if response.status_code == 429:
+                self.rate_limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def test_connection(self, timeout: float = PROBE_TIMEOUT) -> Dict[str, any]:
+        """
+        Prueba la conexión con peticiones livianas (ver ``HighLevelAPI``)
+
+        Args:
+            timeout: Segundos máximos de espera de la petición
+
+        Returns:
+            Diccionario con success y message; si hubo respuesta también
+            items_count, endpoint, status_code, latency_ms y headers_ms
+        """
+        cached, targets = self._probe_targets()
+        for url, params, candidate in targets:
+            started = time.perf_counter()
+            try:
+                response = await self.client.get(
+                    url, params=params, headers=self._headers, timeout=timeout
+                )
+            except httpx.HTTPError as e:
+                # Todos los endpoints están en el mismo host
+                return self._connection_result(error=e)
+            latency = time.perf_counter() - started
+            self.rate_limiter.update_from_headers(response.headers)
+            result = self._probe_result(response, url, candidate, cached, latency)
+            if not self._probe_continues(result, response):
+                break
+        return result
+
+
+def create_async_client(pool_size: int = DEFAULT_POOL_SIZE) -> "httpx.AsyncClient":
+    """
+    Crea un cliente httpx asíncrono con pool de conexiones keep-alive
+
+    Args:
+        pool_size: Número máximo de conexiones simultáneas
+
+    Returns:
+        Cliente asíncrono configurado
+    """
+    if httpx is None:
+        raise ImportError(
+            "httpx no está instalado. Instálalo con: uv sync --extra async"
+        )
+    return httpx.AsyncClient(
+        timeout=30,
+        limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        ),
+        headers={"Accept-Encoding": "gzip, deflate"},
+    )
@@ -0,0 +1,64 @@
+"""
+Cancelación cooperativa de operaciones largas (descargas, reportes, OAuth).
+"""
+import threading
+
+# Intervalo máximo entre comprobaciones mientras se espera otra cosa
+# (páginas en paralelo, callback de OAuth)
+CANCEL_POLL_INTERVAL = 0.2
+
+
+class OperationCancelled(Exception):
+    """La operación fue cancelada por el usuario"""
+
+    def __init__(self, message: str = "Operación cancelada"):
+        super().__init__(message)
+
+
+class CancellationToken:
+    """
+    Señal de cancelación compartida entre la interfaz y un hilo de trabajo
+
+    La interfaz llama a ``cancel()`` y el código de la operación la consulta
+    en puntos seguros (entre páginas, cada pocas filas, durante las esperas)
+    con ``raise_if_cancelled()``, que lanza ``OperationCancelled``. Las
+    esperas con ``sleep()`` se interrumpen en cuanto se cancela.
+
+    Una petición HTTP ya enviada no se interrumpe: termina (o vence su
+    timeout) y la cancelación se aplica en la siguiente comprobación.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Indica si ya se pidió la cancelación"""
+        return self._event.is_set()
+
+    def cancel(self):
+        """Pide la cancelación (seguro desde cualquier hilo)"""
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        """
+        Comprueba la cancelación
+
+        Raises:
+            OperationCancelled: Se pidió la cancelación
+        """
+        if self._event.is_set():
+            raise OperationCancelled()
+
+    def sleep(self, seconds: float):
+        """
+        Espera el tiempo indicado, salvo que se cancele antes
+
+        Args:
+            seconds: Segundos de espera
+
+        Raises:
+            OperationCancelled: Se pidió la cancelación antes o durante la espera
+        """
+        if self._event.wait(max(0.0, seconds)):
+            raise OperationCancelled()
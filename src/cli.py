@@ -0,0 +1,426 @@
+"""
+Interfaz de línea de comandos (sin Qt) para exportaciones programadas.
+
+Uso:
+    python -m src fetch [--incremental]
+    python -m src export -o inventario.xlsx [--backend auto] [--from-snapshot]
+    python -m src snapshot [--limit 10]
+    python -m src diff [OLD_ID NEW_ID]
+
+Cada comando imprime en stdout un único objeto JSON con el resultado y los
+tiempos de cada fase; el progreso y los mensajes de diagnóstico van a stderr.
+Con ``--metrics FILE`` se registra cada petición y etapa en FILE (JSON Lines)
+y el resultado incluye su resumen en ``metrics``.
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import requests
+from dotenv import load_dotenv
+
+try:
+    from .app_paths import load_env_file
+    from .delta_sync import DeltaSync, diff_snapshots
+    from .highlevel_api import MAX_PAGE_SIZE, HighLevelAPI
+    from .logging_setup import configure_logging
+    from .metrics import Metrics
+    from .pipeline import stream_inventory_to_excel
+    from .report_backends import (
+        AUTO_BACKEND,
+        backend_names,
+        backend_of,
+        create_generator,
+        supports_streaming,
+    )
+    from .snapshot_store import SnapshotStore, hash_page
+except ImportError:
+    from app_paths import load_env_file
+    from delta_sync import DeltaSync, diff_snapshots
+    from highlevel_api import MAX_PAGE_SIZE, HighLevelAPI
+    from logging_setup import configure_logging
+    from metrics import Metrics
+    from pipeline import stream_inventory_to_excel
+    from report_backends import (
+        AUTO_BACKEND,
+        backend_names,
+        backend_of,
+        create_generator,
+        supports_streaming,
+    )
+    from snapshot_store import SnapshotStore, hash_page
+
+logger = logging.getLogger(__name__)
+
+# Códigos de salida
+EXIT_OK = 0
+EXIT_ERROR = 1  # Error inesperado
+EXIT_USAGE = 2  # Argumentos inválidos (argparse)
+EXIT_CONFIG = 3  # Falta token/location o la opción no es válida
+EXIT_API = 4  # La API no respondió correctamente
+EXIT_NOT_FOUND = 5  # No hay snapshots para la operación pedida
+
+IMAGE_NOTES_CHOICES = ("auto", "cell", "header")
+
+
+class CliError(Exception):
+    """Error esperado de un comando, con su código de salida"""
+
+    def __init__(self, message: str, exit_code: int = EXIT_ERROR):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class Timings:
+    """Acumula la duración en segundos de cada fase de un comando"""
+
+    def __init__(self):
+        self.values: Dict[str, float] = {}
+        self._started_at = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mide el bloque ``with`` bajo el nombre indicado"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.values[name] = self.values.get(name, 0.0) + (
+                time.perf_counter() - start
+            )
+
+    def as_dict(self) -> Dict[str, float]:
+        """Tiempos redondeados, incluido el total del comando"""
+        values = dict(self.values)
+        values["total"] = time.perf_counter() - self._started_at
+        return {name: round(seconds, 4) for name, seconds in values.items()}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construye el parser de argumentos con todos los subcomandos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Inventario GHL sin interfaz gráfica",
+    )
+    parser.add_argument(
+        "--env-file", help="Archivo .env a cargar (por defecto, el del proyecto)"
+    )
+    parser.add_argument("--location-id", help="Location (por defecto, del .env)")
+    parser.add_argument("--token", help="Access token (por defecto, del .env)")
+    parser.add_argument(
+        "--base-url", help="URL de la API (por defecto, HIGHLEVEL_BASE_URL o la real)"
+    )
+    parser.add_argument(
+        "--metrics",
+        dest="metrics_path",
+        metavar="FILE",
+        help="Agregar métricas por petición y etapa a un archivo JSON Lines",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="No mostrar progreso en stderr"
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        default=None,
+        help="Registrar cada petición en stderr y en el archivo de log",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fetch = subparsers.add_parser(
+        "fetch", help="Descarga el catálogo y lo guarda como snapshot local"
+    )
+    _add_fetch_arguments(fetch)
+    fetch.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Procesar solo lo que cambió desde el último snapshot",
+    )
+
+    export = subparsers.add_parser("export", help="Genera un reporte")
+    _add_fetch_arguments(export)
+    export.add_argument("-o", "--output", help="Ruta del archivo a generar")
+    export.add_argument(
+        "--backend",
+        choices=backend_names(include_auto=True),
+        default=AUTO_BACKEND,
+        help="Formato/motor del reporte (por defecto: auto)",
+    )
+    export.add_argument(
+        "--constant-memory",
+        action="store_true",
+        default=None,
+        help="Forzar el modo de memoria constante de XlsxWriter",
+    )
+    export.add_argument(
+        "--image-notes",
+        choices=IMAGE_NOTES_CHOICES,
+        help="Dónde poner las instrucciones de imagen (XlsxWriter)",
+    )
+    export.add_argument(
+        "--from-snapshot",
+        nargs="?",
+        const="latest",
+        metavar="ID",
+        help="Exportar un snapshot local (por defecto, el último) sin usar la API",
+    )
+
+    snapshot = subparsers.add_parser("snapshot", help="Lista los snapshots locales")
+    snapshot.add_argument(
+        "--limit", type=int, default=10, help="Máximo de snapshots a listar"
+    )
+
+    diff = subparsers.add_parser(
+        "diff", help="Compara dos snapshots (por defecto, los dos últimos)"
+    )
+    diff.add_argument("old_id", nargs="?", type=int, help="Snapshot de referencia")
+    diff.add_argument("new_id", nargs="?", type=int, help="Snapshot a comparar")
+    diff.add_argument(
+        "--ids", action="store_true", help="Incluir los ids de cada grupo"
+    )
+
+    return parser
+
+
+def _add_fetch_arguments(parser: argparse.ArgumentParser):
+    """Argumentos comunes de los comandos que consultan la API"""
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=MAX_PAGE_SIZE,
+        help=f"Items por página (máximo {MAX_PAGE_SIZE})",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="Páginas solicitadas en paralelo"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ejecuta la línea de comandos
+
+    Args:
+        argv: Argumentos (por defecto, ``sys.argv[1:]``)
+
+    Returns:
+        Código de salida
+    """
+    args = build_parser().parse_args(argv)
+    if args.env_file:
+        load_dotenv(args.env_file, override=True)
+    else:
+        load_env_file()
+    args.metrics = Metrics(args.metrics_path) if args.metrics_path else None
+    # Los diagnósticos van a stderr (y al log) para que stdout contenga solo
+    # el JSON del resultado
+    configure_logging(debug=args.debug, stream=sys.stderr)
+
+    timings = Timings()
+    commands = {
+        "fetch": command_fetch,
+        "export": command_export,
+        "snapshot": command_snapshot,
+        "diff": command_diff,
+    }
+
+    try:
+        result = commands[args.command](args, timings)
+        result["status"] = "ok"
+        exit_code = EXIT_OK
+    except CliError as e:
+        result, exit_code = {"status": "error", "error": str(e)}, e.exit_code
+    except ValueError as e:
+        result, exit_code = {"status": "error", "error": str(e)}, EXIT_CONFIG
+    except requests.RequestException as e:
+        result, exit_code = {"status": "error", "error": str(e)}, EXIT_API
+    except sqlite3.Error as e:
+        result = {"status": "error", "error": f"Snapshot local: {e}"}
+        exit_code = EXIT_ERROR
+    except Exception as e:
+        logger.exception("Error inesperado en el comando %s", args.command)
+        result = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        exit_code = EXIT_ERROR
+
+    result["command"] = args.command
+    result["exit_code"] = exit_code
+    result["timings"] = timings.as_dict()
+    if args.metrics:
+        result["metrics"] = args.metrics.summary()
+        args.metrics.close()
+    sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+    return exit_code
+
+
+def command_fetch(args: argparse.Namespace, timings: Timings) -> Dict:
+    """Descarga el catálogo completo y lo guarda como snapshot"""
+    store = SnapshotStore()
+    with _create_api(args) as api_client:
+        progress = _progress_printer(args, "obtenidos")
+
+        with timings.phase("fetch"):
+            if args.incremental:
+                result = DeltaSync(api_client, store, page_size=args.page_size).sync(
+                    concurrency=args.concurrency, progress_callback=progress
+                )
+                result["incremental"] = True
+                return result
+
+            snapshot_id = store.begin_snapshot(api_client.location_id)
+            try:
+                position = 0
+                for page in api_client.iter_inventory(
+                    page_size=args.page_size,
+                    progress_callback=progress,
+                    concurrency=args.concurrency,
+                ):
+                    formatted = api_client.format_inventory_data(page)
+                    item_hashes = store.add_items(
+                        snapshot_id, page, formatted, position
+                    )
+                    store.add_page(
+                        snapshot_id, position, len(item_hashes), hash_page(item_hashes)
+                    )
+                    position += len(page)
+            except BaseException:
+                store.discard_snapshot(snapshot_id)
+                raise
+            items_count = store.finish_snapshot(snapshot_id)
+
+    return {
+        "incremental": False,
+        "snapshot_id": snapshot_id,
+        "items_count": items_count,
+    }
+
+
+def command_export(args: argparse.Namespace, timings: Timings) -> Dict:
+    """Genera un reporte desde la API (en streaming si se puede) o un snapshot"""
+    options = {
+        "backend": args.backend,
+        "constant_memory": args.constant_memory,
+        "image_notes": args.image_notes,
+    }
+
+    if args.from_snapshot:
+        store = SnapshotStore()
+        snapshot = _resolve_snapshot(store, args.from_snapshot, args.location_id)
+        with timings.phase("load"):
+            inventory_data = store.load_formatted(snapshot["id"])
+        with timings.phase("write"):
+            generator = create_generator(row_count=len(inventory_data), **options)
+            path = generator.create_report(inventory_data, args.output)
+            generator.add_summary(inventory_data)
+        return {
+            "path": path,
+            "items_count": len(inventory_data),
+            "snapshot_id": snapshot["id"],
+            "backend": _backend_name(generator),
+        }
+
+    with _create_api(args) as api_client:
+        generator = create_generator(
+            streaming=supports_streaming(args.backend), **options
+        )
+        # Descarga y escritura se solapan: se mide el conjunto
+        with timings.phase("fetch_and_write"):
+            result = stream_inventory_to_excel(
+                api_client,
+                args.output,
+                generator=generator,
+                page_size=args.page_size,
+                concurrency=args.concurrency,
+                progress_callback=None if args.quiet else _print_progress,
+            )
+    result["backend"] = _backend_name(generator)
+    return result
+
+
+def command_snapshot(args: argparse.Namespace, timings: Timings) -> Dict:
+    """Lista los snapshots guardados"""
+    with timings.phase("load"):
+        snapshots = SnapshotStore().list_snapshots(args.location_id, args.limit)
+    return {"snapshots": snapshots}
+
+
+def command_diff(args: argparse.Namespace, timings: Timings) -> Dict:
+    """Compara dos snapshots guardados"""
+    store = SnapshotStore()
+
+    if (args.old_id is None) != (args.new_id is None):
+        raise CliError("Indica ambos snapshots o ninguno", EXIT_CONFIG)
+
+    if args.old_id is None:
+        latest = store.list_snapshots(args.location_id, limit=2)
+        if len(latest) < 2:
+            raise CliError("Se necesitan al menos dos snapshots", EXIT_NOT_FOUND)
+        new_snapshot, old_snapshot = latest
+    else:
+        old_snapshot = _resolve_snapshot(store, args.old_id, args.location_id)
+        new_snapshot = _resolve_snapshot(store, args.new_id, args.location_id)
+
+    with timings.phase("diff"):
+        diff = diff_snapshots(store, old_snapshot["id"], new_snapshot["id"])
+
+    result = {
+        "old_snapshot_id": old_snapshot["id"],
+        "new_snapshot_id": new_snapshot["id"],
+        "unchanged": diff["unchanged"],
+    }
+    for group in ("added", "removed", "changed"):
+        result[group] = len(diff[group])
+        if args.ids:
+            result[f"{group}_ids"] = diff[group]
+    return result
+
+
+def _create_api(args: argparse.Namespace) -> HighLevelAPI:
+    """Crea el cliente de la API con las credenciales de los argumentos o .env"""
+    return HighLevelAPI(
+        access_token=args.token,
+        location_id=args.location_id,
+        base_url=args.base_url,
+        metrics=args.metrics,
+    )
+
+
+def _resolve_snapshot(store: SnapshotStore, snapshot_ref, location_id) -> Dict:
+    """Obtiene un snapshot por id o el último ("latest")"""
+    if snapshot_ref == "latest":
+        snapshot = store.latest_snapshot(location_id)
+    else:
+        try:
+            snapshot = store.get_snapshot(int(snapshot_ref))
+        except ValueError:
+            raise CliError(f"Id de snapshot inválido: {snapshot_ref}", EXIT_CONFIG)
+    if not snapshot:
+        raise CliError(f"No existe el snapshot {snapshot_ref}", EXIT_NOT_FOUND)
+    return snapshot
+
+
+def _backend_name(generator) -> Optional[str]:
+    """Nombre del backend usado, para el resultado JSON"""
+    backend = backend_of(generator)
+    return backend.name if backend else None
+
+
+def _print_progress(message: str, current=None, total=None):
+    """Escribe un mensaje de progreso en stderr (los contadores se ignoran)"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def _progress_printer(args: argparse.Namespace, verb: str):
+    """Callback de progreso por página para ``iter_inventory``/``DeltaSync``"""
+    if args.quiet:
+        return None
+
+    def on_page(count, total, page_number):
+        total_text = f" de {total}" if total is not None else ""
+        _print_progress(f"Página {page_number}: {count}{total_text} productos {verb}")
+
+    return on_page
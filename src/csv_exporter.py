@@ -0,0 +1,152 @@
+"""
+Exportador CSV en streaming para el inventario formateado.
+"""
+import csv
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    from .cancellation import CancellationToken
+except ImportError:
+    from cancellation import CancellationToken
+
+# Columnas producidas por ``format_inventory_data``, en orden de salida
+REPORT_COLUMNS = ("Nombre", "Nombre de producto", "Cantidad disponible", "Imagen")
+
+# Filas escritas entre comprobaciones de cancelación
+CANCEL_CHECK_ROWS = 1000
+
+
+def default_output_path(extension: str) -> str:
+    """Nombre de archivo con fecha y hora, igual que los reportes de Excel"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"inventario_ghl_{timestamp}{extension}"
+
+
+class CsvExporter:
+    """
+    Exporta el inventario a CSV sin formato, pensado para procesos de BI
+
+    Comparte la interfaz de los generadores de Excel (``create_report`` +
+    ``add_summary`` o ``start_report`` / ``append_rows`` / ``finish_report``).
+    Cada bloque se escribe directo al archivo, así que la memoria no crece
+    con el número de filas. El CSV no lleva resumen para que siga siendo una
+    tabla plana.
+    """
+
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
+        """
+        Args:
+            cancel_token: Token para cancelar la escritura
+        """
+        self.cancel_token = cancel_token or CancellationToken()
+        self.output_path = None
+        self._file = None
+        self._writer = None
+        self._rows_written = 0
+
+    def create_report(
+        self,
+        inventory_data: List[Dict],
+        output_path: Optional[str] = None,
+        progress_callback=None,
+    ) -> str:
+        """
+        Escribe el inventario completo en un CSV
+
+        El archivo queda abierto hasta ``add_summary()``, igual que en los
+        generadores de Excel.
+
+        Args:
+            inventory_data: Lista de items formateados
+            output_path: Ruta donde guardar el archivo (opcional)
+            progress_callback: Función callback para reportar progreso
+
+        Returns:
+            Ruta del archivo generado
+        """
+        output_path = self.start_report(output_path, progress_callback)
+        self.append_rows(inventory_data, progress_callback)
+        return output_path
+
+    def start_report(
+        self,
+        output_path: Optional[str] = None,
+        progress_callback=None,
+        expected_rows: Optional[int] = None,
+    ) -> str:
+        """
+        Abre el archivo y escribe la fila de encabezados
+
+        Args:
+            output_path: Ruta donde guardar el archivo (opcional)
+            progress_callback: Función callback para reportar progreso
+            expected_rows: Ignorado; se acepta por compatibilidad
+
+        Returns:
+            Ruta del archivo que se generará
+        """
+        if progress_callback:
+            progress_callback("Creando archivo CSV...")
+
+        self.output_path = output_path or default_output_path(".csv")
+        self._file = open(self.output_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(REPORT_COLUMNS)
+        self._rows_written = 0
+        return self.output_path
+
+    def append_rows(self, items: List[Dict], progress_callback=None):
+        """
+        Agrega un bloque de filas al archivo
+
+        Args:
+            items: Items formateados (por ejemplo, una página de la API)
+            progress_callback: Función callback para reportar progreso
+
+        Raises:
+            OperationCancelled: Se canceló la operación
+        """
+        for start in range(0, len(items), CANCEL_CHECK_ROWS):
+            self.cancel_token.raise_if_cancelled()
+            self._writer.writerows(
+                [item.get(column, "") for column in REPORT_COLUMNS]
+                for item in items[start : start + CANCEL_CHECK_ROWS]
+            )
+        self._rows_written += len(items)
+        if progress_callback:
+            progress_callback(
+                f"{self._rows_written} filas escritas", self._rows_written
+            )
+
+    def finish_report(self, progress_callback=None) -> str:
+        """
+        Cierra el archivo
+
+        Args:
+            progress_callback: Función callback para reportar progreso
+
+        Returns:
+            Ruta del archivo generado
+        """
+        self.add_summary()
+        return self.output_path
+
+    def add_summary(self, inventory_data: Optional[List[Dict]] = None):
+        """
+        Cierra el archivo (el CSV no lleva filas de resumen)
+
+        Args:
+            inventory_data: Ignorado; se acepta por compatibilidad
+        """
+        if self._file:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def discard_report(self):
+        """Cierra y borra un archivo a medias (por ejemplo, al cancelar)"""
+        self.add_summary()
+        if self.output_path and os.path.exists(self.output_path):
+            os.remove(self.output_path)
@@ -0,0 +1,324 @@
+"""
+Sincronización incremental del inventario contra el último snapshot local.
+"""
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    from .cancellation import CancellationToken
+    from .highlevel_api import MAX_PAGE_SIZE, HighLevelAPI
+    from .snapshot_store import (
+        SnapshotStore,
+        hash_page,
+        hash_text,
+        item_key,
+        serialize_item,
+    )
+except ImportError:
+    from cancellation import CancellationToken
+    from highlevel_api import MAX_PAGE_SIZE, HighLevelAPI
+    from snapshot_store import (
+        SnapshotStore,
+        hash_page,
+        hash_text,
+        item_key,
+        serialize_item,
+    )
+
+
+class DeltaSync:
+    """
+    Actualiza el inventario local descargando y procesando solo lo que cambió
+
+    Para cada página se envía el ETag anterior (``If-None-Match``); si la API
+    responde 304, o si el hash de la página coincide con el del snapshot
+    previo, la página se copia tal cual dentro de SQLite sin reformatear.
+    Solo las páginas distintas se formatean y se comparan item por item
+    (por ``_id``, o por contenido si no lo tiene) para contar altas y
+    cambios; las bajas son los items del snapshot previo que ya no aparecen.
+
+    La API de inventario no expone un filtro por fecha de actualización, por
+    lo que el recorrido siempre cubre todas las páginas; lo que se ahorra es
+    el formateo, la serialización y la escritura de lo que no cambió (y la
+    descarga del cuerpo cuando el servidor soporta ETag).
+    """
+
+    def __init__(
+        self,
+        api_client: HighLevelAPI,
+        snapshot_store: SnapshotStore,
+        page_size: int = MAX_PAGE_SIZE,
+    ):
+        self.api_client = api_client
+        self.snapshot_store = snapshot_store
+        self.page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    def sync(
+        self,
+        concurrency: int = 1,
+        progress_callback: Optional[Callable[[int, Optional[int], int], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Dict[str, int]:
+        """
+        Ejecuta la sincronización y guarda el resultado como nuevo snapshot
+
+        Args:
+            concurrency: Número de páginas solicitadas en paralelo
+            progress_callback: Función llamada tras cada página con
+                (items_procesados, total_reportado_o_None, numero_de_pagina)
+            cancel_token: Token para cancelar; el snapshot a medias se descarta
+
+        Returns:
+            Diccionario con snapshot_id, items_count, added, removed, changed,
+            unchanged, pages_total y pages_skipped
+
+        Raises:
+            requests.RequestException: Error en la petición HTTP
+            OperationCancelled: Se canceló la operación
+        """
+        store = self.snapshot_store
+        location_id = self.api_client.location_id
+
+        previous = store.latest_snapshot(location_id)
+        previous_id = previous["id"] if previous else None
+        previous_pages = store.load_pages(previous_id) if previous_id else {}
+        previous_hashes = store.load_item_hashes(previous_id) if previous_id else {}
+
+        result = {
+            "snapshot_id": None,
+            "items_count": 0,
+            "added": 0,
+            "removed": 0,
+            "changed": 0,
+            "unchanged": 0,
+            "pages_total": 0,
+            "pages_skipped": 0,
+        }
+        seen_keys = set()
+        total = None
+
+        snapshot_id = store.begin_snapshot(location_id)
+        try:
+            for page in self._iter_pages(previous_pages, concurrency, cancel_token):
+                offset = page["offset"]
+                previous_page = previous_pages.get(offset)
+                total = page["total"] if page["total"] is not None else total
+                if page["items"] == []:
+                    # Página final vacía (tras una página completa sin total)
+                    continue
+                result["pages_total"] += 1
+
+                if page["not_modified"] or (
+                    previous_page
+                    and page["items"] is not None
+                    and self._page_hash(page["items"]) == previous_page["page_hash"]
+                ):
+                    # Página idéntica: copiar filas ya formateadas del snapshot
+                    item_keys = store.copy_items(
+                        previous_id, snapshot_id, offset, previous_page["item_count"]
+                    )
+                    seen_keys.update(item_keys)
+                    result["unchanged"] += len(item_keys)
+                    result["pages_skipped"] += 1
+                    store.add_page(
+                        snapshot_id,
+                        offset,
+                        previous_page["item_count"],
+                        previous_page["page_hash"],
+                        page["etag"] or previous_page["etag"],
+                    )
+                    count = len(item_keys)
+                else:
+                    items = page["items"]
+                    formatted = self.api_client.format_inventory_data(items)
+                    item_hashes = store.add_items(
+                        snapshot_id, items, formatted, offset
+                    )
+                    for item, item_hash in zip(items, item_hashes):
+                        key = item_key(item.get("_id"), item_hash)
+                        seen_keys.add(key)
+                        previous_hash = previous_hashes.get(key)
+                        if previous_hash is None:
+                            result["added"] += 1
+                        elif previous_hash != item_hash:
+                            result["changed"] += 1
+                        else:
+                            result["unchanged"] += 1
+                    store.add_page(
+                        snapshot_id,
+                        offset,
+                        len(items),
+                        hash_page(item_hashes),
+                        page["etag"],
+                    )
+                    count = len(items)
+
+                result["items_count"] += count
+                if progress_callback:
+                    progress_callback(
+                        result["items_count"], total, result["pages_total"]
+                    )
+        except Exception:
+            store.discard_snapshot(snapshot_id)
+            raise
+
+        result["removed"] = len(set(previous_hashes) - seen_keys)
+        store.finish_snapshot(snapshot_id)
+        result["snapshot_id"] = snapshot_id
+        return result
+
+    def _iter_pages(
+        self,
+        previous_pages: Dict[int, Dict],
+        concurrency: int,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[Dict]:
+        """
+        Recorre las páginas enviando el ETag previo de cada offset
+
+        El recorrido en paralelo empieza tras la primera página: hasta el
+        total reportado o, si la página no lo trae (un 304 nunca lo trae),
+        hasta el final del snapshot previo; en ese caso el recorrido sigue
+        página a página si el catálogo resultó más largo.
+
+        Args:
+            previous_pages: Metadatos de página del snapshot previo
+            concurrency: Número de páginas solicitadas en paralelo
+            cancel_token: Token para cancelar el recorrido
+
+        Yields:
+            Resultado de ``HighLevelAPI.fetch_page`` en orden de offset
+        """
+        cancel_token = cancel_token or CancellationToken()
+
+        def fetch(limit: int, offset: int) -> Dict:
+            previous_page = previous_pages.get(offset)
+            etag = previous_page["etag"] if previous_page else None
+            return self.api_client.fetch_page(limit, offset, etag, cancel_token)
+
+        previous_end = max(
+            (offset + page["item_count"] for offset, page in previous_pages.items()),
+            default=0,
+        )
+        offset = 0
+        page_size = self.page_size
+        while True:
+            cancel_token.raise_if_cancelled()
+            page = fetch(page_size, offset)
+            yield page
+
+            count = self._page_count(page, previous_pages)
+            offset += count
+            if self._is_last_page(page, count, offset, page_size, previous_pages):
+                return
+            if count < page_size:
+                # La API recortó el límite: el resto se pide con su tamaño real
+                page_size = count
+            if concurrency <= 1:
+                continue
+
+            total = page["total"]
+            if total is not None:
+                # Con el total conocido las páginas restantes son independientes
+                yield from self.api_client._iter_pages_parallel(
+                    offset,
+                    total,
+                    page_size,
+                    concurrency,
+                    fetch=fetch,
+                    cancel_token=cancel_token,
+                )
+                return
+            if previous_end > offset:
+                # Sin total se estima con el snapshot previo, en páginas completas
+                # para reutilizar sus ETags
+                pages = -(-(previous_end - offset) // page_size)
+                for page in self.api_client._iter_pages_parallel(
+                    offset,
+                    offset + pages * page_size,
+                    page_size,
+                    concurrency,
+                    fetch=fetch,
+                    cancel_token=cancel_token,
+                ):
+                    yield page
+                    count = self._page_count(page, previous_pages)
+                    offset += count
+                if self._is_last_page(page, count, offset, page_size, previous_pages):
+                    return
+
+    @staticmethod
+    def _is_last_page(
+        page: Dict,
+        count: int,
+        offset: int,
+        page_size: int,
+        previous_pages: Dict[int, Dict],
+    ) -> bool:
+        """
+        Indica si el recorrido termina tras una página
+
+        Args:
+            page: Resultado de ``fetch_page``
+            count: Items de la página (los del snapshot previo si fue 304)
+            offset: Offset siguiente a la página
+            page_size: Límite con el que se pidió la página
+            previous_pages: Metadatos de página del snapshot previo
+
+        Returns:
+            True si no quedan páginas por pedir
+        """
+        total = page["total"]
+        if count == 0 or (total is not None and offset >= total):
+            return True
+        # Sin total, una página corta es la última; un 304 no trae total, así
+        # que se sigue si el snapshot previo seguía
+        return (
+            total is None
+            and count < page_size
+            and not (page["not_modified"] and offset in previous_pages)
+        )
+
+    @staticmethod
+    def _page_count(page: Dict, previous_pages: Dict[int, Dict]) -> int:
+        """Número de items de una página (el previo si respondió 304)"""
+        if page["not_modified"]:
+            return previous_pages[page["offset"]]["item_count"]
+        return len(page["items"])
+
+    @staticmethod
+    def _page_hash(items) -> str:
+        """Hash de una página recibida, comparable con el guardado"""
+        return hash_page([hash_text(serialize_item(item)) for item in items])
+
+
+def diff_snapshots(
+    snapshot_store: SnapshotStore, old_snapshot_id: int, new_snapshot_id: int
+) -> Dict[str, List[str]]:
+    """
+    Compara dos snapshots guardados item por item (ver ``item_key``)
+
+    Args:
+        snapshot_store: Almacén de snapshots
+        old_snapshot_id: Snapshot de referencia
+        new_snapshot_id: Snapshot a comparar
+
+    Returns:
+        Diccionario con las listas de claves added, removed y changed, y el
+        número de unchanged
+    """
+    old_hashes = snapshot_store.load_item_hashes(old_snapshot_id)
+    new_hashes = snapshot_store.load_item_hashes(new_snapshot_id)
+
+    added = [item_id for item_id in new_hashes if item_id not in old_hashes]
+    removed = [item_id for item_id in old_hashes if item_id not in new_hashes]
+    changed = [
+        item_id
+        for item_id, item_hash in new_hashes.items()
+        if item_id in old_hashes and old_hashes[item_id] != item_hash
+    ]
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "unchanged": len(new_hashes) - len(added) - len(changed),
+    }
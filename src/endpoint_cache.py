@@ -0,0 +1,135 @@
+"""
+Caché de la combinación endpoint/parámetros que funciona para cada location.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    from .app_paths import get_app_data_dir
+except ImportError:
+    from app_paths import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Tiempo de vida por defecto de una entrada (24 horas)
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+CACHE_FILENAME = "endpoint_cache.json"
+
+
+class EndpointCache:
+    """
+    Memoriza qué endpoint y estilo de parámetros respondió para cada location
+
+    Las entradas se mantienen en memoria y se persisten en un archivo JSON
+    pequeño para que los siguientes arranques vayan directo a la URL correcta.
+    Es seguro usarla desde varios hilos.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.path = Path(path) if path else None
+        self.ttl_seconds = ttl_seconds
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """
+        Obtiene la combinación memorizada para una clave
+
+        Args:
+            key: Identificador de la location (incluye la URL base)
+
+        Returns:
+            Tupla (ruta del endpoint, estilo de parámetros) o None si no existe
+            o expiró
+        """
+        with self._lock:
+            entry = self._load().get(key)
+            if not entry:
+                return None
+            if time.time() - entry.get("saved_at", 0) > self.ttl_seconds:
+                return None
+            return entry["endpoint"], entry["param_style"]
+
+    def set(self, key: str, endpoint: str, param_style: str):
+        """
+        Guarda la combinación que funcionó para una clave
+
+        Args:
+            key: Identificador de la location (incluye la URL base)
+            endpoint: Ruta del endpoint relativa a la URL base
+            param_style: Estilo de parámetros usado
+        """
+        with self._lock:
+            self._load()[key] = {
+                "endpoint": endpoint,
+                "param_style": param_style,
+                "saved_at": time.time(),
+            }
+            self._save()
+
+    def invalidate(self, key: str):
+        """
+        Elimina la combinación memorizada para una clave
+
+        Args:
+            key: Identificador de la location (incluye la URL base)
+        """
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._save()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Carga las entradas desde disco la primera vez que se necesitan"""
+        if self._entries is None:
+            self._entries = {}
+            if self.path and self.path.exists():
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if isinstance(data, dict):
+                        self._entries = data
+                except (OSError, ValueError) as e:
+                    logger.warning("No se pudo leer la caché de endpoints: %s", e)
+        return self._entries
+
+    def _save(self):
+        """Escribe las entradas en disco de forma atómica"""
+        if not self.path:
+            return
+        try:
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("No se pudo guardar la caché de endpoints: %s", e)
+
+
+_default_cache: Optional[EndpointCache] = None
+
+
+def get_default_cache() -> EndpointCache:
+    """
+    Obtiene la caché compartida del proceso, persistida en el directorio de datos
+
+    Returns:
+        Instancia compartida de EndpointCache
+    """
+    global _default_cache
+    if _default_cache is None:
+        try:
+            path = get_app_data_dir() / CACHE_FILENAME
+        except OSError:
+            path = None
+        _default_cache = EndpointCache(path)
+    return _default_cache
@@ -5,28 +5,51 @@ import os
 from datetime import datetime
 from typing import List, Dict, Optional
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.comments import Comment
 
+try:
+    from .cancellation import CancellationToken
+except ImportError:
+    from cancellation import CancellationToken
+
+# Estilos con nombre registrados una sola vez por workbook; cada celda solo
+# guarda una referencia al estilo en lugar de copiar borde, relleno, etc.
+STYLE_HEADER = 'ghl_header'
+STYLE_CELL = 'ghl_cell'
+STYLE_CELL_ALT = 'ghl_cell_alt'
+STYLE_QUANTITY = 'ghl_quantity'
+STYLE_QUANTITY_ALT = 'ghl_quantity_alt'
+
 
 class ExcelGenerator:
     """Generador de reportes de Excel para inventario"""
     
-    def __init__(self):
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
+        """
+        Args:
+            cancel_token: Token para cancelar la escritura de filas
+        """
+        self.cancel_token = cancel_token or CancellationToken()
         self.workbook = None
         self.worksheet = None
+        self.output_path = None
     
     def create_report(self, inventory_data: List[Dict], output_path: Optional[str] = None, progress_callback=None) -> str:
         """
         Crea un reporte de Excel con los datos del inventario
-        
+
+        El archivo no se escribe aquí sino en ``add_summary()``, igual que en
+        XlsxWriter: así se guarda una sola vez y con el resumen incluido.
+        Quien llame a este método debe llamar después a ``add_summary()``.
+
         Args:
             inventory_data: Lista de items del inventario
             output_path: Ruta donde guardar el archivo (opcional)
             progress_callback: Función callback para reportar progreso
-            
+
         Returns:
-            Ruta del archivo generado
+            Ruta del archivo que escribirá ``add_summary()``
         """
         if progress_callback:
             progress_callback("Creando estructura del reporte...")
@@ -39,21 +62,21 @@ class ExcelGenerator:
         today = datetime.now().strftime("%d/%m/%Y")
         self.worksheet.title = f"Inventario_{today.replace('/', '-')}"
         
+        # Registrar estilos
+        self._register_styles()
+
         # Crear encabezados
         self._create_headers()
         
         if progress_callback:
             progress_callback("Agregando datos del inventario...")
         
-        # Agregar datos (incluye descarga de imágenes)
+        # Agregar datos con su formato en una sola pasada
         self._add_data(inventory_data, progress_callback)
         
         if progress_callback:
             progress_callback("Aplicando formato...")
         
-        # Aplicar formato
-        self._apply_formatting()
-        
         # Ajustar ancho de columnas
         self._adjust_column_widths()
         
@@ -61,12 +84,13 @@ class ExcelGenerator:
         if not output_path:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"inventario_ghl_{timestamp}.xlsx"
+        self.output_path = output_path
         
         if progress_callback:
             progress_callback("Guardando archivo...")
         
-        # Guardar archivo
-        self.workbook.save(output_path)
+        # NO guardar aquí para permitir agregar el resumen después
+        # El workbook se guardará en add_summary(), igual que en XlsxWriter
         
         return output_path
     
@@ -78,50 +102,74 @@ class ExcelGenerator:
         self.worksheet.row_dimensions[1].height = 30
         
         for col, header in enumerate(headers, 1):
-            cell = self.worksheet.cell(row=1, column=col)
-            cell.value = header
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Agregar bordes
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            cell.border = thin_border
+            cell = self.worksheet.cell(row=1, column=col, value=header)
+            cell.style = STYLE_HEADER
+
+    def _register_styles(self):
+        """Registra en el workbook los estilos con nombre del reporte"""
+        thin_border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        light_fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
+        centered = Alignment(horizontal="center")
+
+        styles = [
+            NamedStyle(
+                name=STYLE_HEADER,
+                font=Font(bold=True, color="FFFFFF"),
+                fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+                alignment=Alignment(horizontal="center", vertical="center"),
+                border=thin_border,
+            ),
+            NamedStyle(name=STYLE_CELL, border=thin_border),
+            NamedStyle(name=STYLE_CELL_ALT, border=thin_border, fill=light_fill),
+            NamedStyle(name=STYLE_QUANTITY, border=thin_border, alignment=centered),
+            NamedStyle(
+                name=STYLE_QUANTITY_ALT, border=thin_border, fill=light_fill, alignment=centered
+            ),
+        ]
+        for style in styles:
+            self.workbook.add_named_style(style)
     
     def _add_data(self, inventory_data: List[Dict], progress_callback=None):
-        """Agrega los datos del inventario a la hoja"""
+        """Agrega los datos del inventario a la hoja, ya con su estilo"""
         total_items = len(inventory_data)
         
         for i, item in enumerate(inventory_data):
             row = i + 2  # Empezar en fila 2
             
-            if progress_callback and i % 10 == 0:  # Actualizar cada 10 productos
-                progress = f"Procesando producto {i + 1} de {total_items}"
-                progress_callback(progress)
+            if i % 10 == 0:  # Actualizar cada 10 productos
+                self.cancel_token.raise_if_cancelled()
+                if progress_callback:
+                    progress = f"Procesando producto {i + 1} de {total_items}"
+                    progress_callback(progress, i + 1, total_items)
             
+            # Filas pares con fondo gris (filas alternadas)
+            is_alt_row = row % 2 == 0
+            row_style = STYLE_CELL_ALT if is_alt_row else STYLE_CELL
+            qty_style = STYLE_QUANTITY_ALT if is_alt_row else STYLE_QUANTITY
+
             # Nombre
-            self.worksheet.cell(row=row, column=1, value=item.get('Nombre', ''))
+            self.worksheet.cell(row=row, column=1, value=item.get('Nombre', '')).style = row_style
             
             # Nombre de producto
-            self.worksheet.cell(row=row, column=2, value=item.get('Nombre de producto', ''))
+            self.worksheet.cell(row=row, column=2, value=item.get('Nombre de producto', '')).style = row_style
             
             # Cantidad disponible
             cantidad = item.get('Cantidad disponible', 0)
-            cell_cantidad = self.worksheet.cell(row=row, column=3, value=cantidad)
-            cell_cantidad.alignment = Alignment(horizontal="center")
+            self.worksheet.cell(row=row, column=3, value=cantidad).style = qty_style
             
             # Configurar altura de fila a 100px (aproximadamente 75 puntos)
             self.worksheet.row_dimensions[row].height = 75
             
             # Imagen del producto - última solución: escribir como texto para conversión manual
             imagen_url = item.get('Imagen', '')
+            cell_imagen = self.worksheet.cell(row=row, column=4)
+            cell_imagen.style = row_style
             if imagen_url and imagen_url.strip():
-                cell_imagen = self.worksheet.cell(row=row, column=4)
                 # openpyxl siempre añade @ a las fórmulas, escribir como texto
                 formula_completa = f'=IMAGEN("{imagen_url}",1)'
                 cell_imagen.value = formula_completa
@@ -134,32 +182,7 @@ class ExcelGenerator:
                 )
                 cell_imagen.comment = comment
             else:
-                self.worksheet.cell(row=row, column=4, value='Sin imagen')
-    
-    def _apply_formatting(self):
-        """Aplica formato general a la tabla"""
-        # Bordes para todas las celdas con datos
-        max_row = self.worksheet.max_row
-        max_col = self.worksheet.max_column
-        
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        for row in range(1, max_row + 1):
-            for col in range(1, max_col + 1):
-                self.worksheet.cell(row=row, column=col).border = thin_border
-        
-        # Alternar colores de fila
-        light_fill = PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid")
-        
-        for row in range(2, max_row + 1):
-            if row % 2 == 0:  # Filas pares
-                for col in range(1, max_col + 1):
-                    self.worksheet.cell(row=row, column=col).fill = light_fill
+                cell_imagen.value = 'Sin imagen'
     
     def _adjust_column_widths(self):
         """Ajusta el ancho de las columnas automáticamente"""
@@ -175,8 +198,8 @@ class ExcelGenerator:
     
     def add_summary(self, inventory_data: List[Dict]):
         """
-        Agrega un resumen al final del reporte
-        
+        Agrega un resumen al final del reporte y guarda el archivo
+
         Args:
             inventory_data: Lista de items del inventario
         """
@@ -203,4 +226,13 @@ class ExcelGenerator:
         fecha_generacion = datetime.now().strftime("%d/%m/%Y %H:%M")
         self.worksheet.cell(row=summary_row + 2, column=1, value="Fecha de generación:")
         cell_fecha = self.worksheet.cell(row=summary_row + 2, column=2, value=fecha_generacion)
-        cell_fecha.font = Font(bold=True)
\ No newline at end of file
+        cell_fecha.font = Font(bold=True)
+
+        # Guardar el archivo después de agregar el resumen
+        if self.output_path:
+            self.workbook.save(self.output_path)
+
+    def discard_report(self):
+        """Descarta un reporte a medias; el archivo aún no se ha guardado"""
+        self.workbook = None
+        self.worksheet = None
\ No newline at end of file
@@ -4,15 +4,78 @@ Módulo para generar reportes de Excel con XlsxWriter.
 from datetime import datetime
 from typing import Dict, List, Optional
 
-import xlsxwriter
+try:
+    from .cancellation import CancellationToken
+except ImportError:
+    from cancellation import CancellationToken
+
+# Dónde se explican los pasos para activar las fórmulas =IMAGEN
+IMAGE_NOTES_AUTO = "auto"      # por celda en reportes chicos, nota única en grandes
+IMAGE_NOTES_CELL = "cell"      # un comentario en cada celda con imagen
+IMAGE_NOTES_HEADER = "header"  # un solo comentario en el encabezado de la columna
+IMAGE_NOTES_MODES = (IMAGE_NOTES_AUTO, IMAGE_NOTES_CELL, IMAGE_NOTES_HEADER)
+
+# A partir de este número de filas el modo automático usa la nota única:
+# XlsxWriter genera una forma VML por comentario y el costo crece más que
+# linealmente (unos 73 s para 10 000 comentarios)
+LARGE_REPORT_ROWS = 1000
+
+IMAGE_COMMENT_TEXT = (
+    'Para activar imágenes:\n'
+    '1. Seleccionar toda la columna D\n'
+    '2. Ctrl+L (Buscar y Reemplazar)\n'
+    '3. Buscar: =IMAGEN   Reemplazar: =IMAGEN\n'
+    '4. Reemplazar todo\n'
+    'O individual: F2 → Enter'
+)
 
 
 class ExcelGenerator:
-    """Generador de reportes de Excel para inventario usando XlsxWriter"""
+    """
+    Generador de reportes de Excel para inventario usando XlsxWriter
     
-    def __init__(self):
+    Con ``constant_memory=True`` XlsxWriter vuelca cada fila a disco en cuanto
+    se pasa a la siguiente, en lugar de mantener todas las celdas en memoria
+    hasta cerrar el archivo. Exige escribir en orden de fila, por lo que el
+    bloque de instrucciones (fila 0) se escribe junto con los encabezados y
+    el resumen al final; los comentarios de celda se siguen guardando aparte
+    hasta el cierre.
+
+    ``image_notes`` controla los comentarios con instrucciones de la columna
+    de imagen: uno por celda, uno solo en el encabezado, o automático según
+    el tamaño del reporte (ver ``LARGE_REPORT_ROWS``).
+    """
+
+    def __init__(
+        self,
+        constant_memory: bool = False,
+        image_notes: str = IMAGE_NOTES_AUTO,
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        """
+        Inicializa el generador
+
+        Args:
+            constant_memory: Escribir las filas a disco a medida que se
+                completan (memoria acotada en reportes grandes)
+            image_notes: Uno de ``IMAGE_NOTES_MODES``
+            cancel_token: Token para cancelar la escritura de filas
+
+        Raises:
+            ValueError: Modo de notas desconocido
+        """
+        if image_notes not in IMAGE_NOTES_MODES:
+            raise ValueError(f"Modo de notas de imagen desconocido: {image_notes}")
+        self.constant_memory = constant_memory
+        self.image_notes = image_notes
+        self.cancel_token = cancel_token or CancellationToken()
+        self._per_row_comments = True
         self.workbook = None
         self.worksheet = None
+        self.output_path = None
+        self._next_row = 1  # Fila 0 reservada para encabezados
+        self._rows_written = 0
+        self._total_quantity = 0
     
     def create_report(
         self,
@@ -31,6 +94,51 @@ class ExcelGenerator:
         Returns:
             Ruta del archivo generado
         """
+        output_path = self.start_report(
+            output_path, progress_callback, expected_rows=len(inventory_data)
+        )
+
+        if progress_callback:
+            progress_callback("Agregando datos del inventario...")
+
+        # Agregar datos
+        self._add_data(inventory_data, progress_callback)
+
+        if progress_callback:
+            progress_callback("Aplicando formato...")
+
+        # Ajustar formato final
+        self._adjust_formatting()
+
+        if progress_callback:
+            progress_callback("Guardando archivo...")
+
+        # NO cerrar aquí para permitir agregar el resumen después
+        # El workbook se cerrará en add_summary()
+
+        return output_path
+
+    def start_report(
+        self,
+        output_path: Optional[str] = None,
+        progress_callback=None,
+        expected_rows: Optional[int] = None,
+    ) -> str:
+        """
+        Crea el workbook con formatos y encabezados para escribir por partes
+
+        Permite generar el reporte en streaming: después se llama a
+        ``append_rows`` por cada bloque de datos y a ``finish_report``.
+
+        Args:
+            output_path: Ruta donde guardar el archivo (opcional)
+            progress_callback: Función callback para reportar progreso
+            expected_rows: Número de filas previsto, para el modo automático
+                de notas (None = desconocido, se trata como reporte grande)
+
+        Returns:
+            Ruta del archivo que se generará
+        """
         if progress_callback:
             progress_callback("Creando estructura del reporte...")
         
@@ -39,10 +147,20 @@ class ExcelGenerator:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = f"inventario_ghl_{timestamp}.xlsx"
         
-        # Crear workbook
-        self.workbook = xlsxwriter.Workbook(output_path)
+        # Crear workbook (xlsxwriter se importa aquí para no cargarlo al
+        # abrir la aplicación)
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(
+            output_path, {'constant_memory': self.constant_memory}
+        )
         today = datetime.now().strftime("%d-%m-%Y")
         self.worksheet = self.workbook.add_worksheet(f'Inventario_{today}')
+        self.output_path = output_path
+        self._next_row = 1
+        self._rows_written = 0
+        self._total_quantity = 0
+        self._per_row_comments = self._use_per_row_comments(expected_rows)
         
         # Crear formatos
         self._create_formats()
@@ -50,25 +168,42 @@ class ExcelGenerator:
         # Crear encabezados
         self._create_headers()
         
-        if progress_callback:
-            progress_callback("Agregando datos del inventario...")
+        # Instrucciones en la fila 0: deben escribirse antes que los datos
+        # para respetar el orden de filas del modo de memoria constante
+        self._add_instructions()
+
+        return output_path
+
+    def append_rows(self, items: List[Dict], progress_callback=None):
+        """
+        Agrega un bloque de filas a continuación de las ya escritas
         
-        # Agregar datos
-        self._add_data(inventory_data, progress_callback)
+        Args:
+            items: Items formateados (por ejemplo, una página de la API)
+            progress_callback: Función callback para reportar progreso
+        """
+        self._add_data(items, progress_callback)
+
+    def finish_report(self, progress_callback=None) -> str:
+        """
+        Aplica el formato final, agrega el resumen y cierra el archivo
+
+        El resumen se calcula con los totales acumulados por ``append_rows``.
         
+        Args:
+            progress_callback: Función callback para reportar progreso
+
+        Returns:
+            Ruta del archivo generado
+        """
         if progress_callback:
             progress_callback("Aplicando formato...")
-        
-        # Ajustar formato final
         self._adjust_formatting()
         
         if progress_callback:
-            progress_callback("Guardando archivo...")
-        
-        # NO cerrar aquí para permitir agregar el resumen después
-        # El workbook se cerrará en add_summary()
-        
-        return output_path
+            progress_callback("Agregando resumen al reporte...")
+        self.add_summary()
+        return self.output_path
     
     def _create_formats(self):
         """Crea los formatos para el reporte"""
@@ -119,22 +254,34 @@ class ExcelGenerator:
         """Crea los encabezados de la tabla"""
         headers = ['Nombre', 'Nombre de producto', 'Cantidad disponible', 'Imagen']
         
-        # Configurar altura del encabezado (será ajustada por las instrucciones)
-        # self.worksheet.set_row(0, 30)  # Se ajustará en _add_instructions()
+        # La altura del encabezado la fija _add_instructions()
         
         for col, header in enumerate(headers):
             self.worksheet.write(0, col, header, self.header_format)
+
+        if not self._per_row_comments:
+            # Una sola nota para toda la columna de imágenes
+            self.worksheet.write_comment(0, 3, IMAGE_COMMENT_TEXT)
+
+    def _use_per_row_comments(self, expected_rows: Optional[int]) -> bool:
+        """Decide si las instrucciones van en cada celda con imagen"""
+        if self.image_notes == IMAGE_NOTES_AUTO:
+            return expected_rows is not None and expected_rows <= LARGE_REPORT_ROWS
+        return self.image_notes == IMAGE_NOTES_CELL
     
     def _add_data(self, inventory_data: List[Dict], progress_callback=None):
-        """Agrega los datos del inventario a la hoja"""
+        """Agrega los datos del inventario a la hoja a partir de la siguiente fila libre"""
         total_items = len(inventory_data)
+        first_row = self._next_row
         
         for i, item in enumerate(inventory_data):
-            row = i + 1  # Empezar en fila 1 (después del encabezado)
+            row = first_row + i  # Continuar después de las filas ya escritas
             
-            if progress_callback and i % 10 == 0:  # Actualizar cada 10 productos
-                progress = f"Procesando producto {i + 1} de {total_items}"
-                progress_callback(progress)
+            if i % 10 == 0:  # Actualizar cada 10 productos
+                self.cancel_token.raise_if_cancelled()
+                if progress_callback:
+                    progress = f"Procesando producto {i + 1} de {total_items}"
+                    progress_callback(progress, i + 1, total_items)
             
             # Configurar altura de fila a 100px (aproximadamente 75 puntos)
             self.worksheet.set_row(row, 75)
@@ -153,6 +300,8 @@ class ExcelGenerator:
             # Cantidad disponible
             cantidad = item.get('Cantidad disponible', 0)
             self.worksheet.write(row, 2, cantidad, qty_format)
+            if isinstance(cantidad, (int, float)):
+                self._total_quantity += cantidad
             
             # Imagen del producto - solución definitiva: texto + macro VBA
             imagen_url = item.get('Imagen', '')
@@ -162,15 +311,13 @@ class ExcelGenerator:
                 self.worksheet.write_string(row, 3, formula_text, row_format)
                 
                 # Comentario con instrucciones simplificadas
-                comment_text = ('Para activar imágenes:\n'
-                              '1. Seleccionar toda la columna D\n'
-                              '2. Ctrl+L (Buscar y Reemplazar)\n'
-                              '3. Buscar: =IMAGEN   Reemplazar: =IMAGEN\n'
-                              '4. Reemplazar todo\n'
-                              'O individual: F2 → Enter')
-                self.worksheet.write_comment(row, 3, comment_text)
+                if self._per_row_comments:
+                    self.worksheet.write_comment(row, 3, IMAGE_COMMENT_TEXT)
             else:
                 self.worksheet.write(row, 3, 'Sin imagen', row_format)
+
+        self._next_row = first_row + total_items
+        self._rows_written += total_items
     
     def _adjust_formatting(self):
         """Ajusta el formato final de la hoja"""
@@ -182,22 +329,20 @@ class ExcelGenerator:
         
         # Congelar primera fila (encabezados)
         self.worksheet.freeze_panes(1, 0)
-        
-        # Agregar instrucciones en una celda visible
-        self._add_instructions()
     
-    def add_summary(self, inventory_data: List[Dict]):
+    def add_summary(self, inventory_data: Optional[List[Dict]] = None):
         """
         Agrega un resumen al final del reporte
         
         Args:
-            inventory_data: Lista de items del inventario
+            inventory_data: Lista de items del inventario (None = usar los
+                totales acumulados de las filas escritas)
         """
         if not self.worksheet:
             return
         
         # Encontrar la última fila con datos
-        last_row = len(inventory_data) + 1
+        last_row = self._next_row
         summary_row = last_row + 2
         
         # Crear formato para el resumen
@@ -208,12 +353,18 @@ class ExcelGenerator:
         })
         
         # Total de productos
-        total_productos = len(inventory_data)
+        if inventory_data is not None:
+            total_productos = len(inventory_data)
+        else:
+            total_productos = self._rows_written
         self.worksheet.write(summary_row, 0, "Total de productos:", summary_format)
         self.worksheet.write(summary_row, 1, total_productos, summary_format)
         
         # Total de cantidad disponible
-        total_cantidad = sum(item.get('Cantidad disponible', 0) for item in inventory_data)
+        if inventory_data is not None:
+            total_cantidad = sum(item.get('Cantidad disponible', 0) for item in inventory_data)
+        else:
+            total_cantidad = self._total_quantity
         self.worksheet.write(summary_row + 1, 0, "Total cantidad disponible:", summary_format)
         self.worksheet.write(summary_row + 1, 1, total_cantidad, summary_format)
         
@@ -226,6 +377,17 @@ class ExcelGenerator:
         if self.workbook:
             self.workbook.close()
     
+    def discard_report(self):
+        """
+        Descarta un reporte a medias (por ejemplo, al cancelar)
+
+        XlsxWriter solo escribe el archivo al cerrar el workbook, así que
+        basta con soltarlo; los temporales del modo de memoria constante se
+        borran al liberarse.
+        """
+        self.workbook = None
+        self.worksheet = None
+
     def _add_instructions(self):
         """Agrega instrucciones visibles en el archivo"""
         # Crear formato para instrucciones
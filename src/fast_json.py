@@ -0,0 +1,129 @@
+"""
+Decodificación rápida de las respuestas JSON de la API (msgspec u orjson).
+"""
+import json
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import msgspec
+except ImportError:  # Dependencia opcional: uv sync --extra fastjson
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional: uv sync --extra fastjson
+    orjson = None
+
+# Biblioteca usada para decodificar a dict/list (orjson es la más rápida)
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+elif msgspec is not None:
+    JSON_BACKEND = "msgspec"
+else:
+    JSON_BACKEND = "json"
+
+# Indica si las páginas se pueden decodificar a ``Product`` (requiere msgspec)
+COMPACT_AVAILABLE = msgspec is not None
+
+
+def decode_json(content: bytes) -> Union[Dict, List]:
+    """
+    Decodifica un cuerpo JSON a dict/list con la biblioteca más rápida
+
+    Args:
+        content: Cuerpo de la respuesta en bytes (UTF-8)
+
+    Returns:
+        Cuerpo decodificado, igual que ``json.loads``
+
+    Raises:
+        ValueError: El cuerpo no es JSON válido
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    if msgspec is not None:
+        return _generic_decoder.decode(content)
+    return json.loads(content)
+
+
+def decode_product_page(content: bytes) -> Union[Dict, List]:
+    """
+    Decodifica una página de productos con items compactos
+
+    Los items quedan como ``Product`` (solo ``_id`` y los campos del
+    reporte); el resto de los campos de cada producto se descarta al
+    decodificar, sin crear sus objetos. La envoltura conserva la forma de la
+    respuesta (``inventory``/``products``, ``total``, ``meta`` o una lista),
+    así que ``_extract_items`` y ``_extract_total`` funcionan igual.
+
+    Sin msgspec, o si algún item no tiene los tipos esperados, se decodifica
+    a dict/list como ``decode_json``.
+
+    Args:
+        content: Cuerpo de la respuesta en bytes (UTF-8)
+
+    Returns:
+        Cuerpo decodificado con los items como ``Product`` cuando es posible
+
+    Raises:
+        ValueError: El cuerpo no es JSON válido
+    """
+    if msgspec is None:
+        return decode_json(content)
+
+    try:
+        # Basta con el inicio: una lista no esperada falla la validación abajo
+        if content[:16].lstrip()[:1] == b"[":
+            return _list_decoder.decode(content)
+        page = _page_decoder.decode(content)
+    except msgspec.ValidationError:
+        # JSON válido con otra estructura (p. ej. una cantidad como texto)
+        return decode_json(content)
+
+    return {
+        key: value
+        for key, value in (
+            ("inventory", page.inventory),
+            ("products", page.products),
+            ("total", page.total),
+            ("meta", page.meta),
+        )
+        if value is not None
+    }
+
+
+if msgspec is not None:
+
+    class Product(msgspec.Struct, gc=False):
+        """
+        Producto compacto con los campos que usa el reporte
+
+        Ocupa una fracción de la memoria del dict completo de la API y no lo
+        sigue el recolector de ciclos (``gc=False``). ``get()`` acepta las
+        claves de la API para que el código que recibe dicts funcione igual.
+        """
+
+        id: Optional[str] = msgspec.field(default=None, name="_id")
+        name: Optional[str] = ""
+        productName: Optional[str] = ""
+        availableQuantity: Union[int, float, None] = 0
+        image: Optional[str] = ""
+
+        def get(self, key: str, default: Any = None) -> Any:
+            """Valor de un campo por su clave en la API (como ``dict.get``)"""
+            return getattr(self, "id" if key == "_id" else key, default)
+
+    class _ProductPage(msgspec.Struct, gc=False):
+        """Envoltura de una página (endpoints de inventario y de productos)"""
+
+        inventory: Optional[List[Product]] = None
+        products: Optional[List[Product]] = None
+        total: Any = None
+        meta: Any = None
+
+    _generic_decoder = msgspec.json.Decoder()
+    _page_decoder = msgspec.json.Decoder(_ProductPage)
+    _list_decoder = msgspec.json.Decoder(List[Product])
+
+else:
+    Product = None
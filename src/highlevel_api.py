@@ -1,29 +1,203 @@
 """
 Módulo para la conexión con la API de HighLevel.
 """
+import logging
 import os
-from typing import Dict, List
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
-load_dotenv()
+try:
+    from .cancellation import CANCEL_POLL_INTERVAL, CancellationToken
+    from .endpoint_cache import EndpointCache, get_default_cache
+    from .fast_json import decode_json, decode_product_page
+    from .metrics import NULL_METRICS, Metrics
+    from .rate_limit import RetryPolicy, TokenBucket
+except ImportError:
+    from cancellation import CANCEL_POLL_INTERVAL, CancellationToken
+    from endpoint_cache import EndpointCache, get_default_cache
+    from fast_json import decode_json, decode_product_page
+    from metrics import NULL_METRICS, Metrics
+    from rate_limit import RetryPolicy, TokenBucket
 
+logger = logging.getLogger(__name__)
+
+# URL de la API de HighLevel; HIGHLEVEL_BASE_URL permite apuntar a otra
+# (por ejemplo, al servidor simulado de mock_server.py)
+DEFAULT_BASE_URL = "https://services.leadconnectorhq.com"
+
+# Máximo de items por página aceptado por la API
+MAX_PAGE_SIZE = 300
+
+# Endpoints de inventario conocidos, en orden de preferencia
+INVENTORY_ENDPOINTS = (
+    "/products/inventory",
+    "/products",
+    "/locations/{location_id}/products",
+)
+
+# Estilos de parámetros: locationId, o altId/altType por si funciona
+PARAM_STYLES = ("locationId", "altId")
+
+# Conexiones keep-alive por host; cubre la concurrencia máxima de la interfaz
+DEFAULT_POOL_SIZE = 10
+
+# Timeout (segundos) de la prueba de conexión, que no reintenta
+PROBE_TIMEOUT = 5
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Crea una sesión HTTP con pool de conexiones reutilizables
+
+    Args:
+        pool_size: Número máximo de conexiones abiertas por host
+
+    Returns:
+        Sesión configurada con keep-alive y compresión gzip
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+class _PaginationState:
+    """
+    Estado de un recorrido paginado, compartido por los clientes síncrono y
+    asíncrono para que ambos apliquen las mismas reglas de parada
+    """
+
+    def __init__(
+        self,
+        page_size: int,
+        offset: int,
+        max_items: Optional[int],
+        progress_callback: Optional[Callable[[int, Optional[int], int], None]],
+    ):
+        self.page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        self.offset = offset
+        self.end_offset = offset + max_items if max_items is not None else None
+        self.progress_callback = progress_callback
+        self.total: Optional[int] = None
+        self.fetched = 0
+        self.page_number = 0
+        self._previous_first_id = None
+
+    def has_more(self) -> bool:
+        """Indica si quedan items por solicitar dentro del rango pedido"""
+        return self.end_offset is None or self.offset < self.end_offset
+
+    def next_limit(self) -> int:
+        """Límite de la siguiente página respetando ``max_items``"""
+        if self.end_offset is None:
+            return self.page_size
+        return min(self.page_size, self.end_offset - self.offset)
+
+    def accept(self, items: List[Dict], total: Optional[int]) -> bool:
+        """
+        Registra una página del recorrido secuencial
+
+        Returns:
+            False si la página está vacía o repite la anterior (fin del recorrido)
+        """
+        if not items:
+            return False
+
+        # Protección ante endpoints que ignoran el offset y repiten la página
+        first = items[0]
+        first_id = first.get('_id') if hasattr(first, 'get') else None
+        if first_id is not None and first_id == self._previous_first_id:
+            logger.warning(
+                "El endpoint repitió la página en offset %d, deteniendo", self.offset
+            )
+            return False
+        self._previous_first_id = first_id
+
+        if total is not None:
+            self.total = total
+        self.offset += len(items)
+        self.record(items)
+        return True
+
+    def record(self, items: List[Dict]):
+        """Contabiliza una página entregada y notifica el progreso"""
+        self.page_number += 1
+        self.fetched += len(items)
+        if self.progress_callback:
+            self.progress_callback(self.fetched, self.total, self.page_number)
+
+    def is_last_page(self, items: List[Dict], limit: int) -> bool:
+        """
+        Indica si la página recibida cierra el recorrido
+
+        Con el total conocido, una página corta antes del final significa que
+        la API recortó el límite; se adopta ese tamaño para el resto.
+        """
+        if self.total is None:
+            return len(items) < limit
+        if self.offset >= self.total:
+            return True
+        if len(items) < limit:
+            self.page_size = len(items)
+        return False
+
+    def parallel_stop(self) -> int:
+        """Offset final (exclusivo) para solicitar el resto en paralelo"""
+        if self.end_offset is None:
+            return self.total
+        return min(self.total, self.end_offset)
 
-class HighLevelAPI:
-    """Cliente para la API de HighLevel."""
 
-    def __init__(self):
-        self.access_token = os.getenv("HIGHLEVEL_ACCESS_TOKEN")
-        self.location_id = os.getenv("HIGHLEVEL_LOCATION_ID")
+class BaseHighLevelAPI:
+    """
+    Lógica común de los clientes de HighLevel, independiente del transporte
+
+    Contiene la configuración, la selección de endpoint (con caché), la
+    interpretación de respuestas y el formateo de datos. Las subclases solo
+    implementan el envío de peticiones.
+    """
+
+    def __init__(
+        self,
+        endpoint_cache: Optional[EndpointCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        access_token: Optional[str] = None,
+        location_id: Optional[str] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.access_token = access_token or os.getenv("HIGHLEVEL_ACCESS_TOKEN")
+        self.location_id = location_id or os.getenv("HIGHLEVEL_LOCATION_ID")
         self.api_version = os.getenv("HIGHLEVEL_API_VERSION", "2021-07-28")
-        self.base_url = "https://services.leadconnectorhq.com"
+        self.base_url = (
+            base_url or os.getenv("HIGHLEVEL_BASE_URL") or DEFAULT_BASE_URL
+        ).rstrip("/")
 
         if not self.access_token:
             raise ValueError("HIGHLEVEL_ACCESS_TOKEN no está configurado")
 
         if not self.location_id:
             raise ValueError("HIGHLEVEL_LOCATION_ID no está configurado")
+
+        self.endpoint_cache = endpoint_cache or get_default_cache()
+
+        # El limitador es compartido por todas las peticiones concurrentes
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter or TokenBucket()
+
+        # Desactivadas por defecto: NULL_METRICS no registra nada
+        self.metrics = metrics or NULL_METRICS
     
     def _get_headers(self) -> Dict[str, str]:
         """Obtiene los headers para las peticiones"""
@@ -33,13 +207,375 @@ class HighLevelAPI:
             'Version': self.api_version
         }
     
-    def get_inventory(self, limit: int = 300, offset: int = 0) -> List[Dict]:
+    def _endpoint_candidates(self) -> Tuple[Optional[Tuple[str, str]], List[Tuple[str, str]]]:
+        """
+        Obtiene las combinaciones endpoint/parámetros a probar
+
+        Returns:
+            Tupla (combinación memorizada o None, candidatos en orden de prueba)
+        """
+        cached = self.endpoint_cache.get(self._endpoint_cache_key())
+
+        candidates = [
+            (endpoint, param_style)
+            for endpoint in INVENTORY_ENDPOINTS
+            for param_style in PARAM_STYLES
+        ]
+        if cached in candidates:
+            candidates.remove(cached)
+            candidates.insert(0, cached)
+        return cached, candidates
+
+    def _build_url(self, endpoint: str) -> str:
+        """Construye la URL completa de un endpoint"""
+        return self.base_url + endpoint.format(location_id=self.location_id)
+
+    def _handle_response(
+        self,
+        response,
+        url: str,
+        candidate: Tuple[str, str],
+        cached: Optional[Tuple[str, str]],
+        compact: bool = False,
+        retries: Optional[int] = None,
+    ) -> Tuple[bool, Union[Dict, List, None]]:
+        """
+        Interpreta la respuesta de un candidato y actualiza la caché
+
+        Args:
+            response: Respuesta HTTP (requests o httpx)
+            url: URL solicitada
+            candidate: Combinación endpoint/parámetros usada
+            cached: Combinación memorizada antes de la petición
+            compact: Decodificar los items como ``Product`` (ver ``fast_json``)
+            retries: Reintentos hechos antes de esta respuesta, para el
+                mensaje de error (None = todos los de la política)
+
+        Returns:
+            Tupla (éxito, cuerpo decodificado); si no hubo éxito se debe
+            probar el siguiente candidato. Un 304 es éxito sin cuerpo
+
+        Raises:
+            requests.HTTPError: Límite de peticiones excedido o error del
+                servidor tras los reintentos
+        """
+        if response.status_code == 200:
+            with self.metrics.span("decode"):
+                try:
+                    if compact:
+                        data = decode_product_page(response.content)
+                    else:
+                        data = decode_json(response.content)
+                except ValueError:
+                    # Cuerpo inválido o no UTF-8: la respuesta detecta la
+                    # codificación y da el error habitual
+                    data = response.json()
+            logger.debug("HTTP 200 en %s", url)
+            if candidate != cached:
+                self.endpoint_cache.set(self._endpoint_cache_key(), *candidate)
+            return True, data
+
+        if response.status_code == 304:
+            # Petición condicional: la página no cambió desde el ETag enviado
+            logger.debug("HTTP 304 (sin cambios) en %s", url)
+            return True, None
+
+        # El fragmento del cuerpo solo se extrae si el mensaje se va a registrar
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "HTTP %d en %s: %s", response.status_code, url, response.text[:200]
+            )
+
+        if retries is None:
+            retries = self.retry_policy.max_retries
+        after_retries = f" tras {retries} reintentos" if retries else ""
+        if response.status_code == 429:
+            # Otro endpoint no evitaría el límite de la misma cuenta
+            raise requests.HTTPError(
+                f"Límite de peticiones excedido{after_retries}", response=response
+            )
+        if response.status_code in self.retry_policy.retry_statuses:
+            # Error del servidor: no depende del endpoint
+            raise requests.HTTPError(
+                f"HTTP {response.status_code} en {url}{after_retries}",
+                response=response,
+            )
+        if candidate == cached and response.status_code in (401, 404):
+            self.endpoint_cache.invalidate(self._endpoint_cache_key())
+        return False, None
+
+    def _build_params(self, param_style: str, limit: int, offset: int) -> Dict:
+        """Construye los parámetros de consulta según el estilo indicado"""
+        params = {
+            'limit': min(limit, MAX_PAGE_SIZE),
+            'offset': offset,
+        }
+        if param_style == 'altId':
+            params['altId'] = self.location_id
+            params['altType'] = 'location'
+        else:
+            params['locationId'] = self.location_id
+        return params
+
+    def _endpoint_cache_key(self) -> str:
+        """Clave de la caché de endpoints para esta location"""
+        return f"{self.base_url}|{self.location_id}"
+
+    @staticmethod
+    def _extract_items(data: Union[Dict, List]) -> List[Dict]:
+        """Extrae la lista de items de los diferentes formatos de respuesta"""
+        if isinstance(data, list):
+            return data
+        if 'inventory' in data:
+            return data['inventory']
+        if 'products' in data:
+            return data['products']
+        logger.warning(
+            "Respuesta sin lista de items; estructura: %s",
+            list(data.keys()) if isinstance(data, dict) else type(data),
+        )
+        return []
+
+    @staticmethod
+    def _extract_total(data: Union[Dict, List]) -> Optional[int]:
+        """
+        Extrae el total de items reportado por la API, si existe
+
+        El endpoint de inventario devuelve ``total`` como ``[{"total": N}]``,
+        mientras que otros endpoints usan un entero o ``meta.total``.
+        """
+        if not isinstance(data, dict):
+            return None
+        total = data.get('total')
+        if total is None and isinstance(data.get('meta'), dict):
+            total = data['meta'].get('total')
+        if isinstance(total, list):
+            total = total[0].get('total') if total and isinstance(total[0], dict) else None
+        if isinstance(total, dict):
+            total = total.get('total')
+        try:
+            return int(total) if total is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def format_inventory_data(self, inventory_items: List[Dict]) -> List[Dict]:
+        """
+        Formatea los datos del inventario para el reporte
+
+        Args:
+            inventory_items: Lista de items del inventario de la API (dicts o
+                ``Product`` si se pidieron compactos)
+
+        Returns:
+            Lista de items formateados para el reporte
+        """
+        formatted_items = []
+
+        with self.metrics.span("format", items=len(inventory_items)):
+            if inventory_items and not isinstance(inventory_items[0], dict):
+                # Items compactos: acceso directo a los atributos
+                for item in inventory_items:
+                    formatted_items.append({
+                        'Nombre': item.name,
+                        'Nombre de producto': item.productName,
+                        'Cantidad disponible': item.availableQuantity,
+                        'Imagen': item.image
+                    })
+            else:
+                for item in inventory_items:
+                    formatted_item = {
+                        'Nombre': item.get('name', ''),
+                        'Nombre de producto': item.get('productName', ''),
+                        'Cantidad disponible': item.get('availableQuantity', 0),
+                        'Imagen': item.get('image', '')
+                    }
+                    formatted_items.append(formatted_item)
+
+        return formatted_items
+
+    def _record_request(
+        self,
+        url: str,
+        started: float,
+        attempt: int,
+        response=None,
+        error: Optional[Exception] = None,
+    ):
+        """
+        Registra un intento de petición en las métricas, si están activas
+
+        Args:
+            url: URL solicitada
+            started: Valor de ``time.perf_counter()`` al enviar
+            attempt: Número de reintento (0 = primer intento)
+            response: Respuesta HTTP (requests o httpx), si la hubo
+            error: Error de conexión, si no hubo respuesta
+        """
+        if not self.metrics.enabled:
+            return
+        latency = time.perf_counter() - started
+        endpoint = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        if response is None:
+            self.metrics.record_request(
+                endpoint, None, latency, attempt=attempt, error=str(error)
+            )
+            return
+        # requests: tiempo hasta los headers; httpx: hasta el cuerpo completo
+        self.metrics.record_request(
+            endpoint,
+            response.status_code,
+            latency,
+            headers_time=response.elapsed.total_seconds(),
+            size=len(response.content),
+            attempt=attempt,
+        )
+
+    def _probe_targets(
+        self,
+    ) -> Tuple[Optional[Tuple[str, str]], List[Tuple[str, Dict, Tuple[str, str]]]]:
+        """
+        Peticiones de la prueba de conexión: un solo item por combinación
+        endpoint/parámetros, empezando por la memorizada
+
+        Returns:
+            Tupla (combinación memorizada o None, lista de
+            (url, parámetros, combinación) en orden de prueba)
+        """
+        cached, candidates = self._endpoint_candidates()
+        targets = [
+            (
+                self._build_url(endpoint),
+                self._build_params(param_style, 1, 0),
+                (endpoint, param_style),
+            )
+            for endpoint, param_style in candidates
+        ]
+        return cached, targets
+
+    def _probe_continues(self, result: Dict[str, any], response) -> bool:
+        """
+        Indica si la prueba debe seguir con la siguiente combinación
+
+        Un error de la combinación (404, 401...) lleva a la siguiente; un
+        éxito, un 429 o un error del servidor terminan la prueba.
+        """
+        return (
+            not result['success']
+            and response.status_code not in self.retry_policy.retry_statuses
+        )
+
+    def _probe_result(
+        self,
+        response,
+        url: str,
+        candidate: Tuple[str, str],
+        cached: Optional[Tuple[str, str]],
+        latency: float,
+    ) -> Dict[str, any]:
+        """
+        Construye el resultado de la prueba de conexión a partir de la respuesta
+
+        Args:
+            response: Respuesta HTTP (requests o httpx)
+            url: URL solicitada
+            candidate: Combinación endpoint/parámetros usada
+            cached: Combinación memorizada antes de la petición
+            latency: Segundos de la petición completa (incluye el cuerpo)
+
+        Returns:
+            Resultado de ``_connection_result`` más endpoint, status_code,
+            latency_ms y headers_ms (hasta recibir los headers)
+        """
+        details = {
+            'endpoint': url,
+            'status_code': response.status_code,
+            'latency_ms': round(latency * 1000, 1),
+            'headers_ms': round(response.elapsed.total_seconds() * 1000, 1),
+        }
+        try:
+            # La prueba de conexión no reintenta
+            success, data = self._handle_response(
+                response, url, candidate, cached, retries=0
+            )
+        except (requests.HTTPError, ValueError) as e:
+            return {**self._connection_result(error=e), **details}
+        if not success:
+            error = requests.HTTPError(f"HTTP {response.status_code} en {url}")
+            return {**self._connection_result(error=error), **details}
+        return {**self._connection_result(self._extract_items(data)), **details}
+
+    @staticmethod
+    def _connection_result(
+        inventory: Optional[List[Dict]] = None, error: Optional[Exception] = None
+    ) -> Dict[str, any]:
+        """Construye el resultado de una prueba de conexión"""
+        if error is not None:
+            return {
+                'success': False,
+                'message': f'Error de conexión: {str(error)}'
+            }
+        return {
+            'success': True,
+            'message': 'Conexión exitosa',
+            'items_count': len(inventory)
+        }
+
+
+class HighLevelAPI(BaseHighLevelAPI):
+    """Cliente para la API de HighLevel."""
+
+    def __init__(
+        self,
+        endpoint_cache: Optional[EndpointCache] = None,
+        session: Optional[requests.Session] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        access_token: Optional[str] = None,
+        location_id: Optional[str] = None,
+        base_url: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        super().__init__(
+            endpoint_cache=endpoint_cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            access_token=access_token,
+            location_id=location_id,
+            base_url=base_url,
+            metrics=metrics,
+        )
+
+        # Sesión compartida: los headers se construyen una sola vez
+        self.session = session or create_session(pool_size)
+        self.session.headers.update(self._get_headers())
+
+    def close(self):
+        """Cierra las conexiones abiertas de la sesión"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_inventory(
+        self,
+        limit: int = 300,
+        offset: int = 0,
+        cancel_token: Optional[CancellationToken] = None,
+        compact: bool = False,
+    ) -> List[Dict]:
         """
         Obtiene el inventario de HighLevel
         
         Args:
             limit: Límite de resultados (máximo 300)
             offset: Offset para paginación
+            cancel_token: Token para cancelar la operación
+            compact: Devolver los items como ``Product`` (solo los campos del
+                reporte) si msgspec está instalado
             
         Returns:
             Lista de items del inventario
@@ -47,106 +583,388 @@ class HighLevelAPI:
         Raises:
             requests.RequestException: Error en la petición HTTP
             ValueError: Error en la respuesta de la API
+            OperationCancelled: Se canceló la operación
         """
-        # Probar diferentes endpoints posibles
-        endpoints = [
-            f"{self.base_url}/products/inventory",
-            f"{self.base_url}/products",
-            f"{self.base_url}/locations/{self.location_id}/products"
-        ]
-        
-        params = {
-            'limit': min(limit, 300),
-            'offset': offset,
-            'locationId': self.location_id  # Cambiar a locationId en lugar de altId/altType
-        }
-        
-        # También probar con altId/altType por si funciona
-        alt_params = {
-            'limit': min(limit, 300),
+        data = self._request_page(limit, offset, cancel_token, compact)
+        return self._extract_items(data)
+
+    def iter_inventory(
+        self,
+        page_size: int = MAX_PAGE_SIZE,
+        offset: int = 0,
+        max_items: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, Optional[int], int], None]] = None,
+        concurrency: int = 1,
+        cancel_token: Optional[CancellationToken] = None,
+        compact: bool = False,
+    ) -> Iterator[List[Dict]]:
+        """
+        Recorre el inventario completo página por página
+
+        Solo se mantienen en memoria las páginas en vuelo, por lo que el
+        consumidor decide qué conservar (por ejemplo, solo los datos ya
+        formateados).
+
+        Con ``concurrency > 1`` la primera página se usa para conocer el total
+        y el resto se solicita en paralelo con un pool acotado de hilos; las
+        páginas se entregan siempre en orden de offset.
+
+        Con ``compact`` los items se decodifican directamente como ``Product``
+        (``_id`` y los campos del reporte), lo que reduce el tiempo de
+        decodificación y la memoria por item. Solo sirve si no se necesita el
+        item crudo completo (por ejemplo, para guardarlo en un snapshot).
+
+        Args:
+            page_size: Tamaño de cada página (máximo 300)
+            offset: Offset inicial
+            max_items: Número máximo de items a obtener (None = todo el catálogo)
+            progress_callback: Función llamada tras cada página con
+                (items_obtenidos, total_reportado_o_None, numero_de_pagina)
+            concurrency: Número de peticiones simultáneas
+            cancel_token: Token para cancelar el recorrido entre páginas
+            compact: Devolver los items como ``Product`` si msgspec está
+                instalado (sin él, dicts como siempre)
+
+        Yields:
+            Lista de items de cada página
+
+        Raises:
+            requests.RequestException: Error en la petición HTTP
+            OperationCancelled: Se canceló la operación
+        """
+        cancel_token = cancel_token or CancellationToken()
+        state = _PaginationState(page_size, offset, max_items, progress_callback)
+
+        while state.has_more():
+            cancel_token.raise_if_cancelled()
+            limit = state.next_limit()
+            data = self._request_page(limit, state.offset, cancel_token, compact)
+            items = self._extract_items(data)
+
+            if not state.accept(items, self._extract_total(data)):
+                return
+
+            yield items
+
+            if state.is_last_page(items, limit):
+                return
+
+            if concurrency > 1 and state.total is not None:
+                # Con el total conocido las páginas restantes son independientes
+                for items in self._iter_pages_parallel(
+                    state.offset,
+                    state.parallel_stop(),
+                    state.page_size,
+                    concurrency,
+                    cancel_token=cancel_token,
+                    compact=compact,
+                ):
+                    state.record(items)
+                    yield items
+                return
+
+    def _iter_pages_parallel(
+        self,
+        start: int,
+        stop: int,
+        page_size: int,
+        concurrency: int,
+        fetch: Optional[Callable[[int, int], any]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        compact: bool = False,
+    ) -> Iterator[List[Dict]]:
+        """
+        Solicita las páginas entre ``start`` y ``stop`` en paralelo
+
+        Se mantiene una ventana de como máximo ``2 * concurrency`` páginas en
+        vuelo para acotar la memoria mientras el consumidor procesa.
+
+        Args:
+            start: Offset de la primera página
+            stop: Offset final (exclusivo)
+            page_size: Tamaño de cada página
+            concurrency: Número de hilos del pool
+            fetch: Función (limit, offset) que obtiene cada página
+                (por defecto ``get_inventory``)
+            cancel_token: Token para cancelar; se consulta mientras se
+                espera cada página
+            compact: Items como ``Product`` (solo con el ``fetch`` por defecto)
+
+        Yields:
+            Resultado de cada página, en orden de offset
+
+        Raises:
+            OperationCancelled: Se canceló la operación
+        """
+        cancel_token = cancel_token or CancellationToken()
+        if fetch is None:
+
+            def fetch(limit: int, offset: int) -> List[Dict]:
+                return self.get_inventory(limit, offset, cancel_token, compact)
+
+        offsets = iter(range(start, stop, page_size))
+        executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="ghl-page"
+        )
+        pending = deque()
+
+        def submit_next() -> bool:
+            page_offset = next(offsets, None)
+            if page_offset is None:
+                return False
+            limit = min(page_size, stop - page_offset)
+            pending.append(executor.submit(fetch, limit, page_offset))
+            return True
+
+        try:
+            for _ in range(concurrency * 2):
+                if not submit_next():
+                    break
+
+            while pending:
+                future = pending.popleft()
+                while not wait([future], timeout=CANCEL_POLL_INTERVAL).done:
+                    cancel_token.raise_if_cancelled()
+                items = future.result()
+                submit_next()
+                if items:
+                    yield items
+        finally:
+            # Si el consumidor se detiene, no esperar páginas que ya no se usarán;
+            # al cancelar, las peticiones en vuelo terminan en segundo plano
+            executor.shutdown(wait=not cancel_token.cancelled, cancel_futures=True)
+
+    def fetch_page(
+        self,
+        limit: int,
+        offset: int,
+        etag: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Dict[str, any]:
+        """
+        Obtiene una página con sus metadatos, opcionalmente condicional
+
+        Si se indica ``etag`` se envía ``If-None-Match``; cuando la API lo
+        soporta y la página no cambió responde 304 sin cuerpo.
+
+        Args:
+            limit: Límite de resultados (máximo 300)
+            offset: Offset para paginación
+            etag: ETag recibido previamente para esta página
+            cancel_token: Token para cancelar la operación
+
+        Returns:
+            Diccionario con offset, limit, items (None si no cambió), total,
+            etag y not_modified
+
+        Raises:
+            requests.RequestException: Error en la petición HTTP
+            OperationCancelled: Se canceló la operación
+        """
+        headers = {'If-None-Match': etag} if etag else None
+        data, response = self._request_page_response(
+            limit, offset, headers, cancel_token
+        )
+
+        if response.status_code == 304:
+            return {
+                'offset': offset,
+                'limit': limit,
+                'items': None,
+                'total': None,
+                'etag': etag,
+                'not_modified': True,
+            }
+        return {
             'offset': offset,
-            'altId': self.location_id,
-            'altType': 'location'
+            'limit': limit,
+            'items': self._extract_items(data),
+            'total': self._extract_total(data),
+            'etag': response.headers.get('ETag'),
+            'not_modified': False,
         }
+
+    def _request_page(
+        self,
+        limit: int,
+        offset: int,
+        cancel_token: Optional[CancellationToken] = None,
+        compact: bool = False,
+    ) -> Union[Dict, List]:
+        """
+        Solicita una página de inventario probando los endpoints conocidos
+
+        Se intenta primero la combinación endpoint/parámetros memorizada para
+        esta location; si responde 401/404 se invalida y se vuelve a probar
+        el resto de combinaciones.
+
+        Args:
+            limit: Límite de resultados (máximo 300)
+            offset: Offset para paginación
+            cancel_token: Token para cancelar la operación
+            compact: Decodificar los items como ``Product``
+
+        Returns:
+            Cuerpo de la respuesta decodificado
+
+        Raises:
+            requests.RequestException: Ningún endpoint respondió correctamente
+            OperationCancelled: Se canceló la operación
+        """
+        data, _ = self._request_page_response(
+            limit, offset, cancel_token=cancel_token, compact=compact
+        )
+        return data
+
+    def _request_page_response(
+        self,
+        limit: int,
+        offset: int,
+        headers: Optional[Dict[str, str]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        compact: bool = False,
+    ) -> Tuple[Union[Dict, List, None], requests.Response]:
+        """
+        Igual que ``_request_page`` pero devuelve también la respuesta HTTP
+
+        Args:
+            limit: Límite de resultados (máximo 300)
+            offset: Offset para paginación
+            headers: Headers adicionales para esta petición
+            cancel_token: Token para cancelar la operación
+            compact: Decodificar los items como ``Product``
+
+        Returns:
+            Tupla (cuerpo decodificado o None si fue 304, respuesta)
+
+        Raises:
+            requests.RequestException: Ningún endpoint respondió correctamente
+            requests.ConnectionError: Sin conexión tras agotar los reintentos
+                (no se prueban los demás endpoints)
+            OperationCancelled: Se canceló la operación
+        """
+        cached, candidates = self._endpoint_candidates()
         
-        for endpoint in endpoints:
-            for param_set in [params, alt_params]:
+        with self.metrics.span("fetch", offset=offset, limit=limit):
+            for endpoint, param_style in candidates:
+                url = self._build_url(endpoint)
+                param_set = self._build_params(param_style, limit, offset)
                 try:
-                    print(f"🔍 Probando: {endpoint} con params: {param_set}")
-                    
-                    response = requests.get(
-                        endpoint,
-                        headers=self._get_headers(),
-                        params=param_set,
-                        timeout=30
+                    logger.debug("GET %s %s", url, param_set)
+
+                    response = self._send(url, param_set, headers, cancel_token)
+
+                    success, data = self._handle_response(
+                        response, url, (endpoint, param_style), cached, compact
                     )
-                    
-                    print(f"📊 Status: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        print(f"✅ Éxito con {endpoint}")
-                        
-                        # Diferentes formatos de respuesta posibles
-                        if 'inventory' in data:
-                            return data['inventory']
-                        elif 'products' in data:
-                            return data['products']
-                        elif isinstance(data, list):
-                            return data
-                        else:
-                            print(f"🔍 Estructura de respuesta: {list(data.keys()) if isinstance(data, dict) else type(data)}")
-                            return []
-                    else:
-                        print(f"❌ Error {response.status_code}: {response.text[:200]}")
-                        
+                    if success:
+                        return data, response
+
+                except (requests.HTTPError, requests.ConnectionError, requests.Timeout):
+                    # Los reintentos ya se agotaron en _send; un fallo de
+                    # transporte no dice nada sobre qué endpoint es el correcto
+                    raise
                 except requests.RequestException as e:
-                    print(f"❌ Error en {endpoint}: {e}")
+                    logger.info("Error en %s: %s", url, e)
                     continue
         
         # Si llegamos aquí, ningún endpoint funcionó
         raise requests.RequestException(f"No se pudo conectar a ningún endpoint de inventario. Verifica tu token y location ID.")
     
-    def format_inventory_data(self, inventory_items: List[Dict]) -> List[Dict]:
+    def _send(
+        self,
+        url: str,
+        params: Dict,
+        headers: Optional[Dict[str, str]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> requests.Response:
         """
-        Formatea los datos del inventario para el reporte
-        
+        Envía una petición GET respetando el límite de ritmo y reintentando
+
+        Reintenta errores de conexión y respuestas 429/5xx con backoff
+        exponencial; un 429 pausa el limitador compartido para que las demás
+        peticiones concurrentes también esperen.
+
         Args:
-            inventory_items: Lista de items del inventario de la API
-            
+            url: URL completa del endpoint
+            params: Parámetros de consulta
+            headers: Headers adicionales para esta petición
+            cancel_token: Token para cancelar; interrumpe las esperas del
+                limitador y de los reintentos
+
         Returns:
-            Lista de items formateados para el reporte
+            Última respuesta recibida
+
+        Raises:
+            requests.RequestException: Error de conexión tras agotar reintentos
+            OperationCancelled: Se canceló la operación
         """
-        formatted_items = []
-        
-        for item in inventory_items:
-            formatted_item = {
-                'Nombre': item.get('name', ''),
-                'Nombre de producto': item.get('productName', ''),
-                'Cantidad disponible': item.get('availableQuantity', 0),
-                'Imagen': item.get('image', '')
-            }
-            formatted_items.append(formatted_item)
-        
-        return formatted_items
-    
-    def test_connection(self) -> Dict[str, any]:
+        cancel_token = cancel_token or CancellationToken()
+        attempt = 0
+        while True:
+            cancel_token.raise_if_cancelled()
+            self.rate_limiter.acquire(sleep=cancel_token.sleep)
+            started = time.perf_counter()
+            try:
+                response = self.session.get(
+                    url, params=params, headers=headers, timeout=30
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record_request(url, started, attempt, error=e)
+                if attempt >= self.retry_policy.max_retries:
+                    raise
+                delay = self.retry_policy.compute_delay(attempt)
+                logger.warning(
+                    "Reintentando en %.1fs tras error de conexión: %s", delay, e
+                )
+                cancel_token.sleep(delay)
+                attempt += 1
+                continue
+
+            self._record_request(url, started, attempt, response)
+            self.rate_limiter.update_from_headers(response.headers)
+
+            if not self.retry_policy.should_retry(response.status_code, attempt):
+                return response
+
+            delay = self.retry_policy.compute_delay(attempt, response.headers)
+            logger.warning(
+                "HTTP %d, reintentando en %.1fs", response.status_code, delay
+            )
+            if response.status_code == 429:
+                self.rate_limiter.pause(delay)
+            else:
+                cancel_token.sleep(delay)
+            attempt += 1
+
+    def test_connection(self, timeout: float = PROBE_TIMEOUT) -> Dict[str, any]:
         """
-        Prueba la conexión con la API
+        Prueba la conexión con la API mediante peticiones livianas
+
+        Se pide un item al endpoint memorizado; si no hay uno (o falla) se
+        prueban los demás en orden hasta el primero que responda, que queda
+        memorizado. Cada petición usa un timeout corto y no se reintenta, y
+        un error de conexión termina la prueba de inmediato, de modo que
+        termina en segundos aunque la API no responda.
+
+        Args:
+            timeout: Segundos máximos de espera de la petición
         
         Returns:
-            Diccionario con el resultado de la prueba
+            Diccionario con success y message; si hubo respuesta también
+            items_count, endpoint, status_code, latency_ms y headers_ms
         """
-        try:
-            # Hacemos una petición pequeña para probar la conexión
-            inventory = self.get_inventory(limit=1)
-            return {
-                'success': True,
-                'message': 'Conexión exitosa',
-                'items_count': len(inventory)
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'message': f'Error de conexión: {str(e)}'
-            }
\ No newline at end of file
+        cached, targets = self._probe_targets()
+        for url, params, candidate in targets:
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+            except requests.RequestException as e:
+                # Todos los endpoints están en el mismo host
+                return self._connection_result(error=e)
+            latency = time.perf_counter() - started
+            self.rate_limiter.update_from_headers(response.headers)
+            result = self._probe_result(response, url, candidate, cached, latency)
+            if not self._probe_continues(result, response):
+                break
+        return result
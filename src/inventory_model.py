@@ -0,0 +1,178 @@
+"""
+Modelo de tabla (Qt) para mostrar el inventario formateado.
+"""
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+try:
+    from .csv_exporter import REPORT_COLUMNS
+except ImportError:
+    from csv_exporter import REPORT_COLUMNS
+
+QUANTITY_COLUMN = REPORT_COLUMNS.index("Cantidad disponible")
+IMAGE_COLUMN = REPORT_COLUMNS.index("Imagen")
+
+
+class InventoryTableModel(QAbstractTableModel):
+    """
+    Modelo de solo lectura sobre la lista de items formateados
+
+    La vista solo pide los datos de las filas visibles, así que el costo de
+    pintar no depende del tamaño del catálogo. El orden y el filtro se
+    resuelven aquí sobre una lista de índices, con claves calculadas una sola
+    vez por columna: un ``QSortFilterProxyModel`` llamaría a ``data()`` desde
+    C++ por cada fila y por cada comparación, lo que con 100 000 filas
+    congela la interfaz varios segundos.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: List[Dict] = []
+        self._rows: List[int] = []
+        self._sort_keys: Dict[int, list] = {}
+        self._search_keys: Optional[List[str]] = None
+        self._sort_column: Optional[int] = None
+        self._sort_order = Qt.AscendingOrder
+        self._filter_text = ""
+
+    def set_items(self, items: List[Dict]):
+        """
+        Reemplaza los datos mostrados (la lista no se copia)
+
+        Args:
+            items: Items formateados con las columnas del reporte
+        """
+        self.beginResetModel()
+        self._items = items
+        self._sort_keys = {}
+        self._search_keys = None
+        self._rows = self._compute_rows()
+        self.endResetModel()
+
+    def total_count(self) -> int:
+        """Número total de items, sin aplicar el filtro"""
+        return len(self._items)
+
+    def item_at(self, row: int) -> Dict:
+        """Item mostrado en una fila de la vista"""
+        return self._items[self._rows[row]]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(REPORT_COLUMNS)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        column = index.column()
+        if role == Qt.DisplayRole:
+            value = self._items[self._rows[index.row()]].get(REPORT_COLUMNS[column])
+            return "" if value is None else str(value)
+        if role == Qt.TextAlignmentRole and column == QUANTITY_COLUMN:
+            return int(Qt.AlignCenter)
+        if role == Qt.ToolTipRole and column == IMAGE_COLUMN:
+            return self._items[self._rows[index.row()]].get(REPORT_COLUMNS[column])
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return REPORT_COLUMNS[section]
+        return str(section + 1)
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """Ordena por una columna (llamado por la vista al pulsar el encabezado)"""
+        self._sort_column = column
+        self._sort_order = order
+        self._update_rows()
+
+    def set_filter_text(self, text: str):
+        """
+        Muestra solo las filas que contienen el texto en alguna columna
+
+        Args:
+            text: Texto a buscar (sin distinguir mayúsculas)
+        """
+        text = text.strip().lower()
+        if text == self._filter_text:
+            return
+        self._filter_text = text
+        self._update_rows()
+
+    def _update_rows(self):
+        """
+        Recalcula las filas visibles conservando la selección
+
+        La selección y el índice actual son índices persistentes: se mueven a
+        la fila donde quedó el mismo item, o se invalidan si el filtro lo
+        oculta. Un reset del modelo los perdería todos.
+        """
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_items = [self._rows[index.row()] for index in old_indexes]
+        self._rows = self._compute_rows()
+        if old_indexes:
+            new_rows = {item: row for row, item in enumerate(self._rows)}
+            self.changePersistentIndexList(
+                old_indexes,
+                [
+                    (
+                        self.index(new_rows[item], index.column())
+                        if item in new_rows
+                        else QModelIndex()
+                    )
+                    for item, index in zip(old_items, old_indexes)
+                ],
+            )
+        self.layoutChanged.emit()
+
+    def _compute_rows(self) -> List[int]:
+        """Índices de los items visibles, en el orden actual"""
+        if self._sort_column is None:
+            rows = range(len(self._items))
+        else:
+            keys = self._column_sort_keys(self._sort_column)
+            rows = sorted(
+                range(len(self._items)),
+                key=keys.__getitem__,
+                reverse=self._sort_order == Qt.DescendingOrder,
+            )
+
+        if not self._filter_text:
+            return list(rows)
+
+        if self._search_keys is None:
+            self._search_keys = [
+                "\t".join(str(item.get(column) or "") for column in REPORT_COLUMNS).lower()
+                for item in self._items
+            ]
+        search_keys = self._search_keys
+        text = self._filter_text
+        return [row for row in rows if text in search_keys[row]]
+
+    def _column_sort_keys(self, column: int) -> list:
+        """Claves de orden de una columna, calculadas una vez por conjunto de datos"""
+        keys = self._sort_keys.get(column)
+        if keys is None:
+            name = REPORT_COLUMNS[column]
+            if column == QUANTITY_COLUMN:
+                keys = [_quantity_key(item.get(name)) for item in self._items]
+            else:
+                keys = [str(item.get(name) or "").lower() for item in self._items]
+            self._sort_keys[column] = keys
+        return keys
+
+
+def _quantity_key(value) -> float:
+    """Clave numérica para ordenar cantidades (no numéricas al final)"""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("inf")
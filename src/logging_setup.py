@@ -0,0 +1,103 @@
+"""
+Configuración del registro de diagnósticos (archivo rotativo y modo depuración).
+"""
+import logging
+import os
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Optional, TextIO
+
+try:
+    from .app_paths import get_app_data_dir
+except ImportError:
+    from app_paths import get_app_data_dir
+
+# Variable de entorno que activa el modo depuración (1/true/yes)
+DEBUG_ENV = "INVENTARIO_GHL_DEBUG"
+
+LOG_FILENAME = "inventario_ghl.log"
+
+# Tamaño máximo de cada archivo y número de archivos anteriores conservados
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUP_COUNT = 3
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Nivel fuera del modo depuración: solo avisos y errores
+DEFAULT_LEVEL = logging.WARNING
+
+
+def configure_logging(
+    debug: Optional[bool] = None,
+    stream: Optional[TextIO] = None,
+    log_file: Optional[Path] = None,
+) -> Optional[Path]:
+    """
+    Configura el registro de diagnósticos de la aplicación
+
+    Los módulos registran con ``logging.getLogger(__name__)`` y formato
+    diferido (``logger.debug("... %s", valor)``): fuera del modo depuración
+    los mensajes de cada petición se descartan sin construir el texto. Se
+    puede llamar de nuevo; reemplaza los handlers de la llamada anterior.
+
+    Args:
+        debug: Activar el modo depuración (None = según ``INVENTARIO_GHL_DEBUG``)
+        stream: Flujo adicional para los mensajes (por ejemplo, stderr en la CLI)
+        log_file: Archivo de registro (por defecto, en el directorio de datos)
+
+    Returns:
+        Ruta del archivo de registro, o None si no se pudo usar
+    """
+    if debug is None:
+        debug = os.getenv(DEBUG_ENV, "").strip().lower() in ("1", "true", "yes")
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if getattr(handler, "_inventario_ghl", False):
+            root.removeHandler(handler)
+            handler.close()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+
+    try:
+        log_file = log_file or get_app_data_dir() / "logs" / LOG_FILENAME
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        # delay: el archivo solo se abre al escribir el primer mensaje
+        handlers.append(
+            RotatingFileHandler(
+                log_file,
+                maxBytes=LOG_MAX_BYTES,
+                backupCount=LOG_BACKUP_COUNT,
+                encoding="utf-8",
+                delay=True,
+            )
+        )
+    except OSError:
+        log_file = None
+
+    if stream is not None:
+        handlers.append(logging.StreamHandler(stream))
+
+    for handler in handlers:
+        handler._inventario_ghl = True
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+    set_debug(debug)
+    return log_file
+
+
+def set_debug(enabled: bool):
+    """
+    Activa o desactiva el modo depuración en tiempo de ejecución
+
+    Args:
+        enabled: True para registrar cada petición (nivel DEBUG)
+    """
+    logging.getLogger().setLevel(logging.DEBUG if enabled else DEFAULT_LEVEL)
+
+
+def is_debug() -> bool:
+    """Indica si el modo depuración está activo"""
+    return logging.getLogger().isEnabledFor(logging.DEBUG)
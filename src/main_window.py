@@ -14,6 +14,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import QThread, Signal, Qt
 from PySide6.QtGui import QFont, QIcon
 
+from app_paths import load_env_file
 from highlevel_api import HighLevelAPI
 from excel_generator_xlsx import ExcelGenerator
 
@@ -81,7 +82,9 @@ class ExcelWorker(QThread):
             generator = ExcelGenerator()
             
             # Crear callback de progreso
-            def progress_callback(message):
+            # Los generadores pasan también (actual, total); esta ventana
+            # solo muestra el mensaje
+            def progress_callback(message, current=None, total=None):
                 self.progress_updated.emit(message)
             
             # Generar reporte con callback de progreso
@@ -433,6 +436,7 @@ class MainWindow(QMainWindow):
 
 def main():
     """Función principal"""
+    load_env_file()
     app = QApplication(sys.argv)
     app.setApplicationName("Inventario GHL")
     app.setApplicationVersion("1.0.0")
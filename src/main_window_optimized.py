@@ -1,133 +1,150 @@
 """
 Ventana principal de la aplicación de inventario GHL optimizada.
 """
+import importlib
+import logging
 import os
+import sqlite3
 import sys
-import tempfile
-import webbrowser
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from pathlib import Path
-from urllib.parse import parse_qs, urlparse
 
-import requests
-from dotenv import load_dotenv
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QThread, QTimer, Signal
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
     QApplication,
+    QCheckBox,
+    QComboBox,
     QFileDialog,
     QFormLayout,
     QGroupBox,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
     QLineEdit,
     QMainWindow,
     QMessageBox,
+    QPlainTextEdit,
     QProgressBar,
     QPushButton,
     QSpinBox,
     QSplitter,
     QStatusBar,
-    QTextEdit,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 try:
-    from .excel_generator_xlsx import ExcelGenerator
-    from .highlevel_api import HighLevelAPI
+    from .app_paths import get_resource_path, load_env_file
+    from .cancellation import CancellationToken, OperationCancelled
+    from .excel_generator_xlsx import (
+        IMAGE_NOTES_AUTO,
+        IMAGE_NOTES_CELL,
+        IMAGE_NOTES_HEADER,
+    )
+    from .inventory_model import InventoryTableModel
+    from .logging_setup import configure_logging, is_debug, set_debug
+    from .metrics import METRICS_ENV, NULL_METRICS, Metrics, format_summary
+    from .progress import ProgressThrottle
+    from .report_backends import (
+        AUTO_BACKEND,
+        FEATURE_CONSTANT_MEMORY,
+        FEATURE_IMAGE_NOTES,
+        create_generator,
+        get_backend,
+        list_backends,
+        supported_options,
+        supports_feature,
+        supports_streaming,
+    )
+    from .snapshot_store import SnapshotStore, hash_page
 except ImportError:
-    from excel_generator_xlsx import ExcelGenerator
-    from highlevel_api import HighLevelAPI
-
-def get_resource_path():
-    """Obtiene la ruta base para recursos, funciona tanto en desarrollo como ejecutable compilado"""
-    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-        # PyInstaller
-        return sys._MEIPASS
-    elif getattr(sys, 'frozen', False):
-        # Otros empaquetadores como Nuitka
-        return os.path.dirname(sys.executable)
-    else:
-        # Script Python normal
-        return os.path.dirname(os.path.dirname(__file__))
-
-# Cargar variables de entorno
-base_path = get_resource_path()
-env_paths = [
-    os.path.join(base_path, ".env"),
-    os.path.join(os.getcwd(), ".env"),
-    ".env"
-]
-
-print(f"[DEBUG] Buscando archivo .env al inicializar:")
-print(f"[DEBUG] Base path: {base_path}")
-print(f"[DEBUG] Working directory: {os.getcwd()}")
-
-env_loaded = False
-for i, env_path in enumerate(env_paths):
-    exists = os.path.exists(env_path)
-    print(f"[DEBUG] {i+1}. {env_path} - {'EXISTE' if exists else 'NO EXISTE'}")
-    if exists and not env_loaded:
-        load_dotenv(env_path)
-        print(f"[DEBUG] Variables cargadas desde: {env_path}")
-        # Verificar que se cargaron algunas variables
-        token = os.getenv("HIGHLEVEL_ACCESS_TOKEN")
-        location = os.getenv("HIGHLEVEL_LOCATION_ID") 
-        if token:
-            print(f"[DEBUG] Token encontrado: {token[:20]}...")
-        if location:
-            print(f"[DEBUG] Location ID encontrado: {location}")
-        env_loaded = True
-
-if not env_loaded:
-    print("[DEBUG] No se encontró archivo .env o no se pudieron cargar variables")
-
-
-class TokenCallbackHandler(BaseHTTPRequestHandler):
-    """Handler para el callback OAuth2."""
-
-    def __init__(self, token_callback, *args, **kwargs):
-        self.token_callback = token_callback
-        super().__init__(*args, **kwargs)
-
-    def do_GET(self):
-        """Maneja la petición GET del callback."""
-        if self.path.startswith("/callback"):
-            parsed_url = urlparse(self.path)
-            query_params = parse_qs(parsed_url.query)
-
-            if "code" in query_params:
-                code = query_params["code"][0]
-                self.token_callback(code)
-
-                # Respuesta de éxito
-                self.send_response(200)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-
-                html = """
-                <html>
-                <body>
-                    <h2>✅ ¡Autorización exitosa!</h2>
-                    <p>Ya puedes cerrar esta ventana y volver a la aplicación.</p>
-                    <script>setTimeout(function(){ window.close(); }, 3000);</script>
-                </body>
-                </html>
-                """
-                self.wfile.write(html.encode())
-            else:
-                self.send_error(400, "No se recibió código de autorización")
-        else:
-            self.send_error(404)
+    from app_paths import get_resource_path, load_env_file
+    from cancellation import CancellationToken, OperationCancelled
+    from excel_generator_xlsx import (
+        IMAGE_NOTES_AUTO,
+        IMAGE_NOTES_CELL,
+        IMAGE_NOTES_HEADER,
+    )
+    from inventory_model import InventoryTableModel
+    from logging_setup import configure_logging, is_debug, set_debug
+    from metrics import METRICS_ENV, NULL_METRICS, Metrics, format_summary
+    from progress import ProgressThrottle
+    from report_backends import (
+        AUTO_BACKEND,
+        FEATURE_CONSTANT_MEMORY,
+        FEATURE_IMAGE_NOTES,
+        create_generator,
+        get_backend,
+        list_backends,
+        supported_options,
+        supports_feature,
+        supports_streaming,
+    )
+    from snapshot_store import SnapshotStore, hash_page
+
+
+def _import_module(name: str):
+    """
+    Importa un módulo de la aplicación en su primer uso
+
+    Los módulos que dependen de requests (cliente de API, sincronización,
+    pipeline) se cargan al necesitarse y no al abrir la ventana.
+
+    Args:
+        name: Nombre del módulo dentro de ``src``
+
+    Returns:
+        Módulo importado
+    """
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+
+logger = logging.getLogger(__name__)
+
+# Líneas que conserva el log de actividades (las más antiguas se descartan)
+LOG_MAX_LINES = 1000
+
+
+class CancellableWorker(QThread):
+    """Base de los workers que se pueden cancelar con el botón Cancelar."""
 
-    def log_message(self, format, *args):
-        """Suprimir logs del servidor."""
-        pass
+    def __init__(self):
+        super().__init__()
+        self.cancel_token = CancellationToken()
 
+    def cancel(self):
+        """Pide la cancelación; el worker se detiene en el siguiente punto seguro."""
+        self.cancel_token.cancel()
 
-class TokenWorker(QThread):
+
+class ProgressWorker(CancellableWorker):
+    """
+    Base de los workers que reportan progreso a través de ``ProgressThrottle``
+
+    ``self.progress(mensaje, actual, total)`` se puede llamar tantas veces
+    como se quiera desde el hilo del worker: los avances numéricos se agrupan
+    y llegan a la interfaz como máximo diez veces por segundo.
+    """
+
+    progress_updated = Signal(str)
+    # (actual, total); total 0 = desconocido
+    progress_value = Signal(int, int)
+
+    def __init__(self):
+        super().__init__()
+        self.progress = ProgressThrottle(self.emit_progress)
+
+    def emit_progress(self, message: str, current=None, total=None):
+        """Emite las señales de progreso (llamado por ``ProgressThrottle``)."""
+        self.progress_updated.emit(message)
+        if current is not None:
+            self.progress_value.emit(current, total or 0)
+
+
+class TokenWorker(CancellableWorker):
     """Worker thread para obtener el token OAuth2."""
 
     progress_updated = Signal(str)
@@ -147,12 +164,9 @@ class TokenWorker(QThread):
         try:
             self.progress_updated.emit("Iniciando servidor local...")
 
-            # Crear handler con callback
-            def handler(*args, **kwargs):
-                return TokenCallbackHandler(self.handle_auth_code, *args, **kwargs)
-
             # Iniciar servidor local
-            self.server = HTTPServer(("localhost", 8080), handler)
+            oauth_callback = _import_module("oauth_callback")
+            self.server = oauth_callback.create_callback_server(self.handle_auth_code)
 
             # Construir URL de autorización
             auth_url = (
@@ -164,13 +178,19 @@ class TokenWorker(QThread):
             )
 
             self.progress_updated.emit("Abriendo navegador para autorización...")
+            import webbrowser
+
             webbrowser.open(auth_url)
 
-            # Esperar callback (timeout 300 segundos)
-            self.server.timeout = 300
-            self.server.handle_request()
+            # Esperar callback (timeout 300 segundos, cancelable)
+            oauth_callback.wait_for_code(
+                self.server,
+                lambda: self.auth_code is not None,
+                cancel_token=self.cancel_token,
+            )
 
             if self.auth_code:
+                self.cancel_token.raise_if_cancelled()
                 self.progress_updated.emit("Intercambiando código por token...")
                 token_data = self.exchange_code_for_token()
                 if token_data:
@@ -180,6 +200,8 @@ class TokenWorker(QThread):
             else:
                 self.error_occurred.emit("No se recibió código de autorización")
 
+        except OperationCancelled:
+            self.progress_updated.emit("⏹️ Autorización cancelada")
         except Exception as e:
             self.error_occurred.emit(str(e))
         finally:
@@ -193,6 +215,8 @@ class TokenWorker(QThread):
 
     def exchange_code_for_token(self):
         """Intercambia el código por un token de acceso."""
+        import requests
+
         try:
             data = {
                 "client_id": self.client_id,
@@ -202,93 +226,345 @@ class TokenWorker(QThread):
                 "redirect_uri": "http://localhost:8080/callback",
             }
 
-            response = requests.post(
-                "https://services.leadconnectorhq.com/oauth/token",
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=30,
-            )
-            response.raise_for_status()
-            return response.json()
+            highlevel_api = _import_module("highlevel_api")
+            with highlevel_api.create_session(pool_size=1) as session:
+                response = session.post(
+                    "https://services.leadconnectorhq.com/oauth/token",
+                    data=data,
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                    timeout=30,
+                )
+                response.raise_for_status()
+                return response.json()
 
         except requests.RequestException as e:
             self.error_occurred.emit(f"Error en petición: {e}")
             return None
 
 
-class InventoryWorker(QThread):
+class ConnectionTestWorker(QThread):
+    """Worker thread para probar la conexión sin bloquear la interfaz."""
+
+    result_ready = Signal(dict)
+    finished = Signal()
+
+    def __init__(self, api_client):
+        super().__init__()
+        self.api_client = api_client
+
+    def run(self):
+        """Ejecuta la prueba de conexión (peticiones cortas, sin reintentos)."""
+        try:
+            self.result_ready.emit(self.api_client.test_connection())
+        except Exception as e:
+            self.result_ready.emit(
+                {"success": False, "message": f"Error de conexión: {e}"}
+            )
+        finally:
+            self.finished.emit()
+
+
+class InventoryWorker(ProgressWorker):
     """Worker thread para obtener datos del inventario."""
 
-    progress_updated = Signal(str)
     data_received = Signal(list)
     error_occurred = Signal(str)
     finished = Signal()
 
-    def __init__(self, api_client):
+    def __init__(self, api_client, snapshot_store=None):
         super().__init__()
         self.api_client = api_client
+        self.snapshot_store = snapshot_store
+        self.snapshot_id = None
         self.limit = 300
         self.offset = 0
-
-    def set_parameters(self, limit: int, offset: int):
+        self.fetch_all = False
+        self.concurrency = 1
+        self.incremental = False
+
+    def set_parameters(
+        self,
+        limit: int,
+        offset: int,
+        fetch_all: bool = False,
+        concurrency: int = 1,
+        incremental: bool = False,
+    ):
         """Configura los parámetros de la consulta."""
         self.limit = limit
         self.offset = offset
+        self.fetch_all = fetch_all
+        self.concurrency = concurrency
+        self.incremental = incremental
 
     def run(self):
         """Ejecuta la obtención de datos en segundo plano."""
         try:
-            self.progress_updated.emit("Conectando con HighLevel API...")
+            self.progress("Conectando con HighLevel API...")
 
-            inventory_data = self.api_client.get_inventory(
-                limit=self.limit, offset=self.offset
-            )
+            if self.fetch_all and self.incremental and self.snapshot_store:
+                self.data_received.emit(self.sync_incremental())
+                return
+
+            if self.fetch_all:
+                # Solo el recorrido completo se guarda como snapshot: una sola
+                # página (con su offset/límite) no es el catálogo
+                self.begin_snapshot()
+                formatted_data = self.fetch_full_catalog()
+            else:
+                inventory_data = self.api_client.get_inventory(
+                    limit=self.limit,
+                    offset=self.offset,
+                    cancel_token=self.cancel_token,
+                )
 
-            self.progress_updated.emit(f"Se obtuvieron {len(inventory_data)} productos")
+                self.progress(f"Se obtuvieron {len(inventory_data)} productos")
 
-            formatted_data = self.api_client.format_inventory_data(inventory_data)
+                formatted_data = self.api_client.format_inventory_data(inventory_data)
 
-            self.progress_updated.emit("Datos formateados correctamente")
+            self.progress("Datos formateados correctamente")
+            self.finish_snapshot()
             self.data_received.emit(formatted_data)
 
+        except OperationCancelled:
+            self.progress.flush()
+            self.discard_snapshot()
+            self.progress("⏹️ Descarga cancelada")
         except Exception as e:
+            logger.exception("Error al obtener el inventario")
+            self.progress.flush()
+            self.discard_snapshot()
             self.error_occurred.emit(str(e))
         finally:
             self.finished.emit()
 
+    def fetch_full_catalog(self) -> list:
+        """Recorre todas las páginas formateando cada una al llegar."""
+
+        def on_page(fetched, total, page_number):
+            total_text = f" de {total}" if total is not None else ""
+            self.progress(
+                f"Página {page_number}: {fetched}{total_text} productos obtenidos",
+                fetched,
+                total,
+            )
+
+        formatted_data = []
+        # Solo se conservan los datos formateados; cada página cruda se descarta
+        for page in self.api_client.iter_inventory(
+            page_size=self.limit,
+            progress_callback=on_page,
+            concurrency=self.concurrency,
+            cancel_token=self.cancel_token,
+        ):
+            formatted_page = self.api_client.format_inventory_data(page)
+            self.save_page(
+                page, formatted_page, len(formatted_data), record_page=True
+            )
+            formatted_data.extend(formatted_page)
 
-class ExcelWorker(QThread):
+        self.progress(
+            f"Se obtuvieron {len(formatted_data)} productos del catálogo completo"
+        )
+        return formatted_data
+
+    def sync_incremental(self) -> list:
+        """Sincroniza solo los cambios contra el último snapshot local."""
+
+        def on_page(processed, total, page_number):
+            total_text = f" de {total}" if total is not None else ""
+            self.progress(
+                f"Página {page_number}: {processed}{total_text} productos revisados",
+                processed,
+                total,
+            )
+
+        delta_sync = _import_module("delta_sync")
+        result = delta_sync.DeltaSync(
+            self.api_client, self.snapshot_store, page_size=self.limit
+        ).sync(
+            concurrency=self.concurrency,
+            progress_callback=on_page,
+            cancel_token=self.cancel_token,
+        )
+
+        self.progress(
+            f"Sincronización incremental: {result['added']} nuevos, "
+            f"{result['changed']} modificados, {result['removed']} eliminados, "
+            f"{result['unchanged']} sin cambios "
+            f"({result['pages_skipped']}/{result['pages_total']} páginas omitidas)"
+        )
+        return self.snapshot_store.load_formatted(result["snapshot_id"])
+
+    def begin_snapshot(self):
+        """Abre un snapshot local para ir guardando las páginas."""
+        if not self.snapshot_store:
+            return
+        try:
+            self.snapshot_id = self.snapshot_store.begin_snapshot(
+                self.api_client.location_id
+            )
+        except sqlite3.Error as e:
+            self.progress(f"⚠️ Snapshot local deshabilitado: {e}")
+            self.snapshot_id = None
+
+    def save_page(
+        self, raw_items, formatted_items, start_position: int, record_page=False
+    ):
+        """Guarda una página en el snapshot local, si está activo."""
+        if self.snapshot_id is None:
+            return
+        try:
+            item_hashes = self.snapshot_store.add_items(
+                self.snapshot_id, raw_items, formatted_items, start_position
+            )
+            if record_page:
+                # Hash por página para que la siguiente sincronización
+                # incremental pueda omitir las que no cambien
+                self.snapshot_store.add_page(
+                    self.snapshot_id,
+                    start_position,
+                    len(item_hashes),
+                    hash_page(item_hashes),
+                )
+        except sqlite3.Error as e:
+            self.progress(f"⚠️ No se pudo guardar el snapshot: {e}")
+            self.discard_snapshot()
+
+    def finish_snapshot(self):
+        """Marca el snapshot como completo."""
+        if self.snapshot_id is None:
+            return
+        try:
+            item_count = self.snapshot_store.finish_snapshot(self.snapshot_id)
+            self.progress(
+                f"Snapshot local #{self.snapshot_id} guardado ({item_count} productos)"
+            )
+        except sqlite3.Error as e:
+            self.progress(f"⚠️ No se pudo cerrar el snapshot: {e}")
+
+    def discard_snapshot(self):
+        """Elimina un snapshot incompleto."""
+        if self.snapshot_id is None:
+            return
+        try:
+            self.snapshot_store.discard_snapshot(self.snapshot_id)
+        except sqlite3.Error:
+            pass
+        self.snapshot_id = None
+
+
+class ExcelWorker(ProgressWorker):
     """Worker thread para generar el archivo Excel."""
 
-    progress_updated = Signal(str)
     file_generated = Signal(str)
     error_occurred = Signal(str)
     finished = Signal()
 
-    def __init__(self, inventory_data, output_path=None):
+    def __init__(
+        self, inventory_data, output_path=None, report_options=None, metrics=None
+    ):
         super().__init__()
         self.inventory_data = inventory_data
         self.output_path = output_path
+        self.report_options = report_options or {}
+        self.metrics = metrics or NULL_METRICS
 
     def run(self):
         """Genera el archivo Excel en segundo plano."""
         try:
-            generator = ExcelGenerator()
-
-            def progress_callback(message):
-                self.progress_updated.emit(message)
-
-            file_path = generator.create_report(
-                self.inventory_data, self.output_path, progress_callback=progress_callback
+            generator = create_generator(
+                row_count=len(self.inventory_data),
+                cancel_token=self.cancel_token,
+                **self.report_options,
             )
+            with self.metrics.span("write", rows=len(self.inventory_data)):
+                file_path = generator.create_report(
+                    self.inventory_data,
+                    self.output_path,
+                    progress_callback=self.progress,
+                )
+            self.cancel_token.raise_if_cancelled()
 
-            self.progress_updated.emit("Agregando resumen al reporte...")
-            generator.add_summary(self.inventory_data)
+            self.progress("Agregando resumen al reporte...")
+            with self.metrics.span("write"):
+                generator.add_summary(self.inventory_data)
 
-            self.progress_updated.emit("✅ Archivo Excel generado exitosamente")
+            self.progress("✅ Archivo Excel generado exitosamente")
             self.file_generated.emit(file_path)
 
+        except OperationCancelled:
+            self.progress.flush()
+            # Solo create_report puede cancelarse: el generador ya existe
+            generator.discard_report()
+            self.progress("⏹️ Generación del reporte cancelada")
+        except Exception as e:
+            logger.exception("Error al generar el reporte")
+            self.progress.flush()
+            self.error_occurred.emit(str(e))
+        finally:
+            self.finished.emit()
+
+
+class StreamingExportWorker(ProgressWorker):
+    """Worker thread que descarga el catálogo y lo escribe directo al Excel."""
+
+    file_generated = Signal(str)
+    error_occurred = Signal(str)
+    finished = Signal()
+
+    def __init__(
+        self,
+        api_client,
+        output_path=None,
+        page_size=300,
+        concurrency=1,
+        report_options=None,
+    ):
+        super().__init__()
+        self.api_client = api_client
+        self.output_path = output_path
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.report_options = report_options or {}
+
+    def run(self):
+        """Descarga y escribe el reporte página a página en segundo plano."""
+        try:
+            pipeline = _import_module("pipeline")
+            result = pipeline.stream_inventory_to_excel(
+                self.api_client,
+                self.output_path,
+                generator=create_generator(
+                    # openpyxl no escribe por partes: el pipeline acumula las
+                    # filas y genera el reporte al final
+                    streaming=supports_streaming(
+                        self.report_options.get("backend", AUTO_BACKEND)
+                    ),
+                    cancel_token=self.cancel_token,
+                    **self.report_options,
+                ),
+                page_size=self.page_size,
+                concurrency=self.concurrency,
+                progress_callback=self.progress,
+                cancel_token=self.cancel_token,
+            )
+
+            if result["streamed"]:
+                self.progress(
+                    f"✅ {result['items_count']} productos exportados sin cargarlos en memoria"
+                )
+            else:
+                self.progress(f"✅ {result['items_count']} productos exportados")
+            self.file_generated.emit(result["path"])
+
+        except OperationCancelled:
+            # El pipeline ya descartó el archivo parcial
+            self.progress.flush()
+            self.progress("⏹️ Exportación cancelada")
         except Exception as e:
+            logger.exception("Error en la exportación")
+            self.progress.flush()
             self.error_occurred.emit(str(e))
         finally:
             self.finished.emit()
@@ -304,8 +580,22 @@ class MainWindow(QMainWindow):
         self.inventory_worker = None
         self.excel_worker = None
         self.token_worker = None
+        self.stream_worker = None
+        self.connection_worker = None
+        self.snapshot_store = None
+        # Métricas de la última operación; INVENTARIO_GHL_METRICS guarda
+        # además cada evento en un archivo JSON Lines
+        self.metrics = Metrics(os.getenv(METRICS_ENV) or None)
 
         self.init_ui()
+
+        # El cliente de API (y requests) se carga después de mostrar la
+        # ventana, en la primera vuelta del bucle de eventos
+        QTimer.singleShot(0, self.init_services)
+
+    def init_services(self):
+        """Abre el almacén de snapshots y el cliente de API."""
+        self.init_snapshot_store()
         self.init_api()
 
     def init_ui(self):
@@ -346,10 +636,18 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Listo para generar reportes")
 
-        # Barra de progreso
+        # Barra de progreso con botón para cancelar la operación en curso
+        progress_layout = QHBoxLayout()
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        main_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.progress_bar)
+
+        self.cancel_btn = QPushButton("Cancelar")
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(self.cancel_operations)
+        progress_layout.addWidget(self.cancel_btn)
+
+        main_layout.addLayout(progress_layout)
 
     def create_config_panel(self) -> QWidget:
         """Crea el panel de configuración."""
@@ -387,12 +685,85 @@ class MainWindow(QMainWindow):
 
         self.offset_spinbox = QSpinBox()
         self.offset_spinbox.setMinimum(0)
-        self.offset_spinbox.setMaximum(10000)
+        self.offset_spinbox.setMaximum(1000000)
         self.offset_spinbox.setValue(0)
         api_layout.addRow("Offset:", self.offset_spinbox)
 
+        self.fetch_all_checkbox = QCheckBox("Obtener catálogo completo")
+        self.fetch_all_checkbox.setToolTip(
+            "Recorre todas las páginas; el límite se usa como tamaño de página"
+        )
+        self.fetch_all_checkbox.toggled.connect(self.on_fetch_all_toggled)
+        api_layout.addRow(self.fetch_all_checkbox)
+
+        self.concurrency_spinbox = QSpinBox()
+        self.concurrency_spinbox.setMinimum(1)
+        self.concurrency_spinbox.setMaximum(10)
+        self.concurrency_spinbox.setValue(4)
+        self.concurrency_spinbox.setToolTip(
+            "Páginas solicitadas en paralelo al obtener el catálogo completo"
+        )
+        self.concurrency_spinbox.setEnabled(False)
+        api_layout.addRow("Peticiones simultáneas:", self.concurrency_spinbox)
+
+        self.incremental_checkbox = QCheckBox("Sincronización incremental")
+        self.incremental_checkbox.setToolTip(
+            "Solo procesa las páginas que cambiaron desde el último snapshot local"
+        )
+        self.incremental_checkbox.setEnabled(False)
+        api_layout.addRow(self.incremental_checkbox)
+
+        self.debug_checkbox = QCheckBox("Registro de depuración")
+        self.debug_checkbox.setToolTip(
+            "Registra cada petición en logs/inventario_ghl.log, dentro del "
+            "directorio de datos; desactivado solo se registran avisos y errores"
+        )
+        self.debug_checkbox.setChecked(is_debug())
+        self.debug_checkbox.toggled.connect(set_debug)
+        api_layout.addRow(self.debug_checkbox)
+
         config_layout.addWidget(api_group)
 
+        # Configuración del reporte
+        report_group = QGroupBox("Configuración de Reporte")
+        report_layout = QFormLayout(report_group)
+
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem("Automático (Excel)", AUTO_BACKEND)
+        for backend in list_backends(available_only=True):
+            self.backend_combo.addItem(backend.label, backend.name)
+        self.backend_combo.setToolTip(
+            "En automático se usa el motor de Excel más rápido instalado y la "
+            "memoria constante en reportes muy grandes; CSV y Parquet exportan "
+            "solo las cuatro columnas, sin formato"
+        )
+        report_layout.addRow("Formato de salida:", self.backend_combo)
+
+        self.constant_memory_checkbox = QCheckBox("Modo de memoria constante")
+        self.constant_memory_checkbox.setToolTip(
+            "Escribe cada fila a disco al completarla; recomendado para "
+            "catálogos de decenas de miles de productos (solo XlsxWriter)"
+        )
+        report_layout.addRow(self.constant_memory_checkbox)
+
+        self.image_notes_combo = QComboBox()
+        self.image_notes_combo.addItem("Automático", IMAGE_NOTES_AUTO)
+        self.image_notes_combo.addItem("Comentario por celda", IMAGE_NOTES_CELL)
+        self.image_notes_combo.addItem("Nota única en encabezado", IMAGE_NOTES_HEADER)
+        self.image_notes_combo.setToolTip(
+            "Los comentarios por celda hacen muy lenta la generación de "
+            "reportes grandes; en automático se usa una sola nota a partir "
+            "de 1000 productos"
+        )
+        report_layout.addRow("Instrucciones de imagen:", self.image_notes_combo)
+
+        self.backend_combo.currentIndexChanged.connect(
+            self.update_report_option_widgets
+        )
+        self.update_report_option_widgets()
+
+        config_layout.addWidget(report_group)
+
         # Botones de acción
         buttons_layout = QVBoxLayout()
 
@@ -404,11 +775,25 @@ class MainWindow(QMainWindow):
         self.fetch_data_btn.clicked.connect(self.fetch_inventory_data)
         buttons_layout.addWidget(self.fetch_data_btn)
 
-        self.generate_excel_btn = QPushButton("Generar Reporte Excel")
+        self.generate_excel_btn = QPushButton("Generar Reporte")
         self.generate_excel_btn.clicked.connect(self.generate_excel_report)
         self.generate_excel_btn.setEnabled(False)
         buttons_layout.addWidget(self.generate_excel_btn)
 
+        self.stream_export_btn = QPushButton("Descargar y Exportar")
+        self.stream_export_btn.setToolTip(
+            "Descarga el catálogo completo y lo escribe al reporte página a página"
+        )
+        self.stream_export_btn.clicked.connect(self.stream_export_report)
+        buttons_layout.addWidget(self.stream_export_btn)
+
+        self.load_snapshot_btn = QPushButton("Cargar Último Snapshot")
+        self.load_snapshot_btn.setToolTip(
+            "Carga sin conexión los datos de la última obtención guardada"
+        )
+        self.load_snapshot_btn.clicked.connect(self.load_latest_snapshot)
+        buttons_layout.addWidget(self.load_snapshot_btn)
+
         self.open_folder_btn = QPushButton("Abrir Carpeta de Reportes")
         self.open_folder_btn.clicked.connect(self.open_reports_folder)
         buttons_layout.addWidget(self.open_folder_btn)
@@ -448,35 +833,82 @@ class MainWindow(QMainWindow):
         self.last_update_label = QLabel("Nunca")
         info_layout.addRow("Última actualización:", self.last_update_label)
 
+        self.metrics_label = QLabel("Sin datos")
+        self.metrics_label.setWordWrap(True)
+        info_layout.addRow("Rendimiento:", self.metrics_label)
+
         results_layout.addWidget(info_group)
 
         # Log de actividades
         log_group = QGroupBox("Log de Actividades")
         log_layout = QVBoxLayout(log_group)
 
-        self.log_text = QTextEdit()
+        # Búfer circular: QPlainTextEdit descarta las líneas más antiguas
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(LOG_MAX_LINES)
         self.log_text.setMaximumHeight(200)
         log_layout.addWidget(self.log_text)
 
         results_layout.addWidget(log_group)
 
-        # Vista previa
+        # Vista previa: tabla virtualizada con todos los productos
         preview_group = QGroupBox("Vista Previa de Datos")
         preview_layout = QVBoxLayout(preview_group)
 
-        self.preview_text = QTextEdit()
-        self.preview_text.setReadOnly(True)
-        preview_layout.addWidget(self.preview_text)
-
-        results_layout.addWidget(preview_group)
+        filter_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar por nombre, producto o imagen...")
+        self.filter_edit.setClearButtonEnabled(True)
+        filter_layout.addWidget(self.filter_edit)
+        self.rows_shown_label = QLabel("")
+        filter_layout.addWidget(self.rows_shown_label)
+        preview_layout.addLayout(filter_layout)
+
+        self.inventory_model = InventoryTableModel(self)
+        self.inventory_table = QTableView()
+        self.inventory_table.setModel(self.inventory_model)
+        self.inventory_table.setSortingEnabled(True)
+        self.inventory_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.inventory_table.setAlternatingRowColors(True)
+        self.inventory_table.setSelectionBehavior(QTableView.SelectRows)
+        self.inventory_table.setWordWrap(False)
+        # Altura de fila fija: la vista no mide cada fila del modelo
+        vertical_header = self.inventory_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(22)
+        self.inventory_table.horizontalHeader().setStretchLastSection(True)
+        preview_layout.addWidget(self.inventory_table)
+
+        # Filtrar tras una pausa al escribir, no en cada tecla
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(250)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+
+        results_layout.addWidget(preview_group, 1)
 
         return results_widget
 
+    def init_snapshot_store(self):
+        """Abre el almacén local de snapshots."""
+        try:
+            self.snapshot_store = SnapshotStore()
+        except (OSError, sqlite3.Error) as e:
+            self.snapshot_store = None
+            self.load_snapshot_btn.setEnabled(False)
+            self.log_message(f"Snapshots locales no disponibles: {e}", is_error=True)
+
     def init_api(self):
         """Inicializa el cliente de API."""
+        if self.api_client:
+            self.api_client.close()
+            self.api_client = None
         try:
-            self.api_client = HighLevelAPI()
+            self.api_client = _import_module("highlevel_api").HighLevelAPI(
+                metrics=self.metrics
+            )
             self.log_message("Cliente de API inicializado")
             self.update_status_labels()
         except Exception as e:
@@ -507,11 +939,52 @@ class MainWindow(QMainWindow):
         prefix = "ERROR" if is_error else "INFO"
         formatted_message = f"[{timestamp}] {prefix}: {message}"
 
-        self.log_text.append(formatted_message)
+        self.log_text.appendPlainText(formatted_message)
 
-        if not is_error:
+        if is_error:
+            logger.error("%s", message)
+        else:
             self.status_bar.showMessage(message)
 
+    def show_progress(self):
+        """Muestra la barra (indeterminada) y el botón Cancelar."""
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
+
+    def hide_progress(self):
+        """Oculta la barra y el botón Cancelar."""
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+
+    def cancel_operations(self):
+        """Pide la cancelación de las operaciones en curso."""
+        self.cancel_btn.setEnabled(False)
+        self.log_message("Cancelando operación...")
+        for worker in (
+            self.token_worker,
+            self.inventory_worker,
+            self.excel_worker,
+            self.stream_worker,
+        ):
+            if worker is not None and worker.isRunning():
+                worker.cancel()
+
+    def show_metrics_summary(self):
+        """Muestra las métricas de la operación que acaba de terminar."""
+        summary = format_summary(self.metrics.summary())
+        self.metrics_label.setText(summary)
+        self.log_message(f"📈 Rendimiento: {summary}")
+
+    def update_progress(self, current: int, total: int):
+        """Muestra el avance en la barra (indeterminada si el total es 0)."""
+        if total <= 0:
+            self.progress_bar.setRange(0, 0)
+            return
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(min(current, total))
+
     def get_access_token(self):
         """Obtiene un token de acceso OAuth2."""
         client_id = self.client_id_input.text().strip()
@@ -527,8 +1000,7 @@ class MainWindow(QMainWindow):
 
         # Deshabilitar botón
         self.get_token_btn.setEnabled(False)
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)
+        self.show_progress()
 
         # Crear worker
         self.token_worker = TokenWorker(client_id, client_secret)
@@ -567,7 +1039,12 @@ class MainWindow(QMainWindow):
         """Actualiza el archivo .env con las credenciales."""
         try:
             self.log_message(f"Guardando credenciales OAuth...")
-            self.log_message(f"Access Token: {access_token[:20]}..." if access_token else "Access Token: None")
+            # El log puede terminar en el archivo de diagnósticos: nunca el token
+            self.log_message(
+                f"Access Token: ...{access_token[-4:]} ({len(access_token)} caracteres)"
+                if access_token
+                else "Access Token: None"
+            )
             self.log_message(f"Location ID: {location_id}" if location_id else "Location ID: None")
             
             env_content = []
@@ -651,6 +1128,8 @@ class MainWindow(QMainWindow):
                     self.log_message("❌ Credenciales NO encontradas en archivo", is_error=True)
 
             # Recargar variables de entorno
+            from dotenv import load_dotenv
+
             load_dotenv(env_path, override=True)
             self.log_message(f"Variables de entorno recargadas desde: {env_path}")
             
@@ -677,7 +1156,13 @@ class MainWindow(QMainWindow):
     def on_token_finished(self):
         """Se ejecuta cuando termina la obtención de token."""
         self.get_token_btn.setEnabled(True)
-        self.progress_bar.setVisible(False)
+        self.hide_progress()
+
+    def on_fetch_all_toggled(self, checked: bool):
+        """El offset manual no aplica al obtener el catálogo completo."""
+        self.offset_spinbox.setEnabled(not checked)
+        self.concurrency_spinbox.setEnabled(checked)
+        self.incremental_checkbox.setEnabled(checked and bool(self.snapshot_store))
 
     def test_api_connection(self):
         """Prueba la conexión con la API."""
@@ -685,15 +1170,33 @@ class MainWindow(QMainWindow):
             self.log_message("Cliente de API no disponible", is_error=True)
             return
 
+        self.test_connection_btn.setEnabled(False)
         self.log_message("Probando conexión con HighLevel API...")
-        result = self.api_client.test_connection()
+
+        self.connection_worker = ConnectionTestWorker(self.api_client)
+        self.connection_worker.result_ready.connect(self.on_connection_tested)
+        self.connection_worker.finished.connect(self.on_connection_test_finished)
+        self.connection_worker.start()
+
+    def on_connection_tested(self, result):
+        """Muestra el resultado de la prueba de conexión con su latencia."""
+        message = result["message"]
+        if "latency_ms" in result:
+            message += (
+                f" (HTTP {result['status_code']}, {result['latency_ms']:.0f} ms; "
+                f"headers en {result['headers_ms']:.0f} ms)"
+            )
 
         if result["success"]:
-            self.log_message(f"✓ {result['message']}")
-            QMessageBox.information(self, "Conexión Exitosa", result["message"])
+            self.log_message(f"✓ {message}")
+            QMessageBox.information(self, "Conexión Exitosa", message)
         else:
-            self.log_message(result["message"], is_error=True)
-            QMessageBox.warning(self, "Error de Conexión", result["message"])
+            self.log_message(message, is_error=True)
+            QMessageBox.warning(self, "Error de Conexión", message)
+
+    def on_connection_test_finished(self):
+        """Se ejecuta cuando termina la prueba de conexión."""
+        self.test_connection_btn.setEnabled(True)
 
     def fetch_inventory_data(self):
         """Obtiene los datos del inventario."""
@@ -703,21 +1206,48 @@ class MainWindow(QMainWindow):
 
         self.fetch_data_btn.setEnabled(False)
         self.generate_excel_btn.setEnabled(False)
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)
+        self.show_progress()
+        self.metrics.reset()
 
-        self.inventory_worker = InventoryWorker(self.api_client)
+        self.inventory_worker = InventoryWorker(self.api_client, self.snapshot_store)
         self.inventory_worker.set_parameters(
-            self.limit_spinbox.value(), self.offset_spinbox.value()
+            self.limit_spinbox.value(),
+            self.offset_spinbox.value(),
+            fetch_all=self.fetch_all_checkbox.isChecked(),
+            concurrency=self.concurrency_spinbox.value(),
+            incremental=self.incremental_checkbox.isChecked(),
         )
 
         self.inventory_worker.progress_updated.connect(self.log_message)
+        self.inventory_worker.progress_value.connect(self.update_progress)
         self.inventory_worker.data_received.connect(self.on_data_received)
         self.inventory_worker.error_occurred.connect(self.on_data_error)
         self.inventory_worker.finished.connect(self.on_fetch_finished)
 
         self.inventory_worker.start()
 
+    def load_latest_snapshot(self) -> bool:
+        """Carga el último snapshot local como datos actuales."""
+        if not self.snapshot_store:
+            return False
+
+        location_id = self.api_client.location_id if self.api_client else None
+        try:
+            snapshot = self.snapshot_store.latest_snapshot(location_id)
+            if not snapshot:
+                self.log_message("No hay snapshots locales guardados")
+                return False
+            inventory_data = self.snapshot_store.load_formatted(snapshot["id"])
+        except sqlite3.Error as e:
+            self.log_message(f"Error leyendo snapshot: {e}", is_error=True)
+            return False
+
+        self.log_message(
+            f"Snapshot #{snapshot['id']} del {snapshot['created_at']} cargado"
+        )
+        self.on_data_received(inventory_data)
+        return True
+
     def on_data_received(self, inventory_data):
         """Maneja los datos recibidos del inventario."""
         self.current_inventory_data = inventory_data
@@ -730,18 +1260,25 @@ class MainWindow(QMainWindow):
         self.last_update_label.setText(datetime.now().strftime("%d/%m/%Y %H:%M:%S"))
 
         # Vista previa
-        preview_text = "Vista previa de los primeros 5 productos:\\n\\n"
-        for i, item in enumerate(inventory_data[:5], 1):
-            preview_text += f"{i}. {item['Nombre']} - {item['Nombre de producto']} "
-            preview_text += f"(Cantidad: {item['Cantidad disponible']})\\n"
-
-        if len(inventory_data) > 5:
-            preview_text += f"\\n... y {len(inventory_data) - 5} productos más"
-
-        self.preview_text.setText(preview_text)
+        self.inventory_model.set_items(inventory_data)
+        self.update_rows_shown()
         self.generate_excel_btn.setEnabled(True)
         self.log_message(f"✓ Datos cargados: {total_products} productos")
 
+    def apply_filter(self):
+        """Aplica el texto del filtro a la tabla de vista previa."""
+        self.inventory_model.set_filter_text(self.filter_edit.text())
+        self.update_rows_shown()
+
+    def update_rows_shown(self):
+        """Actualiza el contador de filas visibles de la vista previa."""
+        shown = self.inventory_model.rowCount()
+        total = self.inventory_model.total_count()
+        if shown == total:
+            self.rows_shown_label.setText(f"{total} productos")
+        else:
+            self.rows_shown_label.setText(f"{shown} de {total} productos")
+
     def on_data_error(self, error_message):
         """Maneja errores en la obtención de datos."""
         self.log_message(f"Error: {error_message}", is_error=True)
@@ -750,39 +1287,119 @@ class MainWindow(QMainWindow):
     def on_fetch_finished(self):
         """Se ejecuta cuando termina la obtención de datos."""
         self.fetch_data_btn.setEnabled(True)
-        self.progress_bar.setVisible(False)
+        self.hide_progress()
+        self.show_metrics_summary()
 
     def generate_excel_report(self):
         """Genera el reporte de Excel."""
-        if not self.current_inventory_data:
+        if not self.current_inventory_data and not self.load_latest_snapshot():
             QMessageBox.warning(
                 self, "Sin Datos", "No hay datos de inventario para generar el reporte."
             )
             return
 
-        default_name = f"inventario_ghl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        file_path, _ = QFileDialog.getSaveFileName(
-            self,
-            "Guardar Reporte de Excel",
-            default_name,
-            "Archivos Excel (*.xlsx);;Todos los archivos (*)",
-        )
-
+        file_path = self.ask_report_path()
         if not file_path:
             return
 
         self.generate_excel_btn.setEnabled(False)
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)
-
-        self.excel_worker = ExcelWorker(self.current_inventory_data, file_path)
+        self.show_progress()
+        self.metrics.reset()
+
+        self.excel_worker = ExcelWorker(
+            self.current_inventory_data,
+            file_path,
+            self.get_report_options(),
+            metrics=self.metrics,
+        )
         self.excel_worker.progress_updated.connect(self.log_message)
+        self.excel_worker.progress_value.connect(self.update_progress)
         self.excel_worker.file_generated.connect(self.on_excel_generated)
         self.excel_worker.error_occurred.connect(self.on_excel_error)
         self.excel_worker.finished.connect(self.on_excel_finished)
 
         self.excel_worker.start()
 
+    def ask_report_path(self) -> str:
+        """Pide la ruta del reporte según el formato de salida elegido."""
+        backend_name = self.backend_combo.currentData()
+        if backend_name == AUTO_BACKEND:
+            extension, description = ".xlsx", "Archivos Excel"
+        else:
+            backend = get_backend(backend_name)
+            extension, description = backend.extension, f"Archivos {backend.label}"
+
+        default_name = (
+            f"inventario_ghl_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+        )
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Guardar Reporte",
+            default_name,
+            f"{description} (*{extension});;Todos los archivos (*)",
+        )
+        return file_path
+
+    def update_report_option_widgets(self):
+        """Habilita solo las opciones que soporta el formato de salida elegido."""
+        backend_name = self.backend_combo.currentData()
+        self.constant_memory_checkbox.setEnabled(
+            supports_feature(backend_name, FEATURE_CONSTANT_MEMORY)
+        )
+        self.image_notes_combo.setEnabled(
+            supports_feature(backend_name, FEATURE_IMAGE_NOTES)
+        )
+
+    def get_report_options(self) -> dict:
+        """Opciones del generador según la configuración de reporte."""
+        backend_name = self.backend_combo.currentData()
+        # Las opciones que el formato no soporta (p. ej. las notas de imagen
+        # en CSV) se omiten aunque el control conserve su valor
+        options = supported_options(
+            backend_name,
+            # Sin marcar: el modo automático decide según el tamaño
+            constant_memory=self.constant_memory_checkbox.isChecked() or None,
+            image_notes=self.image_notes_combo.currentData(),
+        )
+        return {"backend": backend_name, **options}
+
+    def stream_export_report(self):
+        """Descarga el catálogo completo escribiéndolo directo al Excel."""
+        if not self.api_client:
+            self.log_message("Cliente de API no disponible", is_error=True)
+            return
+
+        file_path = self.ask_report_path()
+        if not file_path:
+            return
+
+        self.stream_export_btn.setEnabled(False)
+        self.fetch_data_btn.setEnabled(False)
+        self.show_progress()
+        self.metrics.reset()
+
+        self.stream_worker = StreamingExportWorker(
+            self.api_client,
+            file_path,
+            page_size=self.limit_spinbox.value(),
+            concurrency=self.concurrency_spinbox.value(),
+            report_options=self.get_report_options(),
+        )
+        self.stream_worker.progress_updated.connect(self.log_message)
+        self.stream_worker.progress_value.connect(self.update_progress)
+        self.stream_worker.file_generated.connect(self.on_excel_generated)
+        self.stream_worker.error_occurred.connect(self.on_excel_error)
+        self.stream_worker.finished.connect(self.on_stream_export_finished)
+
+        self.stream_worker.start()
+
+    def on_stream_export_finished(self):
+        """Se ejecuta cuando termina la exportación en streaming."""
+        self.stream_export_btn.setEnabled(True)
+        self.fetch_data_btn.setEnabled(True)
+        self.hide_progress()
+        self.show_metrics_summary()
+
     def on_excel_generated(self, file_path):
         """Se ejecuta cuando se genera el archivo Excel."""
         self.log_message(f"✓ Reporte Excel generado: {file_path}")
@@ -805,7 +1422,8 @@ class MainWindow(QMainWindow):
     def on_excel_finished(self):
         """Se ejecuta cuando termina la generación de Excel."""
         self.generate_excel_btn.setEnabled(True)
-        self.progress_bar.setVisible(False)
+        self.hide_progress()
+        self.show_metrics_summary()
 
     def open_reports_folder(self):
         """Abre la carpeta donde se guardan los reportes."""
@@ -815,11 +1433,18 @@ class MainWindow(QMainWindow):
 
 def main():
     """Función principal."""
+    env_path = load_env_file()
+    configure_logging()
+
     app = QApplication(sys.argv)
     app.setApplicationName("Inventario GHL")
     app.setApplicationVersion("2.0.0")
 
     window = MainWindow()
+    if env_path:
+        window.log_message(f"Variables cargadas desde: {env_path}")
+    else:
+        window.log_message("No se encontró archivo .env", is_error=True)
     window.show()
 
     sys.exit(app.exec())
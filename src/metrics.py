@@ -0,0 +1,277 @@
+"""
+Métricas de peticiones HTTP y tiempos por etapa (descarga, formato, escritura).
+"""
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Variable de entorno con la ruta del archivo JSON Lines de la interfaz
+METRICS_ENV = "INVENTARIO_GHL_METRICS"
+
+# Etapas en el orden en que se muestran en el resumen
+STAGE_ORDER = ("fetch", "decode", "format", "write")
+
+
+class Metrics:
+    """
+    Colector de métricas seguro entre hilos
+
+    Registra cada intento de petición HTTP (endpoint, estado, bytes,
+    latencia, tiempo hasta los headers, número de reintento) y la duración
+    de las etapas (``span``). Los agregados quedan en memoria para
+    ``summary()``; si se indica ``path`` cada evento se agrega además como
+    una línea JSON al archivo.
+
+    Los tiempos de etapa se suman aunque se solapen: con descargas en
+    paralelo ``fetch`` puede superar el tiempo total de la operación.
+    ``fetch`` incluye las esperas del limitador y de los reintentos; la
+    latencia de cada petición no, así que la diferencia muestra ese tiempo.
+    """
+
+    enabled = True
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: Archivo JSON Lines donde agregar los eventos (opcional)
+        """
+        self.path = Path(path) if path else None
+        self._file = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Descarta los agregados (el archivo conserva lo ya escrito)"""
+        with self._lock:
+            self._statuses: Dict[str, int] = {}
+            self._latencies: List[float] = []
+            self._headers_time = 0.0
+            self._headers_count = 0
+            self._retries = 0
+            self._errors = 0
+            self._bytes = 0
+            self._stages: Dict[str, List[float]] = {}
+
+    def record_request(
+        self,
+        endpoint: str,
+        status: Optional[int],
+        latency: float,
+        headers_time: Optional[float] = None,
+        size: Optional[int] = None,
+        attempt: int = 0,
+        error: Optional[str] = None,
+    ):
+        """
+        Registra un intento de petición HTTP
+
+        Args:
+            endpoint: Ruta solicitada (sin la URL base)
+            status: Código de estado, o None si no hubo respuesta
+            latency: Segundos desde el envío hasta tener el cuerpo completo
+            headers_time: Segundos hasta recibir los headers (incluye
+                conexión/TLS si la conexión era nueva)
+            size: Bytes del cuerpo (ya descomprimido)
+            attempt: Número de reintento (0 = primer intento)
+            error: Error de conexión, si no hubo respuesta
+        """
+        record = {
+            "type": "request",
+            "ts": round(time.time(), 3),
+            "endpoint": endpoint,
+            "status": status,
+            "latency_ms": round(latency * 1000, 2),
+            "headers_ms": (
+                round(headers_time * 1000, 2) if headers_time is not None else None
+            ),
+            "bytes": size,
+            "attempt": attempt,
+        }
+        if error:
+            record["error"] = error
+
+        with self._lock:
+            key = str(status) if status is not None else "error"
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+            self._latencies.append(latency)
+            if headers_time is not None:
+                self._headers_time += headers_time
+                self._headers_count += 1
+            if attempt:
+                self._retries += 1
+            if status is None or status >= 400:
+                self._errors += 1
+            self._bytes += size or 0
+            self._write(record)
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        """
+        Mide la duración de un bloque como una etapa
+
+        Args:
+            name: Nombre de la etapa (``fetch``, ``decode``, ``format``...)
+            **fields: Datos adicionales para el evento (items, offset...)
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, time.perf_counter() - started, **fields)
+
+    def add_span(self, name: str, seconds: float, **fields):
+        """
+        Registra una etapa ya medida
+
+        Args:
+            name: Nombre de la etapa
+            seconds: Duración en segundos
+            **fields: Datos adicionales para el evento
+        """
+        record = {
+            "type": "span",
+            "ts": round(time.time(), 3),
+            "name": name,
+            "duration_ms": round(seconds * 1000, 3),
+            **fields,
+        }
+        with self._lock:
+            stage = self._stages.setdefault(name, [0, 0.0])
+            stage[0] += 1
+            stage[1] += seconds
+            self._write(record)
+
+    def summary(self) -> Dict:
+        """
+        Resumen de lo registrado desde el último ``reset()``
+
+        Returns:
+            Diccionario con requests, retries, errors, bytes, status (conteo
+            por código), latency_ms (avg/p50/p95/max), headers_ms_avg y
+            stages (count y total_ms por etapa)
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            summary = {
+                "requests": len(latencies),
+                "retries": self._retries,
+                "errors": self._errors,
+                "bytes": self._bytes,
+                "status": dict(self._statuses),
+                "latency_ms": None,
+                "headers_ms_avg": None,
+                "stages": {
+                    name: {"count": count, "total_ms": round(seconds * 1000, 1)}
+                    for name, (count, seconds) in self._stages.items()
+                },
+            }
+            if latencies:
+                summary["latency_ms"] = {
+                    "avg": round(sum(latencies) / len(latencies) * 1000, 1),
+                    "p50": round(_percentile(latencies, 0.5) * 1000, 1),
+                    "p95": round(_percentile(latencies, 0.95) * 1000, 1),
+                    "max": round(latencies[-1] * 1000, 1),
+                }
+            if self._headers_count:
+                summary["headers_ms_avg"] = round(
+                    self._headers_time / self._headers_count * 1000, 1
+                )
+        return summary
+
+    def close(self):
+        """Cierra el archivo de eventos, si está abierto"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _write(self, record: Dict):
+        """Agrega un evento al archivo (se llama con el candado tomado)"""
+        if self.path is None:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Con búfer de línea cada evento queda escrito aunque el proceso muera
+            self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class NullMetrics:
+    """
+    Métricas desactivadas: mismas operaciones que ``Metrics``, sin efecto
+
+    Es el valor por defecto de los clientes; ``span()`` devuelve siempre el
+    mismo contexto vacío, así que medir cuesta una llamada por bloque.
+    """
+
+    enabled = False
+    path = None
+
+    def reset(self):
+        pass
+
+    def record_request(self, *args, **kwargs):
+        pass
+
+    def span(self, name: str, **fields):
+        return _NULL_SPAN
+
+    def add_span(self, *args, **kwargs):
+        pass
+
+    def summary(self) -> Dict:
+        return {}
+
+    def close(self):
+        pass
+
+
+_NULL_SPAN = nullcontext()
+
+NULL_METRICS = NullMetrics()
+
+
+def format_summary(summary: Dict) -> str:
+    """
+    Resumen de métricas en una línea para la interfaz
+
+    Args:
+        summary: Resultado de ``Metrics.summary()``
+
+    Returns:
+        Texto con peticiones, volumen, latencias y tiempo por etapa
+    """
+    if not summary or not (summary["requests"] or summary["stages"]):
+        return "Sin datos"
+
+    parts = []
+    if summary["requests"]:
+        parts.append(
+            f"{summary['requests']} peticiones ({summary['retries']} reintentos, "
+            f"{summary['errors']} errores), {summary['bytes'] / 2**20:.1f} MB"
+        )
+        latency = summary["latency_ms"]
+        parts.append(
+            f"latencia p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms"
+        )
+
+    stages = summary["stages"]
+    names = [name for name in STAGE_ORDER if name in stages]
+    names += sorted(name for name in stages if name not in STAGE_ORDER)
+    if names:
+        parts.append(
+            ", ".join(
+                f"{name} {stages[name]['total_ms'] / 1000:.2f} s" for name in names
+            )
+        )
+    return "; ".join(parts)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Percentil por el método del rango más cercano (lista ya ordenada)"""
+    index = max(0, math.ceil(fraction * len(values)) - 1)
+    return values[index]
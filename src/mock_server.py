@@ -0,0 +1,393 @@
+"""
+Servidor local que imita la API de inventario de HighLevel.
+
+Permite probar y medir el cliente sin red ni credenciales reales: los
+productos se generan al vuelo a partir de su índice (millones de items sin
+ocupar memoria) y se puede inyectar latencia, respuestas 429 y límites de
+página. Solo responde en una de las tres formas de endpoint conocidas, así
+que también ejercita la selección de endpoint y los 401/404 del cliente.
+
+Uso:
+    python -m src.mock_server --products 1000000 --latency 0.05 --port 8765
+    HIGHLEVEL_BASE_URL=http://127.0.0.1:8765 python -m src fetch
+
+Desde código (por ejemplo, en benchmarks)::
+
+    with MockHighLevelServer(products=10_000) as server:
+        api = HighLevelAPI(base_url=server.url, access_token="x", location_id="y")
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+try:
+    from .highlevel_api import INVENTORY_ENDPOINTS, MAX_PAGE_SIZE, PARAM_STYLES
+except ImportError:
+    from highlevel_api import INVENTORY_ENDPOINTS, MAX_PAGE_SIZE, PARAM_STYLES
+
+# Formas de respuesta, en el mismo orden que INVENTORY_ENDPOINTS:
+#   inventory: {"inventory": [...], "total": [{"total": N}]}
+#   products:  {"products": [...], "total": N}
+#   list:      [...] (sin total)
+SHAPES = ("inventory", "products", "list")
+
+
+def mock_product(index: int, seed: int = 0) -> Dict:
+    """
+    Producto sintético con la forma que devuelve la API de inventario
+
+    Args:
+        index: Posición del producto en el catálogo
+        seed: Cambia las cantidades, para simular un catálogo modificado
+
+    Returns:
+        Diccionario con los campos que usa ``format_inventory_data``
+    """
+    return {
+        "_id": f"item{index:08d}",
+        "name": f"Producto {index}",
+        "productName": f"Variante {index % 7}",
+        "availableQuantity": (index + seed) % 50,
+        "image": f"https://images.example.com/{index}.jpg",
+    }
+
+
+class MockHighLevelServer:
+    """
+    Servidor HTTP simulado, configurable en tiempo de ejecución
+
+    Los atributos pueden cambiarse con el servidor en marcha (por ejemplo,
+    ``seed`` para que todas las páginas cambien su ETag). Cada petición
+    cuenta en ``stats()``, lo que permite comprobar cuántas peticiones,
+    reintentos o 304 generó una operación.
+    """
+
+    def __init__(
+        self,
+        products: int = 1000,
+        shape: str = "inventory",
+        param_style: Optional[str] = None,
+        max_page_size: int = MAX_PAGE_SIZE,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        retry_after: float = 1.0,
+        access_token: Optional[str] = None,
+        location_id: Optional[str] = None,
+        report_total: bool = True,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            products: Número de productos del catálogo
+            shape: Forma de endpoint que responde (una de ``SHAPES``); las
+                demás rutas devuelven 404
+            param_style: ``locationId`` o ``altId``; None acepta ambos
+            max_page_size: Máximo de items por página (recorta ``limit``)
+            latency: Segundos de espera antes de cada respuesta
+            throttle_every: Responde 429 a una de cada N peticiones (0 = nunca)
+            retry_after: Valor del header ``Retry-After`` de los 429
+            access_token: Token exigido (401 si no coincide); None acepta cualquiera
+            location_id: Location exigida (404 si no coincide); None acepta cualquiera
+            report_total: Incluir el total en la respuesta (no aplica a ``list``)
+            seed: Semilla de las cantidades y de los ETag
+            host: Interfaz donde escuchar
+            port: Puerto (0 = uno libre)
+        """
+        if shape not in SHAPES:
+            raise ValueError(f"shape debe ser uno de {', '.join(SHAPES)}")
+        if param_style is not None and param_style not in PARAM_STYLES:
+            raise ValueError(f"param_style debe ser uno de {', '.join(PARAM_STYLES)}")
+        if max_page_size <= 0:
+            raise ValueError("max_page_size debe ser mayor que 0")
+
+        self.products = products
+        self.shape = shape
+        self.param_style = param_style
+        self.max_page_size = max_page_size
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.access_token = access_token
+        self.location_id = location_id
+        self.report_total = report_total
+        self.seed = seed
+
+        self._stats: Dict[str, int] = {}
+        self._request_count = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self._httpd = ThreadingHTTPServer((host, port), _MockHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+
+    @property
+    def url(self) -> str:
+        """URL base para ``HighLevelAPI(base_url=...)``"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockHighLevelServer":
+        """Atiende peticiones en un hilo de fondo"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Atiende peticiones en el hilo actual (hasta Ctrl+C)"""
+        self._httpd.serve_forever()
+
+    def stop(self):
+        """Detiene el servidor y libera el puerto"""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockHighLevelServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Contadores de peticiones
+
+        Returns:
+            Diccionario con ``requests`` y el número de respuestas por
+            código de estado (``"200"``, ``"304"``, ``"429"``...)
+        """
+        with self._lock:
+            return {"requests": self._request_count, **self._stats}
+
+    def reset_stats(self):
+        """Pone los contadores a cero"""
+        with self._lock:
+            self._request_count = 0
+            self._stats = {}
+
+    def _next_request(self) -> int:
+        """Cuenta una petición y devuelve su número (empieza en 1)"""
+        with self._lock:
+            self._request_count += 1
+            return self._request_count
+
+    def _record(self, status: int):
+        """Cuenta una respuesta por su código de estado"""
+        with self._lock:
+            key = str(status)
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+    def _route(self) -> str:
+        """Ruta del endpoint que responde, según ``shape``"""
+        endpoint = INVENTORY_ENDPOINTS[SHAPES.index(self.shape)]
+        return endpoint.format(location_id=self.location_id or "{location_id}")
+
+    def _matches_route(self, path: str) -> bool:
+        """Indica si la ruta pedida corresponde al endpoint activo"""
+        expected = self._route().split("/")
+        parts = path.rstrip("/").split("/")
+        if len(parts) != len(expected):
+            return False
+        return all(
+            want == "{location_id}" or want == got
+            for want, got in zip(expected, parts)
+        )
+
+    def _requested_location(self, path: str, query: Dict[str, List[str]]):
+        """Location indicada en la ruta o en los parámetros aceptados"""
+        if self.shape == "list":
+            return path.rstrip("/").split("/")[2]
+        if self.param_style in (None, "locationId") and "locationId" in query:
+            return query["locationId"][0]
+        if (
+            self.param_style in (None, "altId")
+            and "altId" in query
+            and query.get("altType", [""])[0] == "location"
+        ):
+            return query["altId"][0]
+        return None
+
+    def _page(self, offset: int, limit: int) -> Union[Dict, List]:
+        """Cuerpo de una página con la forma configurada"""
+        end = min(offset + limit, self.products)
+        items = [mock_product(index, self.seed) for index in range(offset, end)]
+        if self.shape == "list":
+            return items
+        body = {self.shape: items}
+        if self.report_total:
+            if self.shape == "inventory":
+                body["total"] = [{"total": self.products}]
+            else:
+                body["total"] = self.products
+        return body
+
+    def _etag(self, offset: int, limit: int) -> str:
+        """
+        ETag de una página: cambia con el catálogo, la semilla o la forma
+
+        Depende de los items devueltos y no del ``limit`` pedido, como un
+        ETag calculado sobre el cuerpo: la última página pedida con su tamaño
+        real o con el completo tiene el mismo ETag.
+        """
+        end = min(offset + limit, self.products)
+        key = f"{self.shape}|{self.products}|{self.seed}|{offset}|{end}"
+        return '"' + hashlib.sha1(key.encode()).hexdigest()[:16] + '"'
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """Handler del servidor simulado; la configuración está en ``server.mock``"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        mock: MockHighLevelServer = self.server.mock
+        number = mock._next_request()
+        if mock.latency > 0:
+            time.sleep(mock.latency)
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if mock.throttle_every and number % mock.throttle_every == 0:
+            self._send_json(
+                429,
+                {"message": "Too many requests"},
+                {"Retry-After": f"{mock.retry_after:g}"},
+            )
+            return
+
+        token = self.headers.get("Authorization", "")
+        if mock.access_token is not None and token != f"Bearer {mock.access_token}":
+            self._send_json(401, {"message": "Invalid JWT"})
+            return
+
+        if not mock._matches_route(url.path):
+            self._send_json(404, {"message": "Not found"})
+            return
+
+        location = mock._requested_location(url.path, query)
+        if location is None or (
+            mock.location_id is not None and location != mock.location_id
+        ):
+            self._send_json(404, {"message": "Location not found"})
+            return
+
+        try:
+            offset = max(int(query.get("offset", ["0"])[0]), 0)
+            limit = int(query.get("limit", [str(mock.max_page_size)])[0])
+        except ValueError:
+            self._send_json(422, {"message": "limit/offset inválidos"})
+            return
+        limit = min(max(limit, 1), mock.max_page_size)
+
+        etag = mock._etag(offset, limit)
+        if self.headers.get("If-None-Match") == etag:
+            self._send_json(304, None, {"ETag": etag})
+            return
+        self._send_json(200, mock._page(offset, limit), {"ETag": etag})
+
+    def _send_json(
+        self,
+        status: int,
+        payload: Union[Dict, List, None],
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Envía una respuesta JSON (sin cuerpo si ``payload`` es None)"""
+        self.server.mock._record(status)
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv: Optional[List[str]] = None):
+    """Inicia el servidor simulado desde la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.mock_server",
+        description="Servidor local que imita la API de inventario de HighLevel",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz donde escuchar")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto (0 = libre)")
+    parser.add_argument(
+        "--products", type=int, default=1000, help="Productos del catálogo"
+    )
+    parser.add_argument(
+        "--shape", choices=SHAPES, default="inventory", help="Forma de endpoint"
+    )
+    parser.add_argument(
+        "--param-style", choices=PARAM_STYLES, help="Estilo de parámetros aceptado"
+    )
+    parser.add_argument(
+        "--max-page-size",
+        type=int,
+        default=MAX_PAGE_SIZE,
+        help="Máximo de items por página",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Segundos de espera por respuesta"
+    )
+    parser.add_argument(
+        "--throttle-every",
+        type=int,
+        default=0,
+        help="Responder 429 a una de cada N peticiones",
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After de los 429"
+    )
+    parser.add_argument("--token", help="Access token exigido (401 si no coincide)")
+    parser.add_argument("--location-id", help="Location exigida (404 si no coincide)")
+    parser.add_argument(
+        "--no-total", action="store_true", help="No incluir el total en las respuestas"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de los datos")
+    args = parser.parse_args(argv)
+
+    server = MockHighLevelServer(
+        products=args.products,
+        shape=args.shape,
+        param_style=args.param_style,
+        max_page_size=args.max_page_size,
+        latency=args.latency,
+        throttle_every=args.throttle_every,
+        retry_after=args.retry_after,
+        access_token=args.token,
+        location_id=args.location_id,
+        report_total=not args.no_total,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Servidor simulado en {server.url} ({args.products} productos)")
+    print(f"Usa HIGHLEVEL_BASE_URL={server.url}; Ctrl+C para detener")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Servidor local que recibe el callback OAuth2 de HighLevel.
+
+Vive en un módulo aparte para que ``http.server`` solo se importe al
+iniciar la autorización y no al abrir la aplicación.
+"""
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+try:
+    from .cancellation import CANCEL_POLL_INTERVAL, CancellationToken
+except ImportError:
+    from cancellation import CANCEL_POLL_INTERVAL, CancellationToken
+
+# Tiempo máximo de espera de la autorización en el navegador
+AUTH_TIMEOUT_SECONDS = 300
+
+
+class TokenCallbackHandler(BaseHTTPRequestHandler):
+    """Handler para el callback OAuth2."""
+
+    def __init__(self, token_callback, *args, **kwargs):
+        self.token_callback = token_callback
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        """Maneja la petición GET del callback."""
+        if self.path.startswith("/callback"):
+            parsed_url = urlparse(self.path)
+            query_params = parse_qs(parsed_url.query)
+
+            if "code" in query_params:
+                code = query_params["code"][0]
+                self.token_callback(code)
+
+                # Respuesta de éxito
+                self.send_response(200)
+                self.send_header("Content-type", "text/html")
+                self.end_headers()
+
+                html = """
+                <html>
+                <body>
+                    <h2>✅ ¡Autorización exitosa!</h2>
+                    <p>Ya puedes cerrar esta ventana y volver a la aplicación.</p>
+                    <script>setTimeout(function(){ window.close(); }, 3000);</script>
+                </body>
+                </html>
+                """
+                self.wfile.write(html.encode())
+            else:
+                self.send_error(400, "No se recibió código de autorización")
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        """Suprimir logs del servidor."""
+        pass
+
+
+def create_callback_server(token_callback, host="localhost", port=8080) -> HTTPServer:
+    """
+    Crea el servidor que espera el código de autorización
+
+    Args:
+        token_callback: Función llamada con el código recibido
+        host: Host donde escuchar
+        port: Puerto donde escuchar (debe coincidir con el redirect_uri)
+
+    Returns:
+        Servidor listo para ``handle_request()``
+    """
+
+    def handler(*args, **kwargs):
+        return TokenCallbackHandler(token_callback, *args, **kwargs)
+
+    return HTTPServer((host, port), handler)
+
+
+def wait_for_code(
+    server: HTTPServer,
+    has_code: Callable[[], bool],
+    timeout: float = AUTH_TIMEOUT_SECONDS,
+    cancel_token: Optional[CancellationToken] = None,
+) -> bool:
+    """
+    Atiende peticiones hasta recibir el código, vencer el plazo o cancelar
+
+    Cada ``handle_request()`` espera como máximo ``CANCEL_POLL_INTERVAL``
+    segundos, de modo que la cancelación se atiende enseguida; las
+    peticiones que no traen el código (por ejemplo, ``/favicon.ico``) ya no
+    terminan la espera.
+
+    Args:
+        server: Servidor creado con ``create_callback_server``
+        has_code: Función que indica si ya se recibió el código
+        timeout: Segundos máximos de espera
+        cancel_token: Token para cancelar la espera
+
+    Returns:
+        True si se recibió el código, False si venció el plazo
+
+    Raises:
+        OperationCancelled: Se canceló la espera
+    """
+    cancel_token = cancel_token or CancellationToken()
+    deadline = time.monotonic() + timeout
+    server.timeout = CANCEL_POLL_INTERVAL
+    while not has_code():
+        cancel_token.raise_if_cancelled()
+        if time.monotonic() >= deadline:
+            return False
+        server.handle_request()
+    return True
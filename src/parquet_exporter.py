@@ -0,0 +1,200 @@
+"""
+Exportador Parquet (pyarrow) para el inventario formateado.
+"""
+import os
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Dependencia opcional: uv sync --extra parquet
+    pa = None
+    pq = None
+
+try:
+    from .cancellation import CancellationToken
+    from .csv_exporter import CANCEL_CHECK_ROWS, REPORT_COLUMNS, default_output_path
+except ImportError:
+    from cancellation import CancellationToken
+    from csv_exporter import CANCEL_CHECK_ROWS, REPORT_COLUMNS, default_output_path
+
+# Filas acumuladas antes de escribir un row group; acota la memoria usada
+DEFAULT_ROW_GROUP_SIZE = 65536
+
+
+def _to_float(value) -> Optional[float]:
+    """Convierte la cantidad a número (admite fracciones); None si no lo es"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ParquetExporter:
+    """
+    Exporta el inventario a Parquet con las mismas cuatro columnas del CSV
+
+    Las filas se acumulan por columnas hasta ``row_group_size`` y se escriben
+    como un row group, por lo que la memoria queda acotada por ese tamaño y
+    no por el total del catálogo.
+    """
+
+    def __init__(
+        self,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        """
+        Args:
+            row_group_size: Filas por row group
+            cancel_token: Token para cancelar la escritura
+
+        Raises:
+            ImportError: pyarrow no está instalado
+        """
+        if pa is None:
+            raise ImportError(
+                "pyarrow no está instalado. Instálalo con: uv sync --extra parquet"
+            )
+        self.row_group_size = max(1, row_group_size)
+        self.cancel_token = cancel_token or CancellationToken()
+        self.schema = pa.schema(
+            [
+                (REPORT_COLUMNS[0], pa.string()),
+                (REPORT_COLUMNS[1], pa.string()),
+                # La API admite cantidades fraccionarias (por ejemplo, 2.5)
+                (REPORT_COLUMNS[2], pa.float64()),
+                (REPORT_COLUMNS[3], pa.string()),
+            ]
+        )
+        self.output_path = None
+        self._writer = None
+        self._columns = None
+        self._buffered = 0
+        self._rows_written = 0
+
+    def create_report(
+        self,
+        inventory_data: List[Dict],
+        output_path: Optional[str] = None,
+        progress_callback=None,
+    ) -> str:
+        """
+        Escribe el inventario completo en un archivo Parquet
+
+        El archivo se completa en ``add_summary()``, igual que en los
+        generadores de Excel.
+
+        Args:
+            inventory_data: Lista de items formateados
+            output_path: Ruta donde guardar el archivo (opcional)
+            progress_callback: Función callback para reportar progreso
+
+        Returns:
+            Ruta del archivo generado
+        """
+        output_path = self.start_report(output_path, progress_callback)
+        self.append_rows(inventory_data, progress_callback)
+        return output_path
+
+    def start_report(
+        self,
+        output_path: Optional[str] = None,
+        progress_callback=None,
+        expected_rows: Optional[int] = None,
+    ) -> str:
+        """
+        Abre el escritor Parquet
+
+        Args:
+            output_path: Ruta donde guardar el archivo (opcional)
+            progress_callback: Función callback para reportar progreso
+            expected_rows: Ignorado; se acepta por compatibilidad
+
+        Returns:
+            Ruta del archivo que se generará
+        """
+        if progress_callback:
+            progress_callback("Creando archivo Parquet...")
+
+        self.output_path = output_path or default_output_path(".parquet")
+        self._writer = pq.ParquetWriter(self.output_path, self.schema)
+        self._columns = {column: [] for column in REPORT_COLUMNS}
+        self._buffered = 0
+        self._rows_written = 0
+        return self.output_path
+
+    def append_rows(self, items: List[Dict], progress_callback=None):
+        """
+        Agrega un bloque de filas; se escribe al completar un row group
+
+        Args:
+            items: Items formateados (por ejemplo, una página de la API)
+            progress_callback: Función callback para reportar progreso
+
+        Raises:
+            OperationCancelled: Se canceló la operación
+        """
+        names, products, quantities, images = self._columns.values()
+        for start in range(0, len(items), CANCEL_CHECK_ROWS):
+            self.cancel_token.raise_if_cancelled()
+            block = items[start : start + CANCEL_CHECK_ROWS]
+            for item in block:
+                names.append(item.get(REPORT_COLUMNS[0], ""))
+                products.append(item.get(REPORT_COLUMNS[1], ""))
+                quantities.append(_to_float(item.get(REPORT_COLUMNS[2], 0)))
+                images.append(item.get(REPORT_COLUMNS[3], ""))
+
+            self._buffered += len(block)
+            self._rows_written += len(block)
+            # Con listas grandes (create_report) se escribe por row group
+            if self._buffered >= self.row_group_size:
+                self._flush()
+
+        if progress_callback:
+            progress_callback(
+                f"{self._rows_written} filas escritas", self._rows_written
+            )
+
+    def finish_report(self, progress_callback=None) -> str:
+        """
+        Escribe las filas pendientes y cierra el archivo
+
+        Args:
+            progress_callback: Función callback para reportar progreso
+
+        Returns:
+            Ruta del archivo generado
+        """
+        self.add_summary()
+        return self.output_path
+
+    def add_summary(self, inventory_data: Optional[List[Dict]] = None):
+        """
+        Escribe las filas pendientes y cierra el archivo (sin resumen)
+
+        Args:
+            inventory_data: Ignorado; se acepta por compatibilidad
+        """
+        if self._writer:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+    def discard_report(self):
+        """Cierra y borra un archivo a medias (por ejemplo, al cancelar)"""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self.output_path and os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def _flush(self):
+        """Escribe las filas acumuladas como un row group"""
+        if not self._buffered:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        for values in self._columns.values():
+            values.clear()
+        self._buffered = 0
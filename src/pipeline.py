@@ -0,0 +1,247 @@
+"""
+Pipeline en streaming: páginas de la API directo al generador de reportes.
+"""
+import queue
+import threading
+from typing import Dict, Iterable, Iterator, Optional
+
+try:
+    from .cancellation import CancellationToken
+    from .highlevel_api import MAX_PAGE_SIZE, HighLevelAPI
+    from .report_backends import FEATURE_STREAMING, backend_of, create_generator
+except ImportError:
+    from cancellation import CancellationToken
+    from highlevel_api import MAX_PAGE_SIZE, HighLevelAPI
+    from report_backends import FEATURE_STREAMING, backend_of, create_generator
+
+# Páginas descargadas por adelantado mientras se escribe la actual
+DEFAULT_PREFETCH_PAGES = 2
+
+_END = object()
+
+
+def prefetch(iterable: Iterable, depth: int = DEFAULT_PREFETCH_PAGES) -> Iterator:
+    """
+    Consume un iterable en un hilo aparte, manteniendo hasta ``depth``
+    elementos listos
+
+    Así la descarga de la siguiente página se solapa con el procesamiento
+    de la actual sin acumular más de ``depth`` páginas en memoria.
+
+    Args:
+        iterable: Fuente de elementos (por ejemplo, ``iter_inventory()``)
+        depth: Máximo de elementos en espera
+
+    Yields:
+        Los elementos de ``iterable`` en el mismo orden
+
+    Raises:
+        Exception: Cualquier error de la fuente se relanza en el consumidor
+    """
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for element in iterable:
+                while not stop.is_set():
+                    try:
+                        buffer.put((element, None), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    break
+        except Exception as e:
+            buffer.put((_END, e))
+            return
+        finally:
+            close = getattr(iterable, "close", None)
+            if stop.is_set() and close:
+                close()
+        buffer.put((_END, None))
+
+    producer = threading.Thread(target=produce, name="ghl-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            element, error = buffer.get()
+            if element is _END:
+                if error is not None:
+                    raise error
+                return
+            yield element
+    finally:
+        stop.set()
+        # Liberar al productor si está esperando espacio en la cola
+        while producer.is_alive():
+            try:
+                buffer.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+def stream_inventory_to_excel(
+    api_client: HighLevelAPI,
+    output_path: Optional[str] = None,
+    generator=None,
+    page_size: int = MAX_PAGE_SIZE,
+    concurrency: int = 1,
+    progress_callback=None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> Dict[str, any]:
+    """
+    Descarga el catálogo completo y lo escribe en el reporte página a página
+
+    Cada página se formatea y se escribe en cuanto llega, mientras las
+    siguientes se siguen descargando; del lado de Python solo se mantienen
+    en memoria las páginas en vuelo. Si algo falla (o se cancela) el
+    reporte a medias se descarta. Los tiempos de descarga, formato y
+    escritura quedan en ``api_client.metrics``.
+
+    Args:
+        api_client: Cliente de la API
+        output_path: Ruta donde guardar el archivo (opcional)
+        generator: Generador del reporte (por defecto el que elija
+            ``create_generator`` en modo automático). Si su backend no
+            soporta streaming, las páginas se acumulan ya formateadas y el
+            reporte se escribe al final con ``create_report``
+        page_size: Tamaño de cada página (máximo 300)
+        concurrency: Número de páginas solicitadas en paralelo
+        progress_callback: Función callback para reportar progreso
+            (mensaje, productos escritos, total reportado por la API)
+        cancel_token: Token para cancelar la descarga y la escritura
+
+    Returns:
+        Diccionario con path, items_count y streamed (False si el reporte
+        se escribió al final)
+
+    Raises:
+        requests.RequestException: Error en la petición HTTP
+        OperationCancelled: Se canceló la operación
+    """
+    cancel_token = cancel_token or CancellationToken()
+    generator = generator or create_generator(
+        streaming=True, cancel_token=cancel_token
+    )
+    backend = backend_of(generator)
+    if backend is not None and FEATURE_STREAMING not in backend.features:
+        return _write_at_end(
+            api_client,
+            generator,
+            output_path,
+            page_size,
+            concurrency,
+            progress_callback,
+            cancel_token,
+        )
+
+    output_path = generator.start_report(output_path, progress_callback)
+    try:
+        items_count = _write_pages(
+            api_client,
+            generator,
+            page_size,
+            concurrency,
+            progress_callback,
+            cancel_token,
+        )
+        cancel_token.raise_if_cancelled()
+        with api_client.metrics.span("write"):
+            generator.finish_report(progress_callback)
+    except BaseException:
+        generator.discard_report()
+        raise
+    return {"path": output_path, "items_count": items_count, "streamed": True}
+
+
+def _write_at_end(
+    api_client: HighLevelAPI,
+    generator,
+    output_path: Optional[str],
+    page_size: int,
+    concurrency: int,
+    progress_callback,
+    cancel_token: CancellationToken,
+) -> Dict[str, any]:
+    """Acumula las filas formateadas y escribe el reporte completo al final"""
+    reported = {"total": None}
+
+    def on_page(fetched, total, page_number):
+        reported["total"] = total
+
+    rows = []
+    pages = api_client.iter_inventory(
+        page_size=page_size,
+        concurrency=concurrency,
+        progress_callback=on_page,
+        cancel_token=cancel_token,
+        compact=True,
+    )
+    for page_number, page in enumerate(prefetch(pages), 1):
+        cancel_token.raise_if_cancelled()
+        rows.extend(api_client.format_inventory_data(page))
+
+        if progress_callback:
+            total = reported["total"]
+            total_text = f" de {total}" if total is not None else ""
+            progress_callback(
+                f"Página {page_number}: {len(rows)}{total_text} productos obtenidos",
+                len(rows),
+                total,
+            )
+
+    try:
+        with api_client.metrics.span("write", rows=len(rows)):
+            output_path = generator.create_report(
+                rows, output_path, progress_callback
+            )
+            generator.add_summary(rows)
+    except BaseException:
+        generator.discard_report()
+        raise
+    return {"path": output_path, "items_count": len(rows), "streamed": False}
+
+
+def _write_pages(
+    api_client: HighLevelAPI,
+    generator,
+    page_size: int,
+    concurrency: int,
+    progress_callback,
+    cancel_token: CancellationToken,
+) -> int:
+    """Escribe las páginas a medida que llegan; devuelve el número de items"""
+    # El total lo reporta la API en la primera página (hilo de descarga)
+    reported = {"total": None}
+
+    def on_page(fetched, total, page_number):
+        reported["total"] = total
+
+    items_count = 0
+    pages = api_client.iter_inventory(
+        page_size=page_size,
+        concurrency=concurrency,
+        progress_callback=on_page,
+        cancel_token=cancel_token,
+        # El reporte solo usa los campos de Product y las páginas crudas no se
+        # guardan: se decodifican compactas si msgspec está instalado
+        compact=True,
+    )
+    for page_number, page in enumerate(prefetch(pages), 1):
+        cancel_token.raise_if_cancelled()
+        rows = api_client.format_inventory_data(page)
+        with api_client.metrics.span("write", rows=len(rows)):
+            generator.append_rows(rows)
+        items_count += len(page)
+
+        if progress_callback:
+            total = reported["total"]
+            total_text = f" de {total}" if total is not None else ""
+            progress_callback(
+                f"Página {page_number}: {items_count}{total_text} productos escritos",
+                items_count,
+                total,
+            )
+
+    return items_count
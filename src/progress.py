@@ -0,0 +1,80 @@
+"""
+Canal de progreso con frecuencia limitada para los hilos de trabajo.
+"""
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+# Máximo de actualizaciones numéricas por segundo que llegan a la interfaz
+DEFAULT_UPDATES_PER_SECOND = 10.0
+
+
+class ProgressThrottle:
+    """
+    Agrupa las actualizaciones de progreso y las entrega a ritmo fijo
+
+    Se usa como ``progress_callback``: ``throttle(mensaje, actual, total)``.
+    Las actualizaciones con valor numérico se fusionan (solo se entrega la
+    más reciente) y salen como máximo ``updates_per_second`` veces por
+    segundo. Los mensajes sin valor numérico marcan el cambio de fase, así
+    que se entregan siempre, después de la actualización pendiente para
+    conservar el orden. ``flush()`` entrega lo pendiente al terminar.
+
+    Es seguro entre hilos: el destino se llama siempre fuera del candado.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[str, Optional[int], Optional[int]], None],
+        updates_per_second: float = DEFAULT_UPDATES_PER_SECOND,
+    ):
+        """
+        Args:
+            sink: Función que recibe (mensaje, actual, total); por ejemplo,
+                la que emite las señales de Qt del worker
+            updates_per_second: Frecuencia máxima de actualizaciones numéricas
+        """
+        if updates_per_second <= 0:
+            raise ValueError("updates_per_second debe ser mayor que 0")
+        self.sink = sink
+        self.interval = 1.0 / updates_per_second
+        self._pending: Optional[Tuple[str, int, Optional[int]]] = None
+        self._sent_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def __call__(
+        self,
+        message: str,
+        current: Optional[int] = None,
+        total: Optional[int] = None,
+    ):
+        """
+        Reporta progreso
+
+        Args:
+            message: Texto para el log y la barra de estado
+            current: Unidades completadas (None = mensaje de fase)
+            total: Unidades totales, si se conocen
+        """
+        if current is None:
+            self.flush()
+            self.sink(message, None, None)
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._sent_at < self.interval:
+                self._pending = (message, current, total)
+                return
+            self._pending = None
+            self._sent_at = now
+        self.sink(message, current, total)
+
+    def flush(self):
+        """Entrega la última actualización numérica pendiente, si la hay"""
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is not None:
+                self._sent_at = time.monotonic()
+        if pending is not None:
+            self.sink(*pending)
@@ -0,0 +1,193 @@
+"""
+Control de ritmo y reintentos para las peticiones a la API de HighLevel.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping, Optional
+
+# HighLevel permite ráfagas de 100 peticiones cada 10 segundos por location
+DEFAULT_RATE_PER_SECOND = 10.0
+DEFAULT_BURST = 10
+
+# Códigos de estado que indican un fallo transitorio
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Limitador de ritmo tipo token bucket, seguro entre hilos
+
+    Todas las peticiones de un cliente (incluidas las concurrentes) consumen
+    tokens del mismo bucket, de modo que el conjunto nunca supera el ritmo
+    configurado. Un 429 puede pausar el bucket completo con ``pause()``.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE_PER_SECOND,
+        capacity: Optional[float] = DEFAULT_BURST,
+    ):
+        if rate <= 0:
+            raise ValueError("rate debe ser mayor que 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Reserva tokens y calcula cuánto hay que esperar para usarlos
+
+        Args:
+            tokens: Número de tokens a consumir
+
+        Returns:
+            Segundos de espera antes de poder enviar la petición
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+            # El saldo puede quedar negativo: cada llamada hace fila detrás
+            # de las reservas anteriores
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(
+        self, tokens: float = 1, sleep: Optional[Callable[[float], None]] = None
+    ):
+        """
+        Bloquea hasta que haya tokens disponibles
+
+        Args:
+            tokens: Número de tokens a consumir
+            sleep: Función de espera (por defecto ``time.sleep``); permite
+                usar una espera interrumpible
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            (sleep or time.sleep)(wait)
+
+    def pause(self, seconds: float):
+        """
+        Detiene todas las peticiones durante el tiempo indicado
+
+        Args:
+            seconds: Segundos que debe esperar cualquier petición nueva
+        """
+        with self._lock:
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + max(seconds, 0.0)
+            )
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Ajusta el ritmo según los headers de límite que envía HighLevel
+
+        Usa ``X-RateLimit-Max`` / ``X-RateLimit-Interval-Milliseconds`` para
+        el ritmo sostenible y pausa si ``X-RateLimit-Remaining`` llega a 0.
+
+        Args:
+            headers: Headers de la respuesta
+        """
+        limit = _parse_float(headers.get("X-RateLimit-Max"))
+        interval_ms = _parse_float(headers.get("X-RateLimit-Interval-Milliseconds"))
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+
+        if limit and interval_ms:
+            with self._lock:
+                self.rate = limit / (interval_ms / 1000.0)
+        if remaining is not None and remaining <= 0:
+            self.pause((interval_ms or 1000.0) / 1000.0)
+
+
+class RetryPolicy:
+    """
+    Política de reintentos con backoff exponencial y jitter
+
+    Respeta ``Retry-After`` cuando el servidor lo envía; de lo contrario
+    espera un tiempo aleatorio entre 0 y ``backoff_base * 2**intento``
+    (limitado a ``backoff_max``) para no sincronizar los reintentos.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_statuses=RETRY_STATUSES,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, status_code: int, attempt: int) -> bool:
+        """
+        Indica si una respuesta debe reintentarse
+
+        Args:
+            status_code: Código de estado HTTP recibido
+            attempt: Número de reintentos ya realizados
+
+        Returns:
+            True si quedan reintentos y el estado es transitorio
+        """
+        return attempt < self.max_retries and status_code in self.retry_statuses
+
+    def compute_delay(
+        self, attempt: int, headers: Optional[Mapping[str, str]] = None
+    ) -> float:
+        """
+        Calcula la espera antes del siguiente intento
+
+        Args:
+            attempt: Número de reintentos ya realizados (empieza en 0)
+            headers: Headers de la respuesta fallida, si existen
+
+        Returns:
+            Segundos a esperar
+        """
+        if headers:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interpreta el header ``Retry-After``
+
+    Args:
+        value: Segundos o fecha HTTP
+
+    Returns:
+        Segundos a esperar o None si el valor no es válido
+    """
+    if not value:
+        return None
+    seconds = _parse_float(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    """Convierte un valor de header a float, o None si no es numérico"""
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,402 @@
+"""
+Registro de backends para generar reportes de Excel.
+"""
+import importlib
+import importlib.util
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+try:
+    from .cancellation import CancellationToken
+except ImportError:
+    from cancellation import CancellationToken
+
+# Nombre especial: elegir el backend según tamaño y características
+AUTO_BACKEND = "auto"
+
+# Características opcionales que un backend puede soportar
+FEATURE_STREAMING = "streaming"  # start_report / append_rows / finish_report
+FEATURE_CONSTANT_MEMORY = "constant_memory"
+FEATURE_IMAGE_NOTES = "image_notes"
+
+# El modo automático solo elige entre backends de este formato
+AUTO_FILE_FORMAT = "xlsx"
+
+# Opciones que aceptan todos los generadores
+COMMON_OPTIONS = frozenset({"cancel_token"})
+
+# A partir de este número de filas (o si se desconoce) el modo automático
+# activa la memoria constante en los backends que la soportan
+CONSTANT_MEMORY_ROWS = 50000
+
+
+class ReportBackend:
+    """
+    Describe un generador de reportes registrado
+
+    Todos los generadores comparten la misma interfaz: ``create_report(datos,
+    ruta, progress_callback)`` seguido de ``add_summary(datos)``, que agrega
+    el resumen (si el formato lo admite) y escribe el archivo; sin
+    ``add_summary()`` el archivo puede quedar sin escribir. Los que soportan
+    ``streaming`` además exponen ``start_report``, ``append_rows`` y
+    ``finish_report``.
+    ``progress_callback`` recibe ``(mensaje, actual=None, total=None)``: los
+    avances por fila incluyen los contadores y los cambios de fase no.
+    ``discard_report()`` abandona un reporte a medias y borra el archivo
+    parcial, si ya existe.
+
+    El módulo del generador se importa solo al crearlo, de modo que una
+    dependencia ausente no impide usar los demás backends.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        module: str,
+        dependency: str,
+        features: Iterable[str] = (),
+        priority: int = 100,
+        class_name: str = "ExcelGenerator",
+        file_format: str = "xlsx",
+        options: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            name: Identificador del backend (por ejemplo, "xlsxwriter")
+            label: Nombre para mostrar en la interfaz
+            module: Módulo dentro de ``src`` que define el generador
+            dependency: Paquete del que depende, para comprobar si está instalado
+            features: Características opcionales soportadas
+            priority: Menor = preferido por el modo automático (más rápido)
+            class_name: Clase del generador dentro del módulo
+            file_format: Formato del archivo generado (también su extensión)
+            options: Opciones que acepta el constructor (por defecto, las
+                características soportadas), además de ``COMMON_OPTIONS``
+        """
+        self.name = name
+        self.label = label
+        self.module = module
+        self.dependency = dependency
+        self.features: FrozenSet[str] = frozenset(features)
+        self.priority = priority
+        self.class_name = class_name
+        self.file_format = file_format
+        self.options: FrozenSet[str] = COMMON_OPTIONS.union(
+            self.features if options is None else options
+        )
+
+    @property
+    def extension(self) -> str:
+        """Extensión de los archivos generados, con punto"""
+        return f".{self.file_format}"
+
+    def is_available(self) -> bool:
+        """Indica si la dependencia del backend está instalada"""
+        return importlib.util.find_spec(self.dependency) is not None
+
+    def supports(self, features: Iterable[str]) -> bool:
+        """Indica si el backend soporta todas las características pedidas"""
+        return self.features.issuperset(features)
+
+    def create(self, **options):
+        """
+        Crea una instancia del generador
+
+        Args:
+            **options: Opciones del constructor; solo se pasan las que el
+                backend acepta
+
+        Returns:
+            Generador listo para usar
+        """
+        if __package__:
+            module = importlib.import_module(f".{self.module}", __package__)
+        else:
+            module = importlib.import_module(self.module)
+        generator_class = getattr(module, self.class_name)
+        kwargs = {
+            key: value
+            for key, value in options.items()
+            if key in self.options and value is not None
+        }
+        return generator_class(**kwargs)
+
+
+_BACKENDS: Dict[str, ReportBackend] = {}
+
+
+def register_backend(backend: ReportBackend):
+    """
+    Registra (o reemplaza) un backend de reportes
+
+    Args:
+        backend: Descripción del backend
+    """
+    _BACKENDS[backend.name] = backend
+
+
+def get_backend(name: str) -> ReportBackend:
+    """
+    Obtiene un backend registrado por nombre
+
+    Args:
+        name: Identificador del backend
+
+    Returns:
+        Backend registrado
+
+    Raises:
+        ValueError: Backend desconocido
+    """
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        known = ", ".join(backend_names())
+        raise ValueError(f"Backend de reporte desconocido: {name} ({known})") from None
+
+
+def backend_names(include_auto: bool = False) -> List[str]:
+    """Nombres de los backends registrados, en orden de preferencia"""
+    names = [backend.name for backend in list_backends()]
+    return [AUTO_BACKEND] + names if include_auto else names
+
+
+def list_backends(available_only: bool = False) -> List[ReportBackend]:
+    """
+    Lista los backends registrados, del preferido al menos preferido
+
+    Args:
+        available_only: Omitir los que no tienen su dependencia instalada
+
+    Returns:
+        Lista de backends
+    """
+    backends = sorted(_BACKENDS.values(), key=lambda backend: backend.priority)
+    if available_only:
+        backends = [backend for backend in backends if backend.is_available()]
+    return backends
+
+
+def backend_of(generator) -> Optional[ReportBackend]:
+    """
+    Obtiene el backend registrado al que pertenece un generador
+
+    Args:
+        generator: Instancia creada por ``create_generator``
+
+    Returns:
+        Backend correspondiente, o None si no está registrado
+    """
+    generator_class = type(generator)
+    for backend in _BACKENDS.values():
+        if generator_class.__name__ == backend.class_name and (
+            generator_class.__module__.rsplit(".", 1)[-1] == backend.module
+        ):
+            return backend
+    return None
+
+
+def supports_streaming(backend: str = AUTO_BACKEND) -> bool:
+    """
+    Indica si un backend escribe por partes (``start_report``/``append_rows``)
+
+    En modo automático siempre se elige uno que lo haga.
+
+    Raises:
+        ValueError: Backend desconocido
+    """
+    if backend == AUTO_BACKEND:
+        return True
+    return FEATURE_STREAMING in get_backend(backend).features
+
+
+def requested_features(
+    streaming: bool = False,
+    constant_memory: Optional[bool] = None,
+    image_notes: Optional[str] = None,
+) -> FrozenSet[str]:
+    """Características que exige una combinación de opciones"""
+    features = set()
+    if streaming:
+        features.add(FEATURE_STREAMING)
+    if constant_memory:
+        features.add(FEATURE_CONSTANT_MEMORY)
+    if image_notes not in (None, "auto"):
+        features.add(FEATURE_IMAGE_NOTES)
+    return frozenset(features)
+
+
+def supports_feature(backend: str, feature: str) -> bool:
+    """
+    Indica si un backend soporta una característica
+
+    En modo automático basta con que la soporte algún backend de Excel
+    instalado, porque ``choose_backend`` elegirá ese.
+
+    Raises:
+        ValueError: Backend desconocido
+    """
+    if backend == AUTO_BACKEND:
+        return any(
+            candidate.file_format == AUTO_FILE_FORMAT and feature in candidate.features
+            for candidate in list_backends(available_only=True)
+        )
+    return feature in get_backend(backend).features
+
+
+def supported_options(backend: str = AUTO_BACKEND, **options) -> Dict:
+    """
+    Descarta las opciones de reporte que el backend no soporta
+
+    La interfaz ofrece las mismas opciones para todos los formatos; las
+    propias de XlsxWriter (memoria constante, notas de imagen) se omiten con
+    los demás backends en lugar de hacer fallar ``create_generator``.
+
+    Args:
+        backend: Nombre del backend o ``AUTO_BACKEND``
+        **options: ``constant_memory`` y/o ``image_notes``, como en
+            ``create_generator``
+
+    Returns:
+        Las opciones que el backend puede recibir
+
+    Raises:
+        ValueError: Backend desconocido
+    """
+    return {
+        name: value
+        for name, value in options.items()
+        if all(
+            supports_feature(backend, feature)
+            for feature in requested_features(**{name: value})
+        )
+    }
+
+
+def choose_backend(
+    features: Iterable[str] = (), file_format: str = AUTO_FILE_FORMAT
+) -> ReportBackend:
+    """
+    Elige el backend más rápido disponible que soporte las características
+
+    Args:
+        features: Características requeridas
+        file_format: Formato de archivo buscado
+
+    Returns:
+        Backend elegido
+
+    Raises:
+        RuntimeError: Ningún backend instalado soporta lo pedido
+    """
+    features = frozenset(features)
+    for backend in list_backends(available_only=True):
+        if backend.file_format == file_format and backend.supports(features):
+            return backend
+
+    missing = ", ".join(sorted(features)) or "ninguna"
+    raise RuntimeError(
+        f"No hay un backend de reportes instalado que soporte: {missing}. "
+        "Instala xlsxwriter (uv sync)."
+    )
+
+
+def create_generator(
+    backend: str = AUTO_BACKEND,
+    row_count: Optional[int] = None,
+    streaming: bool = False,
+    constant_memory: Optional[bool] = None,
+    image_notes: Optional[str] = None,
+    cancel_token: Optional[CancellationToken] = None,
+):
+    """
+    Crea un generador de reportes
+
+    En modo automático se usa el backend de Excel más rápido instalado que
+    soporte lo pedido y, si el reporte es enorme o de tamaño desconocido, se
+    activa la memoria constante cuando no se indicó explícitamente.
+
+    Args:
+        backend: Nombre del backend o ``AUTO_BACKEND``
+        row_count: Número de filas previsto (None = desconocido)
+        streaming: Si el reporte se escribirá por partes
+        constant_memory: Forzar (True/False) el modo de memoria constante
+        image_notes: Modo de notas de imagen (ver ``excel_generator_xlsx``)
+        cancel_token: Token para cancelar la escritura
+
+    Returns:
+        Generador con la interfaz común de reportes
+
+    Raises:
+        ValueError: Backend desconocido o sin soporte para lo pedido
+        RuntimeError: Ningún backend instalado soporta lo pedido
+    """
+    features = requested_features(streaming, constant_memory, image_notes)
+
+    if backend == AUTO_BACKEND:
+        selected = choose_backend(features)
+        if (
+            constant_memory is None
+            and FEATURE_CONSTANT_MEMORY in selected.features
+            and (row_count is None or row_count >= CONSTANT_MEMORY_ROWS)
+        ):
+            constant_memory = True
+    else:
+        selected = get_backend(backend)
+        if not selected.supports(features):
+            unsupported = ", ".join(sorted(features - selected.features))
+            raise ValueError(f"El backend {selected.name} no soporta: {unsupported}")
+
+    return selected.create(
+        constant_memory=constant_memory,
+        image_notes=image_notes,
+        cancel_token=cancel_token,
+    )
+
+
+register_backend(
+    ReportBackend(
+        name="xlsxwriter",
+        label="Excel (XlsxWriter)",
+        module="excel_generator_xlsx",
+        dependency="xlsxwriter",
+        features=(FEATURE_STREAMING, FEATURE_CONSTANT_MEMORY, FEATURE_IMAGE_NOTES),
+        priority=10,
+    )
+)
+register_backend(
+    ReportBackend(
+        name="openpyxl",
+        label="Excel (openpyxl)",
+        module="excel_generator",
+        dependency="openpyxl",
+        priority=50,
+    )
+)
+register_backend(
+    ReportBackend(
+        name="csv",
+        label="CSV",
+        module="csv_exporter",
+        dependency="csv",
+        # Siempre escribe en streaming: la memoria no depende del tamaño
+        features=(FEATURE_STREAMING, FEATURE_CONSTANT_MEMORY),
+        priority=60,
+        class_name="CsvExporter",
+        file_format="csv",
+        options=(),
+    )
+)
+register_backend(
+    ReportBackend(
+        name="parquet",
+        label="Parquet",
+        module="parquet_exporter",
+        dependency="pyarrow",
+        features=(FEATURE_STREAMING, FEATURE_CONSTANT_MEMORY),
+        priority=70,
+        class_name="ParquetExporter",
+        file_format="parquet",
+        options=(),
+    )
+)
@@ -0,0 +1,494 @@
+"""
+Almacén local (SQLite) de snapshots del inventario obtenido de la API.
+"""
+import hashlib
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from .app_paths import get_app_data_dir
+except ImportError:
+    from app_paths import get_app_data_dir
+
+SNAPSHOT_DB_FILENAME = "inventory_snapshots.sqlite3"
+
+# Snapshots completos que se conservan por location
+DEFAULT_KEEP_SNAPSHOTS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    location_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    item_count INTEGER NOT NULL DEFAULT 0,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS snapshot_items (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    item_id TEXT,
+    sku TEXT,
+    name TEXT,
+    product_name TEXT,
+    available_quantity REAL,
+    image TEXT,
+    raw TEXT NOT NULL,
+    raw_hash TEXT,
+    PRIMARY KEY (snapshot_id, position)
+);
+CREATE TABLE IF NOT EXISTS snapshot_pages (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    page_offset INTEGER NOT NULL,
+    item_count INTEGER NOT NULL,
+    page_hash TEXT NOT NULL,
+    etag TEXT,
+    PRIMARY KEY (snapshot_id, page_offset)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_location
+    ON snapshots (location_id, complete, id);
+CREATE INDEX IF NOT EXISTS idx_snapshot_items_sku ON snapshot_items (sku);
+CREATE INDEX IF NOT EXISTS idx_snapshot_items_name ON snapshot_items (name);
+"""
+
+
+class SnapshotStore:
+    """
+    Guarda cada obtención de inventario en SQLite
+
+    Cada snapshot conserva el item crudo de la API junto con los campos ya
+    formateados para el reporte, de modo que se puede regenerar un reporte
+    sin volver a consultar la API. Cada operación abre su propia conexión,
+    por lo que la instancia se puede usar desde cualquier hilo.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else get_app_data_dir() / SNAPSHOT_DB_FILENAME
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Agrega columnas nuevas a bases creadas por versiones anteriores"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(snapshot_items)")}
+        if "raw_hash" not in columns:
+            conn.execute("ALTER TABLE snapshot_items ADD COLUMN raw_hash TEXT")
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre una conexión configurada para escrituras rápidas"""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def begin_snapshot(self, location_id: str) -> int:
+        """
+        Crea un snapshot vacío (incompleto) para ir agregando páginas
+
+        Args:
+            location_id: Location de HighLevel
+
+        Returns:
+            Identificador del snapshot
+        """
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO snapshots (location_id, created_at) VALUES (?, ?)",
+                (location_id, datetime.now().isoformat(timespec="seconds")),
+            )
+            return cursor.lastrowid
+
+    def add_items(
+        self,
+        snapshot_id: int,
+        raw_items: List[Dict],
+        formatted_items: List[Dict],
+        start_position: int,
+    ) -> List[str]:
+        """
+        Agrega una página de items a un snapshot en una sola transacción
+
+        Args:
+            snapshot_id: Identificador del snapshot
+            raw_items: Items tal como los devolvió la API
+            formatted_items: Items formateados para el reporte (mismo orden)
+            start_position: Posición del primer item dentro del snapshot
+
+        Returns:
+            Hash del contenido crudo de cada item, en orden
+        """
+        rows = []
+        item_hashes = []
+        for i, (raw, formatted) in enumerate(zip(raw_items, formatted_items)):
+            raw_json = serialize_item(raw)
+            item_hashes.append(hash_text(raw_json))
+            rows.append(
+                (
+                    snapshot_id,
+                    start_position + i,
+                    raw.get("_id"),
+                    raw.get("sku"),
+                    formatted.get("Nombre", ""),
+                    formatted.get("Nombre de producto", ""),
+                    formatted.get("Cantidad disponible", 0),
+                    formatted.get("Imagen", ""),
+                    raw_json,
+                    item_hashes[-1],
+                )
+            )
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO snapshot_items (snapshot_id, position, item_id, sku, "
+                "name, product_name, available_quantity, image, raw, raw_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return item_hashes
+
+    def copy_items(
+        self, source_id: int, target_id: int, start_position: int, count: int
+    ) -> List[str]:
+        """
+        Copia un rango de items de un snapshot a otro sin reformatearlos
+
+        Args:
+            source_id: Snapshot de origen
+            target_id: Snapshot de destino
+            start_position: Posición del primer item (igual en ambos)
+            count: Número de items a copiar
+
+        Returns:
+            Clave de cada item copiado (ver ``item_key``)
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO snapshot_items (snapshot_id, position, item_id, sku, "
+                "name, product_name, available_quantity, image, raw, raw_hash) "
+                "SELECT ?, position, item_id, sku, name, product_name, "
+                "available_quantity, image, raw, raw_hash FROM snapshot_items "
+                "WHERE snapshot_id = ? AND position >= ? AND position < ?",
+                (target_id, source_id, start_position, start_position + count),
+            )
+            rows = conn.execute(
+                "SELECT item_id, raw_hash, raw FROM snapshot_items "
+                "WHERE snapshot_id = ? AND position >= ? AND position < ?",
+                (target_id, start_position, start_position + count),
+            ).fetchall()
+        return [item_key(row[0], row[1] or hash_text(row[2])) for row in rows]
+
+    def add_page(
+        self,
+        snapshot_id: int,
+        page_offset: int,
+        item_count: int,
+        page_hash: str,
+        etag: Optional[str] = None,
+    ):
+        """
+        Registra el hash (y ETag, si existe) de una página del snapshot
+
+        Args:
+            snapshot_id: Identificador del snapshot
+            page_offset: Offset de la página en la API
+            item_count: Items recibidos en la página
+            page_hash: Hash del contenido de la página
+            etag: ETag devuelto por la API
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshot_pages (snapshot_id, page_offset, "
+                "item_count, page_hash, etag) VALUES (?, ?, ?, ?, ?)",
+                (snapshot_id, page_offset, item_count, page_hash, etag),
+            )
+
+    def load_pages(self, snapshot_id: int) -> Dict[int, Dict]:
+        """
+        Carga los hashes de página de un snapshot
+
+        Args:
+            snapshot_id: Identificador del snapshot
+
+        Returns:
+            Diccionario offset -> {item_count, page_hash, etag}
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT page_offset, item_count, page_hash, etag "
+                "FROM snapshot_pages WHERE snapshot_id = ?",
+                (snapshot_id,),
+            ).fetchall()
+        return {
+            row["page_offset"]: {
+                "item_count": row["item_count"],
+                "page_hash": row["page_hash"],
+                "etag": row["etag"],
+            }
+            for row in rows
+        }
+
+    def load_item_hashes(self, snapshot_id: int) -> Dict[str, str]:
+        """
+        Carga el hash del contenido crudo de cada item de un snapshot
+
+        Args:
+            snapshot_id: Identificador del snapshot
+
+        Returns:
+            Diccionario clave del item (ver ``item_key``) -> hash
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT item_id, raw_hash, raw FROM snapshot_items "
+                "WHERE snapshot_id = ?",
+                (snapshot_id,),
+            ).fetchall()
+        hashes = {}
+        for item_id, raw_hash, raw in rows:
+            raw_hash = raw_hash or hash_text(raw)
+            hashes[item_key(item_id, raw_hash)] = raw_hash
+        return hashes
+
+    def finish_snapshot(
+        self, snapshot_id: int, keep: int = DEFAULT_KEEP_SNAPSHOTS
+    ) -> int:
+        """
+        Marca un snapshot como completo y elimina los más antiguos
+
+        Solo se eliminan snapshots anteriores a este: uno más nuevo aún
+        incompleto puede estar escribiéndose desde otro hilo o proceso.
+
+        Args:
+            snapshot_id: Identificador del snapshot
+            keep: Snapshots completos a conservar por location
+
+        Returns:
+            Número de items del snapshot
+        """
+        with closing(self._connect()) as conn, conn:
+            item_count = conn.execute(
+                "SELECT COUNT(*) FROM snapshot_items WHERE snapshot_id = ?",
+                (snapshot_id,),
+            ).fetchone()[0]
+            conn.execute(
+                "UPDATE snapshots SET complete = 1, item_count = ? WHERE id = ?",
+                (item_count, snapshot_id),
+            )
+            location_id = conn.execute(
+                "SELECT location_id FROM snapshots WHERE id = ?", (snapshot_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "DELETE FROM snapshots WHERE location_id = ? AND id < ? "
+                "AND id NOT IN (SELECT id FROM snapshots WHERE location_id = ? "
+                "AND complete = 1 ORDER BY id DESC LIMIT ?)",
+                (location_id, snapshot_id, location_id, keep),
+            )
+        return item_count
+
+    def discard_snapshot(self, snapshot_id: int):
+        """
+        Elimina un snapshot (por ejemplo, si la obtención falló a la mitad)
+
+        Args:
+            snapshot_id: Identificador del snapshot
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+
+    def save_snapshot(
+        self, location_id: str, raw_items: List[Dict], formatted_items: List[Dict]
+    ) -> int:
+        """
+        Guarda un snapshot completo de una sola vez
+
+        Args:
+            location_id: Location de HighLevel
+            raw_items: Items tal como los devolvió la API
+            formatted_items: Items formateados para el reporte
+
+        Returns:
+            Identificador del snapshot
+        """
+        snapshot_id = self.begin_snapshot(location_id)
+        self.add_items(snapshot_id, raw_items, formatted_items, 0)
+        self.finish_snapshot(snapshot_id)
+        return snapshot_id
+
+    def latest_snapshot(self, location_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Obtiene los metadatos del último snapshot completo
+
+        Args:
+            location_id: Filtrar por location (None = cualquier location)
+
+        Returns:
+            Diccionario con id, location_id, created_at e item_count, o None
+        """
+        query = "SELECT id, location_id, created_at, item_count FROM snapshots "
+        query += "WHERE complete = 1 "
+        params = ()
+        if location_id:
+            query += "AND location_id = ? "
+            params = (location_id,)
+        query += "ORDER BY id DESC LIMIT 1"
+        with closing(self._connect()) as conn:
+            row = conn.execute(query, params).fetchone()
+        return dict(row) if row else None
+
+    def list_snapshots(
+        self, location_id: Optional[str] = None, limit: int = DEFAULT_KEEP_SNAPSHOTS
+    ) -> List[Dict]:
+        """
+        Lista los snapshots completos, del más reciente al más antiguo
+
+        Args:
+            location_id: Filtrar por location (None = cualquier location)
+            limit: Número máximo de snapshots
+
+        Returns:
+            Lista de diccionarios con id, location_id, created_at e item_count
+        """
+        query = "SELECT id, location_id, created_at, item_count FROM snapshots "
+        query += "WHERE complete = 1 "
+        params = ()
+        if location_id:
+            query += "AND location_id = ? "
+            params = (location_id,)
+        query += "ORDER BY id DESC LIMIT ?"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params + (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_snapshot(self, snapshot_id: int) -> Optional[Dict]:
+        """
+        Obtiene los metadatos de un snapshot completo por id
+
+        Args:
+            snapshot_id: Identificador del snapshot
+
+        Returns:
+            Diccionario con id, location_id, created_at e item_count, o None
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, location_id, created_at, item_count FROM snapshots "
+                "WHERE id = ? AND complete = 1",
+                (snapshot_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def load_formatted(self, snapshot_id: int) -> List[Dict]:
+        """
+        Carga los items formateados de un snapshot en su orden original
+
+        Args:
+            snapshot_id: Identificador del snapshot
+
+        Returns:
+            Lista de items con las columnas del reporte
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT name, product_name, available_quantity, image "
+                "FROM snapshot_items WHERE snapshot_id = ? ORDER BY position",
+                (snapshot_id,),
+            ).fetchall()
+        return [
+            {
+                "Nombre": row[0],
+                "Nombre de producto": row[1],
+                "Cantidad disponible": _as_number(row[2]),
+                "Imagen": row[3],
+            }
+            for row in rows
+        ]
+
+    def iter_raw_items(self, snapshot_id: int) -> Iterator[Dict]:
+        """
+        Recorre los items crudos de un snapshot en su orden original
+
+        Args:
+            snapshot_id: Identificador del snapshot
+
+        Yields:
+            Item tal como lo devolvió la API
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "SELECT raw FROM snapshot_items WHERE snapshot_id = ? "
+                "ORDER BY position",
+                (snapshot_id,),
+            )
+            for (raw,) in cursor:
+                yield json.loads(raw)
+
+
+def serialize_item(raw: Dict) -> str:
+    """
+    Serializa un item crudo de forma canónica (claves ordenadas)
+
+    Args:
+        raw: Item tal como lo devolvió la API
+
+    Returns:
+        JSON compacto del item
+    """
+    return json.dumps(raw, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+def item_key(item_id: Optional[str], raw_hash: str) -> str:
+    """
+    Clave con la que se compara un item entre snapshots
+
+    Es el ``_id`` de la API; un item sin ``_id`` se identifica por el hash de
+    su contenido, así que si cambia cuenta como baja más alta.
+
+    Args:
+        item_id: ``_id`` del item o None
+        raw_hash: Hash del contenido crudo del item
+
+    Returns:
+        Clave del item
+    """
+    if item_id is not None:
+        return item_id
+    return f"hash:{raw_hash}"
+
+
+def hash_text(text: str) -> str:
+    """
+    Calcula un hash corto y estable de un texto
+
+    Args:
+        text: Texto a resumir
+
+    Returns:
+        Hash hexadecimal de 16 caracteres
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def hash_page(item_hashes: List[str]) -> str:
+    """
+    Calcula el hash de una página a partir de los hashes de sus items
+
+    Args:
+        item_hashes: Hash de cada item, en orden
+
+    Returns:
+        Hash hexadecimal de la página
+    """
+    return hash_text("".join(item_hashes))
+
+
+def _as_number(value):
+    """SQLite devuelve REAL; conservar enteros como int para el reporte"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
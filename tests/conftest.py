@@ -0,0 +1,119 @@
+"""
+Fixtures compartidas de las pruebas de comportamiento.
+
+Uso:
+    uv run pytest tests
+
+Las pruebas usan el servidor simulado (``src.mock_server``) en lugar de la
+API real y un directorio de datos temporal, así que no necesitan red ni
+credenciales y no tocan la caché ni los snapshots de la aplicación.
+"""
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Credenciales que se usan contra el servidor simulado
+ACCESS_TOKEN = "token-de-prueba"
+LOCATION_ID = "loc1"
+
+# Variables de entorno de la aplicación que las pruebas no heredan
+APP_ENV_VARS = (
+    "HIGHLEVEL_ACCESS_TOKEN",
+    "HIGHLEVEL_LOCATION_ID",
+    "HIGHLEVEL_BASE_URL",
+    "INVENTARIO_GHL_DEBUG",
+)
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch) -> Iterator[Path]:
+    """
+    Directorio de datos aislado y entorno sin credenciales reales
+
+    Cada prueba empieza sin caché de endpoints compartida, sin snapshots y
+    sin las variables ``HIGHLEVEL_*`` que pudiera tener el entorno o el
+    ``.env`` del proyecto (no se busca ninguno).
+    """
+    from src import app_paths, endpoint_cache
+    from src.app_paths import DATA_DIR_ENV
+
+    path = tmp_path / "datos"
+    monkeypatch.setenv(DATA_DIR_ENV, str(path))
+    for name in APP_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(endpoint_cache, "_default_cache", None)
+    monkeypatch.setattr(app_paths, "get_env_paths", lambda: [])
+    yield path
+    # Las que cargó un .env durante la prueba (monkeypatch no las conoce)
+    for name in APP_ENV_VARS:
+        os.environ.pop(name, None)
+
+
+@pytest.fixture
+def mock_server():
+    """
+    Inicia servidores simulados con la configuración indicada
+
+    Devuelve una función ``start(**options)`` que acepta los argumentos de
+    ``MockHighLevelServer``; todos se detienen al terminar la prueba.
+    """
+    from src.mock_server import MockHighLevelServer
+
+    servers = []
+
+    def start(**options) -> MockHighLevelServer:
+        server = MockHighLevelServer(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def make_client():
+    """
+    Crea clientes de la API sin límite de ritmo y con reintentos rápidos
+
+    Devuelve una función ``create(base_url, **options)``; ``options`` se pasa
+    a ``HighLevelAPI`` y reemplaza los valores por defecto de la prueba.
+    """
+    from src.endpoint_cache import EndpointCache
+    from src.highlevel_api import HighLevelAPI
+    from src.rate_limit import RetryPolicy, TokenBucket
+
+    clients = []
+
+    def create(base_url: str, **options) -> HighLevelAPI:
+        settings = {
+            "endpoint_cache": EndpointCache(),
+            "retry_policy": RetryPolicy(max_retries=2, backoff_base=0.001),
+            "rate_limiter": TokenBucket(rate=1e9, capacity=1e9),
+            "access_token": ACCESS_TOKEN,
+            "location_id": LOCATION_ID,
+            "base_url": base_url,
+        }
+        settings.update(options)
+        client = HighLevelAPI(**settings)
+        clients.append(client)
+        return client
+
+    yield create
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def closed_url() -> str:
+    """URL local en un puerto sin servidor (la conexión se rechaza)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
@@ -0,0 +1,133 @@
+"""
+Pruebas del recorrido del inventario con el cliente asíncrono.
+"""
+import asyncio
+import random
+
+import pytest
+
+from src.async_highlevel_api import AsyncHighLevelAPI
+from src.endpoint_cache import EndpointCache
+from src.mock_server import mock_product
+from src.rate_limit import RetryPolicy, TokenBucket
+
+httpx = pytest.importorskip("httpx")
+
+
+def make_async_client(base_url, **options) -> AsyncHighLevelAPI:
+    settings = {
+        "endpoint_cache": EndpointCache(),
+        "retry_policy": RetryPolicy(max_retries=2, backoff_base=0.001),
+        "rate_limiter": TokenBucket(rate=1e9, capacity=1e9),
+        "access_token": "token-de-prueba",
+        "location_id": "loc1",
+        "base_url": base_url,
+    }
+    settings.update(options)
+    return AsyncHighLevelAPI(**settings)
+
+
+def collect(client: AsyncHighLevelAPI, **options):
+    """Recorre el inventario y devuelve las páginas recibidas"""
+
+    async def walk():
+        async with client:
+            return [page async for page in client.iter_inventory(**options)]
+
+    return asyncio.run(walk())
+
+
+def ids(pages):
+    return [item["_id"] for page in pages for item in page]
+
+
+def expected_ids(start, stop):
+    return [mock_product(index)["_id"] for index in range(start, stop)]
+
+
+class SlowTransport:
+    """
+    Catálogo servido con ``httpx.MockTransport`` y latencia aleatoria
+
+    Las páginas terminan en desorden; registra cuántas peticiones hubo en
+    vuelo a la vez y los offsets pedidos.
+    """
+
+    def __init__(self, products: int, seed: int = 0):
+        self.products = products
+        self.random = random.Random(seed)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.offsets = []
+
+    async def handle(self, request: "httpx.Request") -> "httpx.Response":
+        limit = int(request.url.params["limit"])
+        offset = int(request.url.params["offset"])
+        self.offsets.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.random.uniform(0, 0.02))
+        finally:
+            self.in_flight -= 1
+        end = min(offset + limit, self.products)
+        products = [mock_product(index) for index in range(offset, end)]
+        return httpx.Response(200, json={"products": products, "total": self.products})
+
+    def client(self) -> AsyncHighLevelAPI:
+        return make_async_client(
+            "https://api.example.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(self.handle)),
+        )
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_walks_the_whole_catalog(mock_server, concurrency):
+    server = mock_server(products=250, shape="products")
+    progress = []
+
+    pages = collect(
+        make_async_client(server.url),
+        page_size=100,
+        concurrency=concurrency,
+        progress_callback=lambda *update: progress.append(update),
+    )
+
+    assert ids(pages) == expected_ids(0, 250)
+    assert progress == [(100, 250, 1), (200, 250, 2), (250, 250, 3)]
+
+
+def test_short_page_without_total_ends_the_walk(mock_server):
+    server = mock_server(products=250, shape="list")
+
+    pages = collect(make_async_client(server.url), page_size=100, concurrency=4)
+
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert server.stats()["200"] == 3
+
+
+def test_parallel_pages_arrive_in_offset_order():
+    transport = SlowTransport(products=1000)
+
+    pages = collect(transport.client(), page_size=50, concurrency=4)
+
+    assert ids(pages) == expected_ids(0, 1000)
+    assert sorted(transport.offsets) == list(range(0, 1000, 50))
+    # Una ventana de como máximo 2 * concurrency páginas en vuelo
+    assert 1 < transport.max_in_flight <= 8
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_max_items_stops_mid_page(concurrency):
+    transport = SlowTransport(products=1000)
+
+    pages = collect(
+        transport.client(),
+        page_size=50,
+        offset=100,
+        max_items=130,
+        concurrency=concurrency,
+    )
+
+    assert ids(pages) == expected_ids(100, 230)
+    assert sorted(transport.offsets) == [100, 150, 200]
@@ -0,0 +1,79 @@
+"""
+Pruebas de la cancelación cooperativa.
+"""
+import threading
+import time
+
+import pytest
+
+from src.cancellation import CancellationToken, OperationCancelled
+from src.csv_exporter import CANCEL_CHECK_ROWS, CsvExporter
+
+
+def test_token_raises_only_after_cancel():
+    token = CancellationToken()
+    token.raise_if_cancelled()
+    assert not token.cancelled
+
+    token.cancel()
+
+    assert token.cancelled
+    with pytest.raises(OperationCancelled):
+        token.raise_if_cancelled()
+
+
+def test_sleep_is_interrupted_by_cancel():
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(OperationCancelled):
+        token.sleep(10)
+    assert time.monotonic() - started < 2
+
+
+def test_sleep_without_cancel_returns():
+    CancellationToken().sleep(0.01)
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_iter_inventory_stops_between_pages(mock_server, make_client, concurrency):
+    server = mock_server(products=3000)
+    client = make_client(server.url)
+    token = CancellationToken()
+    pages = []
+
+    with pytest.raises(OperationCancelled):
+        for page in client.iter_inventory(
+            page_size=100, concurrency=concurrency, cancel_token=token
+        ):
+            pages.append(page)
+            token.cancel()
+
+    assert len(pages) == 1
+    # Solo las páginas ya solicitadas en paralelo llegan al servidor
+    assert server.stats()["requests"] <= concurrency + 1
+
+
+def test_report_stops_within_a_large_block(tmp_path):
+    token = CancellationToken()
+
+    class CancellingRow(dict):
+        """Fila que pide la cancelación al leerse (como un clic a mitad)"""
+
+        def get(self, key, default=None):
+            token.cancel()
+            return super().get(key, default)
+
+    rows = [{"Nombre": f"Producto {index}"} for index in range(5000)]
+    rows[10] = CancellingRow(rows[10])
+    exporter = CsvExporter(cancel_token=token)
+    path = tmp_path / "reporte.csv"
+
+    with pytest.raises(OperationCancelled):
+        exporter.create_report(rows, str(path))
+    exporter._file.close()
+
+    # Encabezado más el primer bloque: el resto ya no se escribe
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1 + CANCEL_CHECK_ROWS
@@ -0,0 +1,167 @@
+"""
+Pruebas de la línea de comandos: resultado JSON y códigos de salida.
+"""
+import json
+import logging
+
+import pytest
+
+from src import cli
+
+TOKEN = "token-cli"
+LOCATION_ID = "loc1"
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    """Quita los handlers de la CLI (apuntan al stderr capturado)"""
+    yield
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if getattr(handler, "_inventario_ghl", False):
+            root.removeHandler(handler)
+            handler.close()
+
+
+@pytest.fixture
+def server(mock_server):
+    return mock_server(products=700, access_token=TOKEN, location_id=LOCATION_ID)
+
+
+@pytest.fixture
+def run(capsys):
+    """Ejecuta la CLI y devuelve (código de salida, resultado JSON)"""
+
+    def run_cli(*argv):
+        exit_code = cli.main(["--quiet", *argv])
+        result = json.loads(capsys.readouterr().out)
+        assert result["exit_code"] == exit_code
+        return exit_code, result
+
+    return run_cli
+
+
+def api_args(server, token: str = TOKEN):
+    return ["--base-url", server.url, "--token", token, "--location-id", LOCATION_ID]
+
+
+def test_fetch_saves_snapshot(run, server):
+    exit_code, result = run(*api_args(server), "fetch")
+
+    assert exit_code == cli.EXIT_OK
+    assert result["status"] == "ok"
+    assert result["items_count"] == 700
+
+    exit_code, result = run("--location-id", LOCATION_ID, "snapshot")
+    assert exit_code == cli.EXIT_OK
+    assert [snapshot["item_count"] for snapshot in result["snapshots"]] == [700]
+
+
+def test_incremental_fetch_reuses_unchanged_pages(run, server):
+    run(*api_args(server), "fetch", "--incremental")
+
+    exit_code, result = run(*api_args(server), "fetch", "--incremental")
+
+    assert exit_code == cli.EXIT_OK
+    assert result["unchanged"] == 700
+    assert result["pages_skipped"] == result["pages_total"]
+
+
+@pytest.mark.parametrize("backend", ["auto", "csv", "openpyxl", "xlsxwriter"])
+def test_export_from_api_with_each_backend(run, server, tmp_path, backend):
+    pytest.importorskip("openpyxl" if backend == "openpyxl" else "xlsxwriter")
+    output = tmp_path / "reporte"
+
+    exit_code, result = run(
+        *api_args(server), "export", "--backend", backend, "-o", str(output)
+    )
+
+    assert exit_code == cli.EXIT_OK, result.get("error")
+    assert result["items_count"] == 700
+    assert output.exists()
+
+
+def test_export_from_snapshot(run, server, tmp_path):
+    run(*api_args(server), "fetch")
+    output = tmp_path / "reporte.csv"
+
+    exit_code, result = run(
+        "export", "--from-snapshot", "--backend", "csv", "-o", str(output)
+    )
+
+    assert exit_code == cli.EXIT_OK
+    assert result["items_count"] == 700
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 701
+
+
+def test_missing_credentials_is_config_error(run):
+    exit_code, result = run("fetch")
+
+    assert exit_code == cli.EXIT_CONFIG
+    assert "HIGHLEVEL_ACCESS_TOKEN" in result["error"]
+
+
+def test_project_env_file_is_loaded(run, server, tmp_path, monkeypatch):
+    from src import app_paths
+
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        f"HIGHLEVEL_ACCESS_TOKEN={TOKEN}\n"
+        f"HIGHLEVEL_LOCATION_ID={LOCATION_ID}\n"
+        f"HIGHLEVEL_BASE_URL={server.url}\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(app_paths, "get_env_paths", lambda: [str(env_file)])
+
+    exit_code, result = run("fetch")
+
+    assert exit_code == cli.EXIT_OK
+    assert result["items_count"] == 700
+
+
+def test_env_file_option_replaces_project_env_file(run, tmp_path, monkeypatch):
+    from src import app_paths
+
+    project_env = tmp_path / "proyecto.env"
+    project_env.write_text("HIGHLEVEL_ACCESS_TOKEN=del-proyecto\n", encoding="utf-8")
+    monkeypatch.setattr(app_paths, "get_env_paths", lambda: [str(project_env)])
+    empty_env = tmp_path / "vacio.env"
+    empty_env.write_text("", encoding="utf-8")
+
+    exit_code, result = run("--env-file", str(empty_env), "fetch")
+
+    # El .env del proyecto no se cargó: faltan las credenciales
+    assert exit_code == cli.EXIT_CONFIG
+    assert "HIGHLEVEL_ACCESS_TOKEN" in result["error"]
+
+
+def test_rejected_token_is_api_error(run, server):
+    exit_code, result = run(*api_args(server, token="otro-token"), "fetch")
+
+    assert exit_code == cli.EXIT_API
+    assert result["status"] == "error"
+
+
+def test_diff_without_snapshots_is_not_found(run):
+    exit_code, _ = run("diff")
+
+    assert exit_code == cli.EXIT_NOT_FOUND
+
+
+def test_diff_with_one_id_is_config_error(run):
+    exit_code, _ = run("diff", "1")
+
+    assert exit_code == cli.EXIT_CONFIG
+
+
+def test_export_missing_snapshot_is_not_found(run):
+    exit_code, _ = run("export", "--from-snapshot", "42")
+
+    assert exit_code == cli.EXIT_NOT_FOUND
+
+
+def test_invalid_arguments_exit_with_usage_error(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main(["export", "--backend", "no-existe"])
+
+    assert exc_info.value.code == cli.EXIT_USAGE
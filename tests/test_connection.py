@@ -0,0 +1,104 @@
+"""
+Pruebas de la prueba de conexión (descubrimiento de endpoint con peticiones cortas).
+"""
+import asyncio
+
+import pytest
+import requests
+
+from src.endpoint_cache import EndpointCache
+from src.highlevel_api import INVENTORY_ENDPOINTS
+
+
+@pytest.mark.parametrize("shape", ["inventory", "products", "list"])
+def test_discovers_endpoint_with_empty_cache(mock_server, make_client, shape):
+    server = mock_server(products=50, shape=shape, param_style="altId")
+    client = make_client(server.url)
+
+    result = client.test_connection()
+
+    assert result["success"], result["message"]
+    assert result["items_count"] == 1
+    endpoint = INVENTORY_ENDPOINTS[("inventory", "products", "list").index(shape)]
+    # La lista lleva la location en la ruta: acepta el primer estilo
+    param_style = "locationId" if shape == "list" else "altId"
+    assert client.endpoint_cache.get(client._endpoint_cache_key()) == (
+        endpoint,
+        param_style,
+    )
+
+
+def test_cached_endpoint_needs_one_request(mock_server, make_client):
+    server = mock_server(products=50, shape="list")
+    client = make_client(server.url)
+    assert client.test_connection()["success"]
+
+    server.reset_stats()
+    assert client.test_connection()["success"]
+    assert server.stats() == {"requests": 1, "200": 1}
+
+
+def test_invalid_token_tries_every_combination(mock_server, make_client):
+    server = mock_server(products=50, access_token="otro-token")
+    client = make_client(server.url)
+
+    result = client.test_connection()
+
+    assert not result["success"]
+    assert result["status_code"] == 401
+    assert server.stats() == {"requests": 6, "401": 6}
+
+
+def test_throttled_probe_does_not_claim_retries(mock_server, make_client):
+    server = mock_server(products=50, throttle_every=1, retry_after=0.001)
+    client = make_client(server.url)
+
+    result = client.test_connection()
+
+    assert result["message"] == "Error de conexión: Límite de peticiones excedido"
+    assert result["status_code"] == 429
+    assert server.stats() == {"requests": 1, "429": 1}
+
+    # Una descarga sí reintenta, y el mensaje lo dice
+    with pytest.raises(requests.HTTPError, match="excedido tras 2 reintentos"):
+        client.get_inventory(limit=10)
+    assert server.stats()["429"] == 4
+
+
+def test_unreachable_host_fails_after_one_request(make_client, closed_url):
+    client = make_client(closed_url)
+    calls = []
+    send = client.session.get
+
+    def counting_get(*args, **kwargs):
+        calls.append(kwargs.get("timeout"))
+        return send(*args, **kwargs)
+
+    client.session.get = counting_get
+
+    result = client.test_connection(timeout=2)
+
+    assert not result["success"]
+    assert calls == [2]
+
+
+def test_async_client_discovers_endpoint(mock_server):
+    pytest.importorskip("httpx")
+    from src.async_highlevel_api import AsyncHighLevelAPI
+
+    server = mock_server(products=50, shape="products", param_style="altId")
+    cache = EndpointCache()
+
+    async def probe():
+        async with AsyncHighLevelAPI(
+            endpoint_cache=cache,
+            access_token="token",
+            location_id="loc1",
+            base_url=server.url,
+        ) as client:
+            return await client.test_connection()
+
+    result = asyncio.run(probe())
+
+    assert result["success"], result["message"]
+    assert cache.get(f"{server.url}|loc1") == (INVENTORY_ENDPOINTS[1], "altId")
@@ -0,0 +1,200 @@
+"""
+Pruebas de la sincronización incremental contra el servidor simulado.
+"""
+import pytest
+
+from src.cancellation import CancellationToken, OperationCancelled
+from src.delta_sync import DeltaSync, diff_snapshots
+from src.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path) -> SnapshotStore:
+    return SnapshotStore(tmp_path / "snapshots.sqlite3")
+
+
+def counts(result):
+    return {
+        group: result[group] for group in ("added", "changed", "removed", "unchanged")
+    }
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_first_sync_adds_everything(mock_server, make_client, store, concurrency):
+    server = mock_server(products=250)
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+
+    result = sync.sync(concurrency=concurrency)
+
+    assert counts(result) == {"added": 250, "changed": 0, "removed": 0, "unchanged": 0}
+    assert result["items_count"] == 250
+    assert result["pages_total"] == 3
+    assert store.latest_snapshot()["id"] == result["snapshot_id"]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_unchanged_catalog_uses_304(mock_server, make_client, store, concurrency):
+    server = mock_server(products=250)
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+    first = sync.sync(concurrency=concurrency)
+    server.reset_stats()
+
+    result = sync.sync(concurrency=concurrency)
+
+    assert counts(result) == {"added": 0, "changed": 0, "removed": 0, "unchanged": 250}
+    assert result["pages_skipped"] == result["pages_total"] == 3
+    assert server.stats() == {"requests": 3, "304": 3}
+    assert store.load_formatted(result["snapshot_id"]) == store.load_formatted(
+        first["snapshot_id"]
+    )
+
+
+def test_modified_quantities_are_changed(mock_server, make_client, store):
+    server = mock_server(products=250)
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+    sync.sync()
+    server.seed = 1
+
+    result = sync.sync()
+
+    assert counts(result) == {"added": 0, "changed": 250, "removed": 0, "unchanged": 0}
+    assert result["pages_skipped"] == 0
+
+
+def test_added_and_removed_items(mock_server, make_client, store):
+    server = mock_server(products=250)
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+    sync.sync()
+
+    server.products = 300
+    grown = sync.sync()
+    server.products = 220
+    shrunk = sync.sync()
+
+    assert counts(grown) == {"added": 50, "changed": 0, "removed": 0, "unchanged": 250}
+    # Las dos primeras páginas cambian de ETag pero no de contenido
+    assert grown["pages_skipped"] == 2
+    assert counts(shrunk) == {"added": 0, "changed": 0, "removed": 80, "unchanged": 220}
+
+    diff = diff_snapshots(store, grown["snapshot_id"], shrunk["snapshot_id"])
+    assert len(diff["removed"]) == 80
+    assert diff["unchanged"] == 220
+
+
+def test_capped_pages_are_followed(mock_server, make_client, store):
+    # Con el total conocido, una página corta es un límite recortado
+    server = mock_server(products=250, max_page_size=60)
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+
+    first = sync.sync()
+    second = sync.sync()
+
+    assert first["items_count"] == 250
+    assert counts(second)["unchanged"] == 250
+    assert second["pages_skipped"] == second["pages_total"]
+
+
+def test_not_modified_pages_without_total_keep_walking(mock_server, make_client, store):
+    server = mock_server(products=250, shape="list")
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+    sync.sync()
+
+    result = sync.sync()
+
+    assert result["items_count"] == 250
+    assert counts(result)["unchanged"] == 250
+
+
+@pytest.fixture
+def parallel_walks(monkeypatch):
+    """Registra (start, stop) de cada recorrido en paralelo"""
+    from src.highlevel_api import HighLevelAPI
+
+    walks = []
+    iter_pages_parallel = HighLevelAPI._iter_pages_parallel
+
+    def record(self, start, stop, *args, **kwargs):
+        walks.append((start, stop))
+        return iter_pages_parallel(self, start, stop, *args, **kwargs)
+
+    monkeypatch.setattr(HighLevelAPI, "_iter_pages_parallel", record)
+    return walks
+
+
+def test_not_modified_first_page_walks_in_parallel(
+    mock_server, make_client, store, parallel_walks
+):
+    server = mock_server(products=250)
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+    sync.sync()
+    server.reset_stats()
+    parallel_walks.clear()
+
+    result = sync.sync(concurrency=4)
+
+    # El 304 no trae total: se estima con los 250 items del snapshot previo
+    assert parallel_walks == [(100, 300)]
+    assert server.stats() == {"requests": 3, "304": 3}
+    assert counts(result)["unchanged"] == 250
+
+
+def test_parallel_walk_without_total_continues_past_previous_snapshot(
+    mock_server, make_client, store, parallel_walks
+):
+    server = mock_server(products=250, shape="list")
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+    sync.sync()
+    server.products = 420
+
+    result = sync.sync(concurrency=4)
+
+    assert parallel_walks == [(100, 300)]
+    assert result["items_count"] == 420
+    assert counts(result) == {
+        "added": 170,
+        "changed": 0,
+        "removed": 0,
+        "unchanged": 250,
+    }
+
+
+def test_items_without_id_are_compared_by_content(
+    mock_server, make_client, store, monkeypatch
+):
+    from src import mock_server as mock_server_module
+
+    mock_product = mock_server_module.mock_product
+
+    def product(index, seed=0):
+        item = mock_product(index, seed)
+        if index % 10 == 0:
+            del item["_id"]
+        return item
+
+    monkeypatch.setattr(mock_server_module, "mock_product", product)
+    server = mock_server(products=250)
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+    first = sync.sync()
+    server.products = 260
+
+    second = sync.sync()
+
+    assert counts(first) == {"added": 250, "changed": 0, "removed": 0, "unchanged": 0}
+    # Las páginas cambian de ETag pero los 25 items sin _id siguen iguales
+    assert counts(second) == {"added": 10, "changed": 0, "removed": 0, "unchanged": 250}
+
+
+def test_cancelled_sync_keeps_previous_snapshot(mock_server, make_client, store):
+    server = mock_server(products=250)
+    sync = DeltaSync(make_client(server.url), store, page_size=100)
+    previous = sync.sync()
+    server.seed = 1
+    token = CancellationToken()
+
+    with pytest.raises(OperationCancelled):
+        sync.sync(progress_callback=lambda *args: token.cancel(), cancel_token=token)
+
+    assert store.latest_snapshot()["id"] == previous["snapshot_id"]
+    assert [snapshot["id"] for snapshot in store.list_snapshots()] == [
+        previous["snapshot_id"]
+    ]
@@ -0,0 +1,66 @@
+"""
+Pruebas de la caché de endpoints y de su uso en el cliente.
+"""
+from src.endpoint_cache import EndpointCache
+from src.highlevel_api import INVENTORY_ENDPOINTS
+
+
+def test_entries_persist_between_instances(tmp_path):
+    path = tmp_path / "cache.json"
+    EndpointCache(path).set("url|loc", "/products/inventory", "altId")
+
+    assert EndpointCache(path).get("url|loc") == ("/products/inventory", "altId")
+
+
+def test_expired_entry_is_ignored(tmp_path):
+    cache = EndpointCache(tmp_path / "cache.json", ttl_seconds=-1)
+    cache.set("url|loc", "/products/inventory", "altId")
+
+    assert cache.get("url|loc") is None
+
+
+def test_invalidate_removes_entry_from_disk(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = EndpointCache(path)
+    cache.set("url|loc", "/products/inventory", "altId")
+    cache.set("url|otra", "/products/", "locationId")
+
+    cache.invalidate("url|loc")
+
+    reloaded = EndpointCache(path)
+    assert reloaded.get("url|loc") is None
+    assert reloaded.get("url|otra") == ("/products/", "locationId")
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{no es json", encoding="utf-8")
+
+    assert EndpointCache(path).get("url|loc") is None
+
+
+def test_discovered_endpoint_is_reused(mock_server, make_client):
+    server = mock_server(products=20, shape="list")
+    client = make_client(server.url)
+
+    assert len(client.get_inventory(limit=10)) == 10
+    # Los cuatro primeros candidatos responden 404 hasta llegar a la lista
+    assert server.stats()["404"] == 4
+    assert client.endpoint_cache.get(client._endpoint_cache_key()) == (
+        INVENTORY_ENDPOINTS[2],
+        "locationId",
+    )
+
+    server.reset_stats()
+    assert len(client.get_inventory(limit=10, offset=10)) == 10
+    assert server.stats() == {"requests": 1, "200": 1}
+
+
+def test_stale_entry_is_invalidated_and_rediscovered(mock_server, make_client):
+    server = mock_server(products=20, shape="products")
+    client = make_client(server.url)
+    key = client._endpoint_cache_key()
+    client.endpoint_cache.set(key, INVENTORY_ENDPOINTS[0], "locationId")
+
+    assert len(client.get_inventory(limit=5)) == 5
+    assert client.endpoint_cache.get(key) == (INVENTORY_ENDPOINTS[1], "locationId")
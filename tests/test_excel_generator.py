@@ -0,0 +1,67 @@
+"""
+Pruebas del generador de Excel con openpyxl.
+"""
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from src.excel_generator import (  # noqa: E402
+    STYLE_CELL,
+    STYLE_CELL_ALT,
+    STYLE_HEADER,
+    STYLE_QUANTITY,
+    STYLE_QUANTITY_ALT,
+    ExcelGenerator,
+)
+
+ROWS = [
+    {
+        "Nombre": f"Producto {index}",
+        "Nombre de producto": "Roble",
+        "Cantidad disponible": index,
+        "Imagen": f"https://images.example.com/{index}.jpg" if index % 2 else "",
+    }
+    for index in range(4)
+]
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    path = tmp_path / "reporte.xlsx"
+    generator = ExcelGenerator()
+    generator.create_report(ROWS, str(path))
+    generator.add_summary(ROWS)
+    return openpyxl.load_workbook(path).active
+
+
+def test_cells_use_named_styles(sheet):
+    assert [cell.style for cell in sheet[1]] == [STYLE_HEADER] * 4
+    for row in range(2, len(ROWS) + 2):
+        # Las filas pares llevan el fondo alternado
+        alt = row % 2 == 0
+        cell_style = STYLE_CELL_ALT if alt else STYLE_CELL
+        quantity_style = STYLE_QUANTITY_ALT if alt else STYLE_QUANTITY
+        assert [cell.style for cell in sheet[row]] == [
+            cell_style,
+            cell_style,
+            quantity_style,
+            cell_style,
+        ]
+
+
+def test_named_styles_are_saved_once(sheet):
+    names = list(sheet.parent.named_styles)
+    expected = [
+        STYLE_HEADER,
+        STYLE_CELL,
+        STYLE_CELL_ALT,
+        STYLE_QUANTITY,
+        STYLE_QUANTITY_ALT,
+    ]
+
+    assert all(names.count(name) == 1 for name in expected)
+    header = sheet["A1"]
+    assert header.font.bold
+    assert header.fill.fgColor.rgb.endswith("366092")
+    assert sheet["A2"].fill.fgColor.rgb.endswith("F2F2F2")
+    assert sheet["C3"].alignment.horizontal == "center"
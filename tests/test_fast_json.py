@@ -0,0 +1,88 @@
+"""
+Pruebas de la decodificación rápida de JSON y de su respaldo con ``json``.
+"""
+import json
+
+import pytest
+
+from src import fast_json
+from src.mock_server import mock_product
+
+PAGE = {
+    "products": [mock_product(index) for index in range(3)],
+    "total": [{"total": 3}],
+    "traceId": "abc",
+}
+
+
+def encode(body) -> bytes:
+    return json.dumps(body).encode("utf-8")
+
+
+@pytest.fixture
+def without_fast_libraries(monkeypatch):
+    """Simula que ni orjson ni msgspec están instalados"""
+    monkeypatch.setattr(fast_json, "orjson", None)
+    monkeypatch.setattr(fast_json, "msgspec", None)
+
+
+def test_decode_json_matches_stdlib():
+    assert fast_json.decode_json(encode(PAGE)) == PAGE
+
+
+@pytest.mark.skipif(not fast_json.COMPACT_AVAILABLE, reason="msgspec no instalado")
+def test_decode_json_with_msgspec_only(monkeypatch):
+    monkeypatch.setattr(fast_json, "orjson", None)
+
+    assert fast_json.decode_json(encode(PAGE)) == PAGE
+
+
+def test_decode_json_without_fast_libraries(without_fast_libraries):
+    assert fast_json.decode_json(encode(PAGE)) == PAGE
+    with pytest.raises(ValueError):
+        fast_json.decode_json(b"{no es json")
+
+
+def test_decode_product_page_without_msgspec(without_fast_libraries):
+    assert fast_json.decode_product_page(encode(PAGE)) == PAGE
+
+
+@pytest.mark.skipif(not fast_json.COMPACT_AVAILABLE, reason="msgspec no instalado")
+def test_compact_page_keeps_wrapper_and_report_fields():
+    page = fast_json.decode_product_page(encode(PAGE))
+
+    assert set(page) == {"products", "total"}
+    assert page["total"] == [{"total": 3}]
+    product = page["products"][1]
+    assert isinstance(product, fast_json.Product)
+    assert product.get("_id") == PAGE["products"][1]["_id"]
+    assert product.get("availableQuantity") == PAGE["products"][1]["availableQuantity"]
+    assert product.get("desconocido", "x") == "x"
+
+
+@pytest.mark.skipif(not fast_json.COMPACT_AVAILABLE, reason="msgspec no instalado")
+@pytest.mark.parametrize(
+    "body",
+    [
+        # Una cantidad como texto no valida contra Product
+        {"products": [dict(mock_product(0), availableQuantity="3")]},
+        [dict(mock_product(0), name=7)],
+        {"products": "no es lista"},
+    ],
+)
+def test_invalid_structure_falls_back_to_stdlib(body):
+    assert fast_json.decode_product_page(encode(body)) == body
+
+
+@pytest.mark.skipif(not fast_json.COMPACT_AVAILABLE, reason="msgspec no instalado")
+def test_compact_list_page():
+    items = [mock_product(index) for index in range(2)]
+
+    page = fast_json.decode_product_page(b"  " + encode(items))
+
+    assert [product.get("_id") for product in page] == [item["_id"] for item in items]
+
+
+def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        fast_json.decode_product_page(b"{no es json")
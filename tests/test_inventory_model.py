@@ -0,0 +1,142 @@
+"""
+Pruebas del modelo de tabla del inventario (orden, filtro y selección).
+"""
+import os
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QItemSelectionModel, Qt, qInstallMessageHandler
+from PySide6.QtTest import QAbstractItemModelTester
+from PySide6.QtWidgets import QApplication, QTableView
+
+from src.inventory_model import QUANTITY_COLUMN, InventoryTableModel
+
+NAME_COLUMN = 0
+
+ITEMS = [
+    {"Nombre": "Mesa", "Nombre de producto": "Roble", "Cantidad disponible": 3},
+    {"Nombre": "silla", "Nombre de producto": "Pino", "Cantidad disponible": 12},
+    {"Nombre": "Banco", "Nombre de producto": "Roble", "Cantidad disponible": "n/d"},
+    {"Nombre": "Armario", "Nombre de producto": "Haya", "Cantidad disponible": 0.5},
+]
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def model(qapp):
+    model = InventoryTableModel()
+    model.set_items(ITEMS)
+    return model
+
+
+@pytest.fixture
+def view(model):
+    view = QTableView()
+    view.setModel(model)
+    yield view
+    view.deleteLater()
+
+
+def names(model):
+    return [model.item_at(row)["Nombre"] for row in range(model.rowCount())]
+
+
+def selected_names(view):
+    rows = view.selectionModel().selectedRows()
+    return sorted(view.model().item_at(index.row())["Nombre"] for index in rows)
+
+
+def select(view, *rows):
+    selection = view.selectionModel()
+    for row in rows:
+        selection.select(
+            view.model().index(row, 0),
+            QItemSelectionModel.Select | QItemSelectionModel.Rows,
+        )
+
+
+def test_model_passes_qt_model_tester(model):
+    messages = []
+
+    def handler(mode, context, message):
+        messages.append(message)
+
+    previous = qInstallMessageHandler(handler)
+    try:
+        # El tester revisa el modelo en cada señal mientras exista
+        tester = QAbstractItemModelTester(
+            model, QAbstractItemModelTester.FailureReportingMode.Warning
+        )
+        model.sort(NAME_COLUMN)
+        model.sort(QUANTITY_COLUMN, Qt.DescendingOrder)
+        model.set_filter_text("roble")
+        model.set_filter_text("")
+        model.set_items(ITEMS[:2])
+    finally:
+        qInstallMessageHandler(previous)
+
+    assert messages == []
+    del tester
+
+
+def test_sort_by_name_ignores_case(model):
+    model.sort(NAME_COLUMN)
+    assert names(model) == ["Armario", "Banco", "Mesa", "silla"]
+
+    model.sort(NAME_COLUMN, Qt.DescendingOrder)
+    assert names(model) == ["silla", "Mesa", "Banco", "Armario"]
+
+
+def test_sort_quantity_numerically_with_text_last(model):
+    model.sort(QUANTITY_COLUMN)
+
+    assert names(model) == ["Armario", "Mesa", "silla", "Banco"]
+
+
+def test_filter_matches_any_column(model):
+    model.set_filter_text("  ROBLE ")
+
+    assert names(model) == ["Mesa", "Banco"]
+    assert model.total_count() == len(ITEMS)
+
+    model.set_filter_text("")
+    assert model.rowCount() == len(ITEMS)
+
+
+def test_filter_keeps_sort_order(model):
+    model.sort(NAME_COLUMN)
+
+    model.set_filter_text("roble")
+
+    assert names(model) == ["Banco", "Mesa"]
+
+
+def test_selection_follows_items_when_sorting(model, view):
+    select(view, 0, 1)
+    view.selectionModel().setCurrentIndex(
+        model.index(1, 0), QItemSelectionModel.NoUpdate
+    )
+
+    model.sort(NAME_COLUMN)
+
+    assert selected_names(view) == ["Mesa", "silla"]
+    assert model.item_at(view.currentIndex().row())["Nombre"] == "silla"
+
+
+def test_selection_survives_filter(model, view):
+    select(view, 0, 2)
+
+    # Mesa queda oculta; Banco sigue seleccionada en su nueva fila
+    model.set_filter_text("banco")
+    assert selected_names(view) == ["Banco"]
+
+    model.set_filter_text("")
+    assert selected_names(view) == ["Banco"]
+    assert view.verticalHeader().count() == len(ITEMS)
@@ -0,0 +1,104 @@
+"""
+Pruebas de la configuración del registro de diagnósticos.
+"""
+import io
+import logging
+
+import pytest
+
+from src.logging_setup import (
+    DEBUG_ENV,
+    DEFAULT_LEVEL,
+    LOG_FILENAME,
+    configure_logging,
+    is_debug,
+)
+
+
+@pytest.fixture(autouse=True)
+def root_logger():
+    """Restaura los handlers y el nivel del logger raíz al terminar"""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    for handler in list(root.handlers):
+        if handler not in handlers:
+            root.removeHandler(handler)
+            handler.close()
+    root.setLevel(level)
+
+
+def own_handlers(root):
+    return [
+        handler
+        for handler in root.handlers
+        if getattr(handler, "_inventario_ghl", False)
+    ]
+
+
+def test_second_call_replaces_previous_handlers(root_logger, tmp_path):
+    foreign = logging.NullHandler()
+    root_logger.addHandler(foreign)
+    first_stream, second_stream = io.StringIO(), io.StringIO()
+
+    configure_logging(stream=first_stream, log_file=tmp_path / "a.log")
+    first = own_handlers(root_logger)
+    configure_logging(stream=second_stream, log_file=tmp_path / "b.log")
+    logging.getLogger("src.prueba").warning("aviso %d", 1)
+
+    assert len(first) == 2
+    assert len(own_handlers(root_logger)) == 2
+    assert not set(first) & set(root_logger.handlers)
+    assert foreign in root_logger.handlers
+    assert first_stream.getvalue() == ""
+    assert "WARNING src.prueba: aviso 1" in second_stream.getvalue()
+    assert not (tmp_path / "a.log").exists()
+    assert "aviso 1" in (tmp_path / "b.log").read_text(encoding="utf-8")
+
+
+def test_default_log_file_is_in_the_data_dir(data_dir):
+    log_file = configure_logging(debug=False)
+
+    assert log_file == data_dir / "logs" / LOG_FILENAME
+    # El archivo se abre al escribir el primer mensaje
+    assert not log_file.exists()
+    logging.getLogger("src.prueba").error("fallo")
+    assert "fallo" in log_file.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("1", True), ("TRUE", True), ("yes", True), ("0", False)]
+)
+def test_debug_follows_environment(monkeypatch, tmp_path, value, expected):
+    monkeypatch.setenv(DEBUG_ENV, value)
+
+    configure_logging(log_file=tmp_path / "app.log")
+
+    assert is_debug() is expected
+
+
+def test_debug_messages_are_dropped_outside_debug_mode(root_logger, tmp_path):
+    stream = io.StringIO()
+    configure_logging(debug=False, stream=stream, log_file=tmp_path / "app.log")
+    logging.getLogger("src.prueba").debug("detalle")
+    logging.getLogger("src.prueba").info("info")
+
+    assert root_logger.level == DEFAULT_LEVEL
+    assert stream.getvalue() == ""
+
+    configure_logging(debug=True, stream=stream, log_file=tmp_path / "app.log")
+    logging.getLogger("src.prueba").debug("detalle")
+    assert "DEBUG src.prueba: detalle" in stream.getvalue()
+
+
+def test_unusable_log_dir_keeps_the_stream(root_logger, tmp_path):
+    blocker = tmp_path / "no-es-directorio"
+    blocker.write_text("", encoding="utf-8")
+    stream = io.StringIO()
+
+    log_file = configure_logging(stream=stream, log_file=blocker / LOG_FILENAME)
+    logging.getLogger("src.prueba").warning("sigue")
+
+    assert log_file is None
+    assert len(own_handlers(root_logger)) == 1
+    assert "sigue" in stream.getvalue()
@@ -0,0 +1,114 @@
+"""
+Pruebas del colector de métricas.
+"""
+import json
+
+from src.metrics import NULL_METRICS, Metrics, format_summary
+
+
+def record_requests(metrics: Metrics):
+    for latency in [0.01, 0.02, 0.03, 0.04, 0.5]:
+        metrics.record_request(
+            "/products/", 200, latency, headers_time=0.005, size=1000, attempt=0
+        )
+    metrics.record_request("/products/", 429, 0.1, attempt=0)
+    metrics.record_request("/products/", 200, 0.02, attempt=1, size=500)
+    metrics.record_request("/products/", None, 0.3, attempt=2, error="sin conexión")
+
+
+def test_summary_aggregates_requests_and_stages():
+    metrics = Metrics()
+    record_requests(metrics)
+    metrics.add_span("fetch", 0.25)
+    metrics.add_span("fetch", 0.5)
+    with metrics.span("write", rows=10):
+        pass
+
+    summary = metrics.summary()
+
+    assert summary["requests"] == 8
+    assert summary["retries"] == 2
+    assert summary["errors"] == 2
+    assert summary["bytes"] == 5500
+    assert summary["status"] == {"200": 6, "429": 1, "error": 1}
+    assert summary["latency_ms"] == {
+        "avg": 127.5,
+        "p50": 30.0,
+        "p95": 500.0,
+        "max": 500.0,
+    }
+    assert summary["headers_ms_avg"] == 5.0
+    assert summary["stages"]["fetch"] == {"count": 2, "total_ms": 750.0}
+    assert summary["stages"]["write"]["count"] == 1
+
+
+def test_reset_clears_aggregates():
+    metrics = Metrics()
+    record_requests(metrics)
+
+    metrics.reset()
+
+    summary = metrics.summary()
+    assert summary["requests"] == 0
+    assert summary["latency_ms"] is None
+    assert summary["headers_ms_avg"] is None
+    assert format_summary(summary) == "Sin datos"
+
+
+def test_events_are_appended_as_json_lines(tmp_path):
+    path = tmp_path / "metricas" / "eventos.jsonl"
+    metrics = Metrics(path)
+    metrics.record_request("/products/", 200, 0.0123, headers_time=0.004, size=10)
+    metrics.record_request("/products/", None, 0.5, attempt=1, error="timeout")
+    metrics.add_span("format", 0.002, rows=300)
+    metrics.close()
+    # Una segunda instancia agrega al mismo archivo
+    Metrics(path).add_span("write", 0.1)
+
+    events = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+
+    assert [event["type"] for event in events] == [
+        "request",
+        "request",
+        "span",
+        "span",
+    ]
+    assert events[0]["latency_ms"] == 12.3
+    assert events[0]["headers_ms"] == 4.0
+    assert "error" not in events[0]
+    assert events[1]["status"] is None and events[1]["error"] == "timeout"
+    assert events[2] == {
+        "type": "span",
+        "ts": events[2]["ts"],
+        "name": "format",
+        "duration_ms": 2.0,
+        "rows": 300,
+    }
+
+
+def test_format_summary_lists_stages_in_pipeline_order():
+    metrics = Metrics()
+    record_requests(metrics)
+    for name in ("write", "otra", "fetch", "decode"):
+        metrics.add_span(name, 1.0)
+
+    text = format_summary(metrics.summary())
+
+    assert text.startswith("8 peticiones (2 reintentos, 2 errores)")
+    assert "latencia p50 30 ms, p95 500 ms" in text
+    assert text.endswith("fetch 1.00 s, decode 1.00 s, write 1.00 s, otra 1.00 s")
+
+
+def test_null_metrics_is_a_no_op():
+    assert not NULL_METRICS.enabled
+    NULL_METRICS.record_request("/products/", 200, 0.1)
+    NULL_METRICS.add_span("fetch", 0.1)
+    with NULL_METRICS.span("write", rows=1):
+        pass
+    NULL_METRICS.reset()
+    NULL_METRICS.close()
+
+    assert NULL_METRICS.summary() == {}
+    assert NULL_METRICS.path is None
+    assert NULL_METRICS.span("fetch") is NULL_METRICS.span("write")
+    assert format_summary(NULL_METRICS.summary()) == "Sin datos"
@@ -0,0 +1,162 @@
+"""
+Pruebas del pipeline en streaming (prefetch y escritura página a página).
+"""
+import csv
+import threading
+import time
+
+import pytest
+import requests
+
+from src.cancellation import CancellationToken, OperationCancelled
+from src.csv_exporter import CsvExporter
+from src.pipeline import prefetch, stream_inventory_to_excel
+from src.report_backends import create_generator
+
+
+def prefetch_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "ghl-prefetch"]
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def read_csv_rows(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f))[1:]
+
+
+def test_prefetch_keeps_order():
+    assert list(prefetch(iter(range(50)), depth=3)) == list(range(50))
+
+
+def test_prefetch_reraises_source_error_after_earlier_elements():
+    def source():
+        yield 1
+        yield 2
+        raise ValueError("página rota")
+
+    received = []
+    with pytest.raises(ValueError, match="página rota"):
+        for element in prefetch(source()):
+            received.append(element)
+
+    assert received == [1, 2]
+    assert wait_until(lambda: not prefetch_threads())
+
+
+def test_prefetch_reads_at_most_depth_ahead():
+    produced = []
+
+    def source():
+        for element in range(100):
+            produced.append(element)
+            yield element
+
+    elements = prefetch(source(), depth=2)
+    assert next(elements) == 0
+    time.sleep(0.3)
+
+    # Uno entregado, dos en la cola y uno esperando espacio
+    assert len(produced) <= 4
+    elements.close()
+
+
+def test_closing_the_consumer_closes_the_source():
+    closed = threading.Event()
+
+    def source():
+        try:
+            for element in range(1000):
+                yield element
+        finally:
+            closed.set()
+
+    elements = prefetch(source(), depth=2)
+    assert next(elements) == 0
+
+    elements.close()
+
+    assert closed.wait(2)
+    assert wait_until(lambda: not prefetch_threads())
+
+
+def test_stream_writes_every_page(mock_server, make_client, tmp_path):
+    server = mock_server(products=250)
+    client = make_client(server.url)
+    path = tmp_path / "reporte.csv"
+    updates = []
+
+    result = stream_inventory_to_excel(
+        client,
+        str(path),
+        generator=CsvExporter(),
+        page_size=100,
+        progress_callback=lambda *update: updates.append(update),
+    )
+
+    assert result == {"path": str(path), "items_count": 250, "streamed": True}
+    rows = read_csv_rows(path)
+    assert len(rows) == 250
+    assert rows[0][0] == "Producto 0" and rows[-1][0] == "Producto 249"
+    assert ("Página 3: 250 de 250 productos escritos", 250, 250) in updates
+
+
+def test_non_streaming_backend_writes_at_the_end(mock_server, make_client, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    server = mock_server(products=120)
+    client = make_client(server.url)
+    path = tmp_path / "reporte.xlsx"
+
+    result = stream_inventory_to_excel(
+        client, str(path), generator=create_generator("openpyxl"), page_size=50
+    )
+
+    assert result == {"path": str(path), "items_count": 120, "streamed": False}
+    sheet = openpyxl.load_workbook(path).active
+    names = [row[0] for row in sheet.iter_rows(min_row=2, values_only=True)]
+    assert names[:120] == [f"Producto {index}" for index in range(120)]
+
+
+def test_download_error_discards_the_report(make_client, closed_url, tmp_path):
+    client = make_client(closed_url)
+    path = tmp_path / "reporte.csv"
+
+    with pytest.raises(requests.RequestException):
+        stream_inventory_to_excel(client, str(path), generator=CsvExporter())
+
+    assert not path.exists()
+    assert wait_until(lambda: not prefetch_threads())
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_cancellation_discards_the_report(
+    mock_server, make_client, tmp_path, concurrency
+):
+    server = mock_server(products=1000)
+    client = make_client(server.url)
+    path = tmp_path / "reporte.csv"
+    token = CancellationToken()
+
+    def on_progress(message, current=None, total=None):
+        if current:
+            token.cancel()
+
+    with pytest.raises(OperationCancelled):
+        stream_inventory_to_excel(
+            client,
+            str(path),
+            generator=CsvExporter(cancel_token=token),
+            page_size=100,
+            concurrency=concurrency,
+            progress_callback=on_progress,
+            cancel_token=token,
+        )
+
+    assert not path.exists()
+    assert server.stats()["requests"] < 10
+    assert wait_until(lambda: not prefetch_threads())
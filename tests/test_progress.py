@@ -0,0 +1,104 @@
+"""
+Pruebas del canal de progreso con frecuencia limitada.
+"""
+import pytest
+
+from src import progress
+from src.progress import ProgressThrottle
+
+
+class FakeClock:
+    """Reloj controlado por la prueba en lugar de ``time.monotonic``"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(progress.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def delivered():
+    return []
+
+
+@pytest.fixture
+def throttle(clock, delivered) -> ProgressThrottle:
+    # Un intervalo de 0.1 s
+    return ProgressThrottle(lambda *update: delivered.append(update), 10)
+
+
+def test_rapid_updates_are_coalesced(clock, delivered, throttle):
+    for current in range(1, 101):
+        throttle("Descargando", current, 100)
+        clock.now += 0.001
+
+    # La primera sale al momento; las siguientes caen dentro del intervalo
+    assert delivered == [("Descargando", 1, 100)]
+
+    clock.now += 0.1
+    throttle("Descargando", 101, 200)
+    assert delivered == [("Descargando", 1, 100), ("Descargando", 101, 200)]
+
+
+def test_flush_delivers_the_latest_value_once(clock, delivered, throttle):
+    throttle("Descargando", 1, 3)
+    throttle("Descargando", 2, 3)
+    throttle("Descargando", 3, 3)
+
+    throttle.flush()
+    throttle.flush()
+
+    assert delivered == [("Descargando", 1, 3), ("Descargando", 3, 3)]
+
+
+def test_flush_without_pending_update_is_a_no_op(delivered, throttle):
+    throttle.flush()
+    throttle("Descargando", 1, 1)
+    throttle.flush()
+
+    assert delivered == [("Descargando", 1, 1)]
+
+
+def test_phase_messages_keep_their_order(clock, delivered, throttle):
+    throttle("Descargando", 10, 20)
+    throttle("Descargando", 20, 20)
+    throttle("Generando reporte...")
+    throttle("Escribiendo", 5, None)
+
+    assert delivered == [
+        ("Descargando", 10, 20),
+        # La actualización pendiente sale antes del cambio de fase
+        ("Descargando", 20, 20),
+        ("Generando reporte...", None, None),
+    ]
+
+    # Entregar la pendiente reinició el intervalo: la siguiente espera
+    clock.now += 0.1
+    throttle.flush()
+    assert delivered[-1] == ("Escribiendo", 5, None)
+
+
+def test_flushed_update_restarts_the_interval(clock, delivered, throttle):
+    throttle("Descargando", 1, 10)
+    throttle("Descargando", 2, 10)
+    clock.now += 0.05
+    throttle.flush()
+
+    clock.now += 0.05
+    throttle("Descargando", 3, 10)
+
+    assert delivered == [("Descargando", 1, 10), ("Descargando", 2, 10)]
+
+
+@pytest.mark.parametrize("updates_per_second", [0, -1])
+def test_rate_must_be_positive(updates_per_second):
+    with pytest.raises(ValueError):
+        ProgressThrottle(print, updates_per_second)
@@ -0,0 +1,135 @@
+"""
+Pruebas de la política de reintentos, el token bucket y su uso en el cliente.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from src.rate_limit import RetryPolicy, TokenBucket, parse_retry_after
+
+
+def test_parse_retry_after_seconds_and_date():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("") is None
+    assert parse_retry_after("pronto") is None
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 60
+
+
+def test_retry_after_takes_precedence_up_to_backoff_max():
+    policy = RetryPolicy(backoff_max=10)
+
+    assert policy.compute_delay(0, {"Retry-After": "4"}) == 4
+    assert policy.compute_delay(0, {"Retry-After": "120"}) == 10
+
+
+def test_backoff_jitter_stays_below_ceiling():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=3)
+
+    for attempt in range(6):
+        ceiling = min(3, 0.5 * 2**attempt)
+        delays = [policy.compute_delay(attempt) for _ in range(50)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+
+
+def test_should_retry_only_transient_statuses():
+    policy = RetryPolicy(max_retries=2)
+
+    assert policy.should_retry(429, 0)
+    assert policy.should_retry(503, 1)
+    assert not policy.should_retry(503, 2)
+    assert not policy.should_retry(404, 0)
+    assert not policy.should_retry(401, 0)
+
+
+def test_token_bucket_queues_after_burst():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+def test_token_bucket_pause_delays_every_request():
+    bucket = TokenBucket(rate=1000, capacity=1000)
+    bucket.pause(5)
+
+    assert bucket.reserve() > 4.9
+
+
+def test_token_bucket_follows_rate_limit_headers():
+    bucket = TokenBucket(rate=1000, capacity=1000)
+
+    bucket.update_from_headers(
+        {"X-RateLimit-Max": "100", "X-RateLimit-Interval-Milliseconds": "10000"}
+    )
+    assert bucket.rate == 10
+    assert bucket.reserve() == 0
+
+    bucket.update_from_headers(
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Interval-Milliseconds": "2000"}
+    )
+    assert bucket.reserve() > 1.9
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_client_retries_429_after_retry_after(mock_server, make_client):
+    server = mock_server(products=100, throttle_every=2, retry_after=0.2)
+    client = make_client(server.url)
+    assert len(client.get_inventory(limit=10)) == 10
+
+    started = time.monotonic()
+    assert len(client.get_inventory(limit=10, offset=10)) == 10
+
+    assert time.monotonic() - started >= 0.2
+    assert server.stats() == {"requests": 3, "200": 2, "429": 1}
+
+
+def test_client_gives_up_after_max_retries(mock_server, make_client):
+    server = mock_server(products=100, throttle_every=1, retry_after=0.01)
+    client = make_client(server.url, retry_policy=RetryPolicy(max_retries=2))
+
+    with pytest.raises(requests.HTTPError) as exc_info:
+        client.get_inventory(limit=10)
+
+    assert exc_info.value.response.status_code == 429
+    # Otro endpoint no evita el límite: no se prueban los demás candidatos
+    assert server.stats() == {"requests": 3, "429": 3}
+
+
+def test_connection_error_is_not_retried_per_candidate(make_client, closed_url):
+    client = make_client(closed_url)
+    urls = []
+    send = client.session.get
+
+    def counting_get(url, *args, **kwargs):
+        urls.append(url)
+        return send(url, *args, **kwargs)
+
+    client.session.get = counting_get
+
+    with pytest.raises(requests.ConnectionError):
+        client.get_inventory(limit=10)
+
+    # El primer intento y sus dos reintentos, todos al mismo endpoint
+    assert len(urls) == 3
+    assert len(set(urls)) == 1
+
+
+def test_not_found_still_falls_back_without_retries(mock_server, make_client):
+    server = mock_server(products=100, shape="products", param_style="altId")
+    client = make_client(server.url)
+
+    assert len(client.get_inventory(limit=10)) == 10
+    # inventory (2 estilos) y products con locationId responden 404 una vez
+    assert server.stats() == {"requests": 4, "404": 3, "200": 1}
@@ -0,0 +1,149 @@
+"""
+Pruebas del registro de backends de reportes.
+"""
+import pytest
+
+from src.excel_generator_xlsx import IMAGE_NOTES_MODES
+from src.report_backends import (
+    AUTO_BACKEND,
+    CONSTANT_MEMORY_ROWS,
+    backend_names,
+    backend_of,
+    create_generator,
+    get_backend,
+    supported_options,
+)
+
+ROWS = [
+    {
+        "Nombre": "Mesa",
+        "Nombre de producto": "Roble",
+        "Cantidad disponible": 3,
+        "Imagen": "",
+    },
+    {
+        "Nombre": "Silla",
+        "Nombre de producto": "Pino",
+        "Cantidad disponible": 2,
+        "Imagen": "",
+    },
+]
+
+
+def require_backend(name: str):
+    """Omite la prueba si la dependencia del backend no está instalada"""
+    if not get_backend(name).is_available():
+        pytest.skip(f"{get_backend(name).dependency} no está instalado")
+
+
+@pytest.mark.parametrize("image_notes", IMAGE_NOTES_MODES)
+@pytest.mark.parametrize("constant_memory", [None, True])
+@pytest.mark.parametrize("backend", backend_names())
+def test_interface_options_work_with_every_backend(
+    backend, constant_memory, image_notes
+):
+    require_backend(backend)
+
+    options = supported_options(
+        backend, constant_memory=constant_memory, image_notes=image_notes
+    )
+    generator = create_generator(backend=backend, **options)
+
+    assert backend_of(generator).name == backend
+
+
+@pytest.mark.parametrize(
+    "backend, expected",
+    [
+        ("xlsxwriter", {"constant_memory": True, "image_notes": "cell"}),
+        ("openpyxl", {}),
+        ("csv", {"constant_memory": True}),
+        ("parquet", {"constant_memory": True}),
+    ],
+)
+def test_unsupported_options_are_dropped(backend, expected):
+    options = supported_options(backend, constant_memory=True, image_notes="cell")
+
+    assert options == expected
+
+
+def test_options_without_a_feature_are_kept():
+    options = supported_options("openpyxl", constant_memory=None, image_notes="auto")
+
+    assert options == {"constant_memory": None, "image_notes": "auto"}
+
+
+@pytest.fixture
+def without_xlsxwriter(monkeypatch):
+    """Simula que xlsxwriter no está instalado"""
+    monkeypatch.setattr(get_backend("xlsxwriter"), "is_available", lambda: False)
+
+
+@pytest.mark.parametrize(
+    "row_count, expected",
+    [
+        (CONSTANT_MEMORY_ROWS - 1, False),
+        (CONSTANT_MEMORY_ROWS, True),
+        (None, True),
+    ],
+)
+def test_auto_uses_constant_memory_for_large_reports(row_count, expected):
+    require_backend("xlsxwriter")
+
+    generator = create_generator(AUTO_BACKEND, row_count=row_count)
+
+    assert backend_of(generator).name == "xlsxwriter"
+    assert generator.constant_memory is expected
+
+
+def test_auto_respects_explicit_constant_memory():
+    require_backend("xlsxwriter")
+
+    generator = create_generator(AUTO_BACKEND, row_count=None, constant_memory=False)
+
+    assert generator.constant_memory is False
+
+
+def test_auto_falls_back_without_xlsxwriter(without_xlsxwriter):
+    require_backend("openpyxl")
+
+    generator = create_generator(AUTO_BACKEND, row_count=CONSTANT_MEMORY_ROWS)
+
+    assert backend_of(generator).name == "openpyxl"
+
+
+def test_auto_without_a_capable_backend_fails(without_xlsxwriter):
+    with pytest.raises(RuntimeError, match="constant_memory"):
+        create_generator(AUTO_BACKEND, constant_memory=True)
+
+
+@pytest.mark.parametrize(
+    "backend, options",
+    [
+        ("openpyxl", {"streaming": True}),
+        ("openpyxl", {"constant_memory": True}),
+        ("csv", {"image_notes": "cell"}),
+        ("parquet", {"image_notes": "cell"}),
+    ],
+)
+def test_explicit_backend_rejects_unsupported_options(backend, options):
+    with pytest.raises(ValueError, match=f"El backend {backend} no soporta"):
+        create_generator(backend, **options)
+
+
+@pytest.mark.parametrize("backend", ["xlsxwriter", "openpyxl"])
+def test_add_summary_writes_the_report(backend, tmp_path):
+    require_backend(backend)
+    path = tmp_path / "reporte.xlsx"
+    generator = create_generator(backend)
+
+    generator.create_report(ROWS, str(path))
+    # El archivo se escribe una sola vez, con el resumen, en add_summary()
+    assert not path.exists()
+    generator.add_summary(ROWS)
+
+    openpyxl = pytest.importorskip("openpyxl")
+    sheet = openpyxl.load_workbook(path).active
+    values = [cell for row in sheet.iter_rows(values_only=True) for cell in row]
+    assert "Mesa" in values
+    assert "Total de productos:" in values
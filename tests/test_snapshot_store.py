@@ -0,0 +1,121 @@
+"""
+Pruebas del almacén de snapshots y de cuándo se guarda un snapshot.
+"""
+import pytest
+
+from src.snapshot_store import SnapshotStore
+
+RAW_ITEMS = [
+    {"_id": "a", "name": "Mesa", "productName": "Roble", "availableQuantity": 3},
+    {"_id": "b", "name": "Silla", "productName": "Pino", "availableQuantity": 2.5},
+]
+FORMATTED_ITEMS = [
+    {
+        "Nombre": "Mesa",
+        "Nombre de producto": "Roble",
+        "Cantidad disponible": 3,
+        "Imagen": "",
+    },
+    {
+        "Nombre": "Silla",
+        "Nombre de producto": "Pino",
+        "Cantidad disponible": 2.5,
+        "Imagen": "",
+    },
+]
+
+
+@pytest.fixture
+def store(tmp_path) -> SnapshotStore:
+    return SnapshotStore(tmp_path / "snapshots.sqlite3")
+
+
+def complete_ids(store: SnapshotStore, location_id: str = "loc1"):
+    return [snapshot["id"] for snapshot in store.list_snapshots(location_id)]
+
+
+def test_incomplete_snapshot_is_not_visible(store):
+    snapshot_id = store.begin_snapshot("loc1")
+    store.add_items(snapshot_id, RAW_ITEMS, FORMATTED_ITEMS, 0)
+
+    assert store.latest_snapshot("loc1") is None
+    assert store.get_snapshot(snapshot_id) is None
+
+    assert store.finish_snapshot(snapshot_id) == 2
+    assert store.latest_snapshot("loc1")["id"] == snapshot_id
+    assert store.get_snapshot(snapshot_id)["item_count"] == 2
+
+
+def test_load_formatted_keeps_order_and_values(store):
+    snapshot_id = store.save_snapshot("loc1", RAW_ITEMS, FORMATTED_ITEMS)
+
+    assert store.load_formatted(snapshot_id) == FORMATTED_ITEMS
+    assert list(store.iter_raw_items(snapshot_id)) == RAW_ITEMS
+
+
+def test_discarded_snapshot_leaves_previous_as_latest(store):
+    previous = store.save_snapshot("loc1", RAW_ITEMS, FORMATTED_ITEMS)
+    failed = store.begin_snapshot("loc1")
+    store.add_items(failed, RAW_ITEMS[:1], FORMATTED_ITEMS[:1], 0)
+
+    store.discard_snapshot(failed)
+
+    assert store.latest_snapshot("loc1")["id"] == previous
+    assert store.load_formatted(failed) == []
+
+
+def test_finish_prunes_old_complete_snapshots(store):
+    ids = [store.save_snapshot("loc1", RAW_ITEMS, FORMATTED_ITEMS) for _ in range(3)]
+    other = store.save_snapshot("loc2", RAW_ITEMS, FORMATTED_ITEMS)
+
+    newest = store.begin_snapshot("loc1")
+    store.finish_snapshot(newest, keep=2)
+
+    assert complete_ids(store) == [newest, ids[-1]]
+    assert complete_ids(store, "loc2") == [other]
+
+
+def test_finish_keeps_newer_snapshot_in_progress(store):
+    older = store.begin_snapshot("loc1")
+    in_progress = store.begin_snapshot("loc1")
+    store.add_items(in_progress, RAW_ITEMS, FORMATTED_ITEMS, 0)
+
+    store.finish_snapshot(older, keep=1)
+
+    assert store.finish_snapshot(in_progress, keep=1) == 2
+    assert complete_ids(store) == [in_progress]
+
+
+def run_inventory_worker(client, store, **parameters):
+    """Ejecuta ``InventoryWorker`` en el hilo actual y devuelve lo emitido"""
+    pytest.importorskip("PySide6")
+    from src.main_window_optimized import InventoryWorker
+
+    worker = InventoryWorker(client, store)
+    worker.set_parameters(**parameters)
+    received, errors = [], []
+    worker.data_received.connect(received.append)
+    worker.error_occurred.connect(errors.append)
+    worker.run()
+    assert errors == []
+    return received[0]
+
+
+def test_single_page_fetch_is_not_a_snapshot(store, mock_server, make_client):
+    server = mock_server(products=1000)
+    client = make_client(server.url, location_id="loc1")
+
+    data = run_inventory_worker(client, store, limit=100, offset=600)
+
+    assert len(data) == 100
+    assert store.latest_snapshot("loc1") is None
+
+
+def test_full_fetch_is_saved_as_snapshot(store, mock_server, make_client):
+    server = mock_server(products=1000)
+    client = make_client(server.url, location_id="loc1")
+
+    data = run_inventory_worker(client, store, limit=300, offset=0, fetch_all=True)
+
+    assert len(data) == 1000
+    assert store.latest_snapshot("loc1")["item_count"] == 1000